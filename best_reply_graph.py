@@ -0,0 +1,207 @@
+"""
+Filename: best_reply_graph.py
+
+Best reply and better reply graphs of normal form games.
+
+The nodes of the graph are the pure action profiles, numbered in C
+order (as by `np.ravel_multi_index` with `nums_actions`), and there is
+an edge from a profile a to a profile a' that differs from a only in
+player i's action if a'_i is a best response to a_{-i} while a_i is not
+(best reply graph), or if a'_i yields a higher payoff than a_i against
+a_{-i} (better reply graph). The edges are generated for all the
+profiles at once by comparing each player's payoffs over the player's
+own actions.
+
+The sink strongly connected components are the sink equilibria; if they
+are all singletons, i.e., pure Nash equilibria, then the best reply
+dynamics converges from any initial profile with probability one
+(under random revision), and if the graph is acyclic, it converges
+along any revision sequence.
+
+>>> from normal_form_game import NormalFormGame
+>>> matching_pennies = [[(1, -1), (-1, 1)], [(-1, 1), (1, -1)]]
+>>> graph = BestReplyGraph(NormalFormGame(matching_pennies))
+>>> graph.is_acyclic()
+False
+>>> graph.sink_equilibria()
+[[(0, 0), (0, 1), (1, 0), (1, 1)]]
+
+"""
+from __future__ import division
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+
+class BestReplyGraph(object):
+    """
+    Class representing the best reply (or better reply) graph of a
+    normal form game.
+
+    Parameters
+    ----------
+    g : NormalFormGame
+        NormalFormGame instance.
+
+    better_reply : bool, optional(default=False)
+        If True, construct the better reply graph instead of the best
+        reply graph.
+
+    Attributes
+    ----------
+    nums_actions : tuple(int)
+        Tuple of the numbers of actions of the players.
+
+    num_profiles : scalar(int)
+        Number of pure action profiles, i.e., nodes.
+
+    adj_matrix : scipy.sparse.csr_matrix(bool, ndim=2)
+        Adjacency matrix of the graph, of shape (num_profiles,
+        num_profiles).
+
+    """
+    def __init__(self, g, better_reply=False):
+        self.nums_actions = g.nums_actions
+        self.better_reply = better_reply
+        N = g.N
+        self.num_profiles = int(np.prod(self.nums_actions))
+        profile_indices = \
+            np.arange(self.num_profiles).reshape(self.nums_actions)
+
+        sources, targets = [], []
+        for i, player in enumerate(g.players):
+            n_i = self.nums_actions[i]
+            if n_i == 1:
+                continue
+            # Payoff array in the axis order 0, ..., N-1, with axis i
+            # moved to the last
+            payoff_array = player.payoff_array.transpose(
+                list(range(N-i, N)) + list(range(N-i))
+            )
+            Q = np.moveaxis(payoff_array, i, -1).reshape(-1, n_i)
+            # Index of the profile with player i's action set to 0
+            base = np.moveaxis(profile_indices, i, -1)[..., 0].ravel()
+            stride = self.num_profiles // np.prod(self.nums_actions[:i+1])
+
+            if better_reply:
+                # edges[r, a, b] is True if b is better than a against r
+                edges = Q[:, np.newaxis, :] > Q[:, :, np.newaxis] + player.tol
+            else:
+                br_mask = Q >= Q.max(axis=1)[:, np.newaxis] - player.tol
+                edges = (~br_mask)[:, :, np.newaxis] & \
+                    br_mask[:, np.newaxis, :]
+            r, a, b = edges.nonzero()
+            sources.append(base[r] + a * stride)
+            targets.append(base[r] + b * stride)
+
+        if sources:
+            sources = np.concatenate(sources)
+            targets = np.concatenate(targets)
+        else:
+            sources = targets = np.zeros(0, dtype=int)
+        self.adj_matrix = sparse.csr_matrix(
+            (np.ones(len(sources), dtype=bool), (sources, targets)),
+            shape=(self.num_profiles, self.num_profiles)
+        )
+
+        self._scc = None
+
+    def __repr__(self):
+        s = '{0} reply graph of a {1}-player NormalFormGame'.format(
+            'Better' if self.better_reply else 'Best', len(self.nums_actions)
+        )
+        return s
+
+    def profiles(self, indices):
+        """
+        Return the pure action profiles of the node indices `indices`.
+
+        Parameters
+        ----------
+        indices : array_like(int, ndim=1)
+            Array of node indices.
+
+        Returns
+        -------
+        list(tuple(int))
+            List of action profiles.
+
+        """
+        return [tuple(int(a) for a in profile) for profile in
+                zip(*np.unravel_index(indices, self.nums_actions))]
+
+    def strongly_connected_components(self):
+        """
+        Return the strongly connected components of the graph.
+
+        Returns
+        -------
+        num_components : scalar(int)
+            Number of the strongly connected components.
+
+        labels : ndarray(int, ndim=1)
+            Array of length `num_profiles` of the component labels of
+            the nodes.
+
+        """
+        if self._scc is None:
+            self._scc = csgraph.connected_components(
+                self.adj_matrix, directed=True, connection='strong'
+            )
+        return self._scc
+
+    def sink_components(self):
+        """
+        Return the sink strongly connected components, i.e., those with
+        no edges going out of them.
+
+        Returns
+        -------
+        list(ndarray(int, ndim=1))
+            List of the arrays of the node indices of the sink
+            components, sorted by their smallest indices.
+
+        """
+        num_components, labels = self.strongly_connected_components()
+        sources, targets = self.adj_matrix.nonzero()
+        is_sink = np.ones(num_components, dtype=bool)
+        is_sink[labels[sources[labels[sources] != labels[targets]]]] = False
+
+        order = np.argsort(labels, kind='mergesort')
+        splits = np.cumsum(np.bincount(labels, minlength=num_components))
+        components = np.split(order, splits[:-1])
+        sinks = [components[k] for k in np.nonzero(is_sink)[0]]
+        sinks.sort(key=lambda component: component[0])
+        return sinks
+
+    def sink_equilibria(self):
+        """
+        Return the sink equilibria, i.e., the sink strongly connected
+        components as lists of action profiles.
+
+        Returns
+        -------
+        list(list(tuple(int)))
+            List of the sink equilibria.
+
+        """
+        return [self.profiles(component)
+                for component in self.sink_components()]
+
+    def is_acyclic(self):
+        """
+        Return True if the graph has no cycle.
+
+        """
+        num_components, _ = self.strongly_connected_components()
+        return num_components == self.num_profiles
+
+    def is_weakly_acyclic(self):
+        """
+        Return True if from every node there is a path to a pure Nash
+        equilibrium, i.e., if every sink component is a singleton.
+
+        """
+        return all(len(component) == 1
+                   for component in self.sink_components())
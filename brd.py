@@ -9,12 +9,21 @@ Best response dynamics type models.
 from __future__ import division
 
 import numpy as np
-from normal_form_game import Player
+from scipy import sparse
+from scipy.sparse import csgraph
+from scipy.sparse.linalg import spsolve
+from scipy.special import gammaln, xlogy
+from numba import jit
+from normal_form_game import Player, _compute_dtype
+from util import composition_rank, composition_unrank
+
+# Model codes for `_simulate_nb`
+_BRD, _KMR, _SAMPLING_BRD = 0, 1, 2
 
 
 class BRD(object):
-    def __init__(self, payoff_matrix, N):
-        A = np.asarray(payoff_matrix)
+    def __init__(self, payoff_matrix, N, dtype=None):
+        A = np.asarray(payoff_matrix, dtype=dtype)
         if A.ndim != 2 or A.shape[0] != A.shape[1]:
             raise ValueError('payoff matrix must be square')
         self.num_actions = A.shape[0]  # Number of actions
@@ -53,13 +62,104 @@ class BRD(object):
     def play(self, current_action):
         self.current_action_dist[current_action] -= 1
         opponent_action_dist = self.current_action_dist
-        next_action = self.player.best_response(opponent_action_dist,
-                                                tie_breaking=self.tie_breaking)
+        next_action = self._best_response(opponent_action_dist)
         self.current_action_dist[next_action] += 1
 
+    def _best_response(self, action_dist):
+        """
+        Return the best response to `action_dist` under `tie_breaking`.
+
+        """
+        return self.player.best_response(action_dist,
+                                         tie_breaking=self.tie_breaking)
+
+    def _best_responses(self, action_dists):
+        """
+        Vectorized version of `_best_response` over the rows of
+        `action_dists`.
+
+        """
+        return self.player.best_responses(action_dists,
+                                          tie_breaking=self.tie_breaking)
+
+    def _nb_params(self):
+        """
+        Return the tuple `(model, epsilon, k)` of arguments to
+        `_simulate_nb` if the dynamics can be run by the compiled loop,
+        and None otherwise (e.g., if `play` is overridden by a
+        subclass).
+
+        """
+        if not self._nb_enabled(BRD.play):
+            return None
+        return (_BRD, 0., 0)
+
+    def _nb_enabled(self, play):
+        """
+        Return True if `play` of the class is `play` (not overridden),
+        the tie breaking is 'smallest' and the payoffs are real.
+
+        """
+        return type(self).play is play and \
+            self.tie_breaking == 'smallest' and \
+            self.player.payoff_array.dtype.kind in 'biuf'
+
+    def _simulate_nb(self, ts_length, init_action_dist, out):
+        """
+        Run `ts_length` steps of the dynamics by `_simulate_nb`,
+        recording the action distributions in `out` if it has
+        `ts_length` rows. The random numbers are drawn from the global
+        random state exactly as by `simulate_iter`, and the best
+        responses at near ties are computed by `_best_response`, so that
+        the sequence is the same as that by `simulate_iter`.
+
+        """
+        model, epsilon, k = self._nb_params()
+        payoff_dtype = self.player.payoff_array.dtype
+        payoff_matrix = \
+            np.ascontiguousarray(self.player.payoff_array, dtype=np.float64)
+
+        # Bound on the rounding error of a payoff against action counts
+        # per addition in `Player.payoff_vector`, or zero if the payoffs
+        # are integers computed exactly
+        payoff_bound = max(self.N, k) * np.abs(payoff_matrix).max()
+        compute_dtype = _compute_dtype(payoff_dtype)
+        if payoff_dtype.kind in 'biu' and \
+                payoff_bound <= 2**(np.finfo(compute_dtype).nmant+1):
+            error_unit = 0.
+        else:
+            error_unit = np.finfo(compute_dtype).eps * payoff_bound
+
+        self.set_init_action_dist(init_action_dist=init_action_dist)
+        player_ind_sequence = np.random.randint(self.N, size=ts_length)
+
+        # The Mersenne Twister state of np.random is advanced in the
+        # kernel and then set back
+        name, key, pos, has_gauss, cached_gaussian = np.random.get_state()
+        key = key.copy()
+        pos = np.array([pos])
+        query = np.empty(self.num_actions, dtype=int)
+        t = 0
+        while True:
+            t = _simulate_nb(model, payoff_matrix, error_unit, self.N,
+                             epsilon, k, self.current_action_dist, query,
+                             player_ind_sequence, t, key, pos, out)
+            if t == ts_length:
+                break
+            # Near tie within the rounding errors
+            self.current_action_dist[self._best_response(query)] += 1
+            t += 1
+        np.random.set_state((name, key, pos[0], has_gauss, cached_gaussian))
+
     def simulate(self, ts_length, init_action_dist=None):
         action_dist_sequence = \
             np.empty((ts_length, self.num_actions), dtype=int)
+
+        if self._nb_params() is not None:
+            self._simulate_nb(ts_length, init_action_dist,
+                              action_dist_sequence)
+            return action_dist_sequence
+
         action_dist_sequence_iter = \
             self.simulate_iter(ts_length, init_action_dist=init_action_dist)
 
@@ -82,9 +182,57 @@ class BRD(object):
             )  # Action the revising player is playing
             self.play(current_action=action)
 
-    def replicate(self, T, num_reps, init_action_dist=None):
+    def replicate(self, T, num_reps, init_action_dist=None,
+                  vectorized=False):
+        """
+        Return the action distributions after T+1 revisions from
+        `num_reps` independent simulations, i.e., the distributions at
+        time T+1 of the sequences generated by `simulate_iter` started
+        at time 0. For example, with T=0 the distributions after one
+        revision from the initial distributions are returned.
+
+        Parameters
+        ----------
+        T : scalar(int)
+            Number of revisions minus one, after which the action
+            distributions are returned.
+
+        num_reps : scalar(int)
+            Number of replications.
+
+        init_action_dist : array_like(int, ndim=1),
+                           optional(default=None)
+            Initial action distribution common to the replications. If
+            not supplied, randomly chosen independently for each
+            replication.
+
+        vectorized : bool, optional(default=False)
+            If True, advance all the replications in lock step as a
+            (num_reps, num_actions) array, with the random draws, the
+            revisions and the best responses vectorized across the
+            replications at each step. The results have the same
+            distribution, but the random draws are different from those
+            of the replications run one after another.
+
+        Returns
+        -------
+        out : ndarray(int, ndim=2)
+            Array of shape (num_reps, num_actions) containing the action
+            distributions after T+1 revisions.
+
+        """
+        if vectorized:
+            return self._replicate_vectorized(T, num_reps, init_action_dist)
+
         out = np.empty((num_reps, self.num_actions), dtype=int)
 
+        if self._nb_params() is not None:
+            no_record = np.empty((0, self.num_actions), dtype=int)
+            for j in range(num_reps):
+                self._simulate_nb(T+1, init_action_dist, no_record)
+                out[j] = self.current_action_dist
+            return out
+
         for j in range(num_reps):
             action_dist_sequence_iter = \
                 self.simulate_iter(T+1, init_action_dist=init_action_dist)
@@ -94,14 +242,379 @@ class BRD(object):
 
         return out
 
+    def _init_action_dists(self, num_reps, init_action_dist=None):
+        """
+        Return an array of shape (num_reps, num_actions) of initial
+        action distributions, equal to `init_action_dist` if supplied,
+        and otherwise chosen independently and uniformly over the set of
+        possible action distributions as in `set_init_action_dist`.
+
+        """
+        action_dists = np.empty((num_reps, self.num_actions), dtype=int)
+        if init_action_dist is not None:
+            action_dists[:] = init_action_dist
+            return action_dists
+
+        # Random subsets of size num_actions-1 of the N+num_actions-1
+        # positions, given by the smallest of uniform random keys
+        num_positions = self.N + self.num_actions - 1
+        action_dists[:, -1] = num_positions
+        if self.num_actions > 1:
+            keys = np.random.random((num_reps, num_positions))
+            action_dists[:, :-1] = np.sort(
+                np.argpartition(keys, self.num_actions-2, axis=1)
+                [:, :self.num_actions-1], axis=1
+            )
+        action_dists[:, 1:] -= action_dists[:, :-1] + 1
+        return action_dists
+
+    def _replicate_vectorized(self, T, num_reps, init_action_dist=None):
+        action_dists = self._init_action_dists(num_reps, init_action_dist)
+
+        for t in range(T+1):
+            player_inds = np.random.randint(self.N, size=num_reps)
+            # Actions the revising players are playing
+            actions = (action_dists.cumsum(axis=1) <=
+                       player_inds[:, np.newaxis]).sum(axis=1)
+            self._play_vectorized(action_dists, actions)
+
+        return action_dists
+
+    def _play_vectorized(self, action_dists, current_actions):
+        """
+        Vectorized version of `play` over the rows of `action_dists`,
+        which are updated in place.
+
+        """
+        rows = np.arange(action_dists.shape[0])
+        action_dists[rows, current_actions] -= 1
+        next_actions = self._best_responses(action_dists)
+        action_dists[rows, next_actions] += 1
+
+    # Markov chain over the action distributions #
+
+    def state_index(self, action_dists):
+        """
+        Return the indices of action distributions in the state space
+        of the dynamics, given by the combinatorial number system as in
+        `SymmetricNormalFormGame.index`.
+
+        Parameters
+        ----------
+        action_dists : array_like(int)
+            Action distribution, or array of action distributions along
+            the last axis.
+
+        Returns
+        -------
+        scalar(int) or ndarray(int)
+            Index, or array of indices, of `action_dists`.
+
+        """
+        return composition_rank(action_dists, self.N)
+
+    def states(self, indices=None):
+        """
+        Return the action distributions with state indices `indices`,
+        i.e., the inverse of `state_index`.
+
+        Parameters
+        ----------
+        indices : array_like(int, ndim=1), optional(default=None)
+            Array of state indices. If None, all the states are returned
+            in the order of their indices.
+
+        Returns
+        -------
+        ndarray(int, ndim=2)
+            Array of shape (len(indices), num_actions) of action
+            distributions.
+
+        """
+        return composition_unrank(self.N, self.num_actions, indices)
+
+    def _best_response_probs(self, opponent_action_dists):
+        """
+        Return the array of shape (B, num_actions) of the probabilities
+        of choosing each action as a best response to each of the B
+        opponent action distributions, under `tie_breaking`.
+
+        """
+        num_dists = opponent_action_dists.shape[0]
+        probs = np.zeros((num_dists, self.num_actions))
+        if num_dists == 0:
+            return probs
+        if self.tie_breaking == 'smallest':
+            best_responses = self._best_responses(opponent_action_dists)
+            probs[np.arange(num_dists), best_responses] = 1
+        else:
+            indices, indptr = self.player.best_responses(
+                opponent_action_dists, tie_breaking=False
+            )
+            nums_best_responses = np.diff(indptr)
+            rows = np.repeat(np.arange(num_dists), nums_best_responses)
+            probs[rows, indices] = 1 / nums_best_responses[rows]
+        return probs
+
+    def _next_action_probs(self, opponent_action_dists):
+        """
+        Return the array of shape (B, num_actions) of the probabilities
+        of the next action of a revising player facing each of the B
+        opponent action distributions, as by `play`.
+
+        """
+        return self._best_response_probs(opponent_action_dists)
+
+    def transition_matrix(self):
+        """
+        Return the transition matrix of the dynamics as a Markov chain
+        over the action distributions, i.e., the compositions of N into
+        `num_actions` parts, indexed by `state_index`.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix(float, ndim=2)
+            Transition matrix of shape (M, M), where M is the number of
+            the action distributions.
+
+        """
+        states = self.states()
+        num_states = states.shape[0]
+        rows, cols, data = [], [], []
+        for a in range(self.num_actions):
+            # States where some player playing a revises
+            revisers = np.nonzero(states[:, a])[0]
+            opponent_action_dists = states[revisers]
+            opponent_action_dists[:, a] -= 1
+            probs = self._next_action_probs(opponent_action_dists) * \
+                (states[revisers, a] / self.N)[:, np.newaxis]
+            for b in range(self.num_actions):
+                opponent_action_dists[:, b] += 1
+                rows.append(revisers)
+                cols.append(self.state_index(opponent_action_dists))
+                data.append(probs[:, b])
+                opponent_action_dists[:, b] -= 1
+
+        rows, cols, data = \
+            np.concatenate(rows), np.concatenate(cols), np.concatenate(data)
+        nonzero = data > 0
+        return sparse.csr_matrix(
+            (data[nonzero], (rows[nonzero], cols[nonzero])),
+            shape=(num_states, num_states)
+        )
+
+    def stationary_distribution(self):
+        """
+        Return the stationary distribution of the dynamics over the
+        action distributions, which must be irreducible (as KMR with
+        epsilon > 0). For two actions, the dynamics is a birth-death
+        chain, for which the distribution is computed in O(N) by the
+        detailed balance condition.
+
+        Returns
+        -------
+        ndarray(float, ndim=1)
+            Stationary distribution, indexed by `state_index`.
+
+        """
+        P = self.transition_matrix()
+        num_components, _ = csgraph.connected_components(
+            P, directed=True, connection='strong'
+        )
+        if num_components > 1:
+            raise ValueError(
+                'the Markov chain is not irreducible; '
+                'use absorption_probabilities instead'
+            )
+        num_states = P.shape[0]
+        if num_states == 1:
+            return np.ones(1)
+
+        if self.num_actions == 2:
+            # State k has k players playing action 0
+            k = np.arange(num_states-1)
+            log_ratios = np.log(np.asarray(P[k, k+1]).ravel()) - \
+                np.log(np.asarray(P[k+1, k]).ravel())
+            log_dist = np.concatenate(([0], log_ratios.cumsum()))
+            dist = np.exp(log_dist - log_dist.max())
+            return dist / dist.sum()
+
+        # Solve x (P - I) = 0 with x[-1] fixed to 1, then normalize
+        A = (P.T - sparse.identity(num_states)).tocsc()
+        dist = np.ones(num_states)
+        dist[:-1] = spsolve(A[:-1, :-1], -A[:-1, -1].toarray().ravel())
+        dist[dist < 0] = 0
+        return dist / dist.sum()
+
+    def hitting_times(self, targets):
+        """
+        Return the expected hitting times of the set of action
+        distributions `targets`.
+
+        Parameters
+        ----------
+        targets : array_like(int)
+            Action distribution, or array of action distributions along
+            the last axis.
+
+        Returns
+        -------
+        ndarray(float, ndim=1)
+            Array of the expected numbers of steps to reach `targets`
+            from the states, indexed by `state_index`; it is zero on
+            `targets`, and inf on the states from which the dynamics
+            does not reach `targets` with probability one.
+
+        """
+        P = self.transition_matrix()
+        num_states = P.shape[0]
+        is_target = np.zeros(num_states, dtype=bool)
+        is_target[self.state_index(targets)] = True
+
+        # Graph of the chain stopped at targets
+        graph = sparse.diags((~is_target).astype(float)).dot(P)
+        can_reach_targets = _can_reach(graph, is_target)
+        is_finite = ~_can_reach(graph, ~can_reach_targets)
+
+        times = np.full(num_states, np.inf)
+        times[is_target] = 0
+        transients = np.nonzero(is_finite & ~is_target)[0]
+        if len(transients) > 0:
+            Q = P[transients][:, transients]
+            A = (sparse.identity(len(transients)) - Q).tocsc()
+            times[transients] = spsolve(A, np.ones(len(transients)))
+        return times
+
+    def simulate_events(self, ts_length, init_action_dist=None):
+        """
+        Simulate the dynamics for `ts_length` steps by skipping the
+        steps at which the action distribution does not change.
+
+        At each action distribution, the probability that a step
+        changes it is computed, the waiting time until the next change
+        is drawn from the geometric distribution, and the change is
+        drawn from the transition probabilities conditional on a
+        change. The trajectory has the same distribution as that of
+        `simulate`, which makes long runs feasible when changes are
+        rare, as with KMR with a small `epsilon` near a convention.
+
+        Parameters
+        ----------
+        ts_length : scalar(int)
+            Length of the simulation.
+
+        init_action_dist : array_like(int, ndim=1),
+                           optional(default=None)
+            Initial action distribution. If not supplied, randomly
+            chosen as in `set_init_action_dist`.
+
+        Returns
+        -------
+        times : ndarray(int, ndim=1)
+            Array of the times at which the action distribution
+            changes, starting with 0.
+
+        action_dists : ndarray(int, ndim=2)
+            Array of shape (len(times), num_actions) whose j-th row is
+            the action distribution from `times[j]` until `times[j+1]`
+            (or `ts_length`). The sequence as returned by `simulate` is
+            recovered by `np.repeat(action_dists, np.diff(np.append(
+            times, ts_length)), axis=0)`.
+
+        """
+        self.set_init_action_dist(init_action_dist=init_action_dist)
+        x = self.current_action_dist
+        # Change probability and cdf of the changes (a -> b) by state
+        changes = {}
+
+        times, action_dists = [], []
+        t = 0
+        while t < ts_length:
+            times.append(t)
+            action_dists.append(x.copy())
+
+            key = tuple(x)
+            if key not in changes:
+                opponent_action_dists = x - np.identity(self.num_actions,
+                                                        dtype=int)
+                probs = self._next_action_probs(
+                    np.maximum(opponent_action_dists, 0)
+                ) * (x / self.N)[:, np.newaxis]
+                np.fill_diagonal(probs, 0)
+                cdf = probs.ravel().cumsum()
+                changes[key] = (cdf[-1], cdf)
+            prob_change, cdf = changes[key]
+            if prob_change <= 0:  # Absorbing
+                break
+
+            # Step at which the next change occurs is t + waiting_time - 1
+            t += np.random.geometric(min(prob_change, 1))
+            if t > ts_length:
+                break
+            k = min(np.searchsorted(cdf, np.random.random() * prob_change,
+                                    side='right'), len(cdf)-1)
+            a, b = divmod(k, self.num_actions)
+            x[a] -= 1
+            x[b] += 1
+
+        return np.array(times, dtype=int), \
+            np.array(action_dists, dtype=int).reshape(-1, self.num_actions)
+
+    def absorption_probabilities(self):
+        """
+        Return the probabilities of absorption into the recurrent
+        classes of the dynamics, such as the conventions of BRD.
+
+        Returns
+        -------
+        recurrent_classes : list(ndarray(int, ndim=1))
+            List of the arrays of the state indices of the recurrent
+            classes, sorted by their smallest indices.
+
+        probs : ndarray(float, ndim=2)
+            Array of shape (M, len(recurrent_classes)) whose (x, c)
+            entry is the probability that the dynamics starting at state
+            x is absorbed into `recurrent_classes[c]`.
+
+        """
+        P = self.transition_matrix()
+        num_states = P.shape[0]
+        num_components, labels = csgraph.connected_components(
+            P, directed=True, connection='strong'
+        )
+        sources, targets = P.nonzero()
+        is_sink = np.ones(num_components, dtype=bool)
+        is_sink[labels[sources[labels[sources] != labels[targets]]]] = False
+
+        recurrent_classes = [np.nonzero(labels == c)[0]
+                             for c in np.nonzero(is_sink)[0]]
+        recurrent_classes.sort(key=lambda states: states[0])
+
+        probs = np.zeros((num_states, len(recurrent_classes)))
+        for c, states in enumerate(recurrent_classes):
+            probs[states, c] = 1
+        transients = np.nonzero(~is_sink[labels])[0]
+        if len(transients) > 0:
+            Q = P[transients][:, transients]
+            A = (sparse.identity(len(transients)) - Q).tocsc()
+            B = P[transients].dot(probs)
+            probs[transients] = \
+                spsolve(A, B).reshape(len(transients), -1)
+        return recurrent_classes, probs
+
 
 class KMR(BRD):
-    def __init__(self, payoff_matrix, N, epsilon=0.1):
-        BRD.__init__(self, payoff_matrix, N)
+    def __init__(self, payoff_matrix, N, epsilon=0.1, dtype=None):
+        BRD.__init__(self, payoff_matrix, N, dtype=dtype)
 
         # Mutation probability
         self.epsilon = epsilon
 
+    def _nb_params(self):
+        if not self._nb_enabled(KMR.play):
+            return None
+        return (_KMR, self.epsilon, 0)
+
     def play(self, current_action):
         if np.random.random() < self.epsilon:  # Mutation
             self.current_action_dist[current_action] -= 1
@@ -110,20 +623,332 @@ class KMR(BRD):
         else:  # Best response
             BRD.play(self, current_action)
 
+    def _play_vectorized(self, action_dists, current_actions):
+        num_reps = action_dists.shape[0]
+        rows = np.arange(num_reps)
+        mutation = np.random.random(num_reps) < self.epsilon
+        best_response = ~mutation
+
+        action_dists[rows, current_actions] -= 1
+        next_actions = np.empty(num_reps, dtype=int)
+        next_actions[mutation] = \
+            np.random.randint(self.num_actions, size=mutation.sum())
+        if best_response.any():
+            next_actions[best_response] = \
+                self._best_responses(action_dists[best_response])
+        action_dists[rows, next_actions] += 1
+
+    def _next_action_probs(self, opponent_action_dists):
+        return (1 - self.epsilon) * \
+            self._best_response_probs(opponent_action_dists) + \
+            self.epsilon / self.num_actions
+
 
 class SamplingBRD(BRD):
-    def __init__(self, payoff_matrix, N, k=2):
-        BRD.__init__(self, payoff_matrix, N)
+    def __init__(self, payoff_matrix, N, k=2, dtype=None):
+        BRD.__init__(self, payoff_matrix, N, dtype=dtype)
 
         # Sample size
         self.k = k
 
+    def _nb_params(self):
+        if not self._nb_enabled(SamplingBRD.play):
+            return None
+        return (_SAMPLING_BRD, 0., self.k)
+
     def play(self, current_action):
         self.current_action_dist[current_action] -= 1
         opponent_action_dist = self.current_action_dist
         actions = np.random.choice(self.num_actions, size=self.k, replace=True,
                                    p=opponent_action_dist/(self.N-1))
         sample_action_dist = np.bincount(actions, minlength=self.num_actions)
-        next_action = self.player.best_response(sample_action_dist,
-                                                tie_breaking=self.tie_breaking)
+        next_action = self._best_response(sample_action_dist)
         self.current_action_dist[next_action] += 1
+
+    def _play_vectorized(self, action_dists, current_actions):
+        num_reps = action_dists.shape[0]
+        rows = np.arange(num_reps)
+        action_dists[rows, current_actions] -= 1
+
+        # Sample k opponents with replacement by their positions
+        positions = np.random.randint(self.N-1, size=(num_reps, self.k))
+        samples = (action_dists.cumsum(axis=1)[:, np.newaxis, :] <=
+                   positions[:, :, np.newaxis]).sum(axis=2)
+        sample_action_dists = np.bincount(
+            (samples + rows[:, np.newaxis] * self.num_actions).ravel(),
+            minlength=num_reps*self.num_actions
+        ).reshape(num_reps, self.num_actions)
+
+        next_actions = self._best_responses(sample_action_dists)
+        action_dists[rows, next_actions] += 1
+
+    def _next_action_probs(self, opponent_action_dists):
+        # All the samples of size k, with their multinomial probabilities
+        samples = composition_unrank(self.k, self.num_actions)
+        ps = opponent_action_dists / (self.N-1)
+        log_probs = gammaln(self.k+1) - gammaln(samples+1).sum(axis=1) + \
+            xlogy(samples[np.newaxis], ps[:, np.newaxis]).sum(axis=2)
+        return np.exp(log_probs).dot(self._best_response_probs(samples))
+
+
+def _can_reach(graph, is_source):
+    """
+    Return the boolean array indicating the nodes of `graph` from which
+    some node with `is_source` True is reachable.
+
+    """
+    # Search the reversed graph from an auxiliary node pointing to the
+    # sources
+    num_nodes = graph.shape[0]
+    sources = np.nonzero(is_source)[0]
+    graph = graph.tocoo()
+    rows = np.concatenate((graph.col, np.full(len(sources), num_nodes)))
+    cols = np.concatenate((graph.row, sources))
+    reversed_graph = sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(num_nodes+1, num_nodes+1)
+    )
+    nodes = csgraph.breadth_first_order(
+        reversed_graph, num_nodes, directed=True, return_predecessors=False
+    )
+    is_reachable = np.zeros(num_nodes, dtype=bool)
+    is_reachable[nodes[nodes < num_nodes]] = True
+    return is_reachable
+
+
+# Numba jitted functions #
+
+@jit(nopython=True)
+def _mt_reload(key):
+    """
+    Regenerate the 624 words of the Mersenne Twister state `key` in
+    place, as in the MT19937 generator of `np.random`.
+
+    """
+    n, m = 624, 397
+    for i in range(n):
+        y = (np.int64(key[i]) & 0x80000000) | \
+            (np.int64(key[(i+1) % n]) & 0x7fffffff)
+        x = np.int64(key[(i+m) % n]) ^ (y >> 1)
+        if y & 1:
+            x ^= 0x9908b0df
+        key[i] = x
+
+
+@jit(nopython=True)
+def _next_uint32(key, pos):
+    """
+    Return the next 32-bit output of the Mersenne Twister with state
+    `(key, pos[0])`, and advance the state.
+
+    """
+    if pos[0] >= 624:
+        _mt_reload(key)
+        pos[0] = 0
+    y = np.int64(key[pos[0]])
+    pos[0] += 1
+    y ^= y >> 11
+    y ^= (y << 7) & 0x9d2c5680
+    y ^= (y << 15) & 0xefc60000
+    y ^= y >> 18
+    return y & 0xffffffff
+
+
+@jit(nopython=True)
+def _next_double(key, pos):
+    """
+    Return the random float in [0, 1) generated from two outputs of the
+    Mersenne Twister as by `np.random.random`.
+
+    """
+    a = _next_uint32(key, pos) >> 5
+    b = _next_uint32(key, pos) >> 6
+    return (a * 67108864. + b) / 9007199254740992.
+
+
+@jit(nopython=True)
+def _next_randint(key, pos, n):
+    """
+    Return the random integer in [0, n) generated from the outputs of
+    the Mersenne Twister as by `np.random.randint(n)` (by masked
+    rejection sampling).
+
+    """
+    rng = n - 1
+    if rng == 0:
+        return 0
+    mask = rng
+    mask |= mask >> 1
+    mask |= mask >> 2
+    mask |= mask >> 4
+    mask |= mask >> 8
+    mask |= mask >> 16
+    while True:
+        val = _next_uint32(key, pos) & mask
+        if val <= rng:
+            return val
+
+
+@jit(nopython=True)
+def _payoff_vector_counts(payoff_matrix, action_dist, out):
+    """
+    Store in `out` the payoff vector against the opponent action counts
+    `action_dist`, summed sequentially over the opponent actions.
+
+    """
+    n = payoff_matrix.shape[0]
+    for a in range(n):
+        payoff = 0.
+        for b in range(n):
+            payoff += payoff_matrix[a, b] * action_dist[b]
+        out[a] = payoff
+    return out
+
+
+@jit(nopython=True)
+def _argmax_bound(payoff_vector, bound):
+    """
+    Return the action with the maximum payoff (the smallest one if
+    tied), as by `np.argmax` of the payoff vector computed by
+    `Player.payoff_vector`, where each payoff in `payoff_vector` may be
+    off by at most `bound` from the value computed by the latter, or
+    return -1 if the choice may depend on these errors.
+
+    """
+    n = payoff_vector.shape[0]
+    best = 0
+    for a in range(1, n):
+        if payoff_vector[a] > payoff_vector[best]:
+            best = a
+    if bound > 0:
+        for a in range(n):
+            if a != best and \
+                    payoff_vector[best] - payoff_vector[a] <= 2 * bound:
+                return -1
+    return best
+
+
+@jit(nopython=True)
+def _simulate_nb(model, payoff_matrix, error_unit, N, epsilon, k,
+                 action_dist, query, player_ind_sequence, t_start, key, pos,
+                 out):
+    """
+    Run the steps `t_start, ..., ts_length-1`, where `ts_length =
+    len(player_ind_sequence)`, of BRD (`model=0`), KMR (`model=1`) or
+    SamplingBRD (`model=2`), updating `action_dist` in place.
+
+    The random draws by `KMR.play` and `SamplingBRD.play` are generated
+    from the Mersenne Twister state `(key, pos[0])` of `np.random`, which
+    is advanced in place by exactly the number of outputs consumed.
+
+    For BRD and KMR, the payoff vector against `action_dist` is updated
+    incrementally, by subtracting and adding one payoff column per
+    change of an agent's action, which takes O(n) per step. With payoffs
+    computed exactly (`error_unit=0`) the updates are exact; otherwise
+    the vector is recomputed after every n updates, and the best
+    response is determined only if it does not depend on the rounding
+    errors, bounded by `error_unit` per addition.
+
+    Parameters
+    ----------
+    query : ndarray(int, ndim=1)
+        Array to store the action counts to which the best response is
+        to be computed by the caller.
+
+    out : ndarray(int, ndim=2)
+        Array to store the action distribution before each step, of
+        shape (ts_length, n), or of shape (0, n) for no recording.
+
+    Returns
+    -------
+    scalar(int)
+        `ts_length` if all the steps are done; otherwise the step at
+        which the best response to `query` could not be determined, with
+        the revising player removed from `action_dist`, to be completed
+        by the caller.
+
+    """
+    n = action_dist.shape[0]
+    ts_length = player_ind_sequence.shape[0]
+    record = out.shape[0] > 0
+    cdf = np.empty(n)
+
+    # Payoff columns, and the payoff vector against action_dist
+    payoff_columns = np.ascontiguousarray(payoff_matrix.T)
+    payoff_vector = np.empty(n)
+    _payoff_vector_counts(payoff_matrix, action_dist, payoff_vector)
+    # Number of additions since the last recomputation
+    num_updates = 0
+
+    for t in range(t_start, ts_length):
+        if record:
+            out[t] = action_dist
+
+        # Action the revising player is playing
+        action = n - 1
+        cumsum = 0
+        for a in range(n):
+            cumsum += action_dist[a]
+            if cumsum > player_ind_sequence[t]:
+                action = a
+                break
+
+        if model == _KMR:
+            if _next_double(key, pos) < epsilon:  # Mutation
+                next_action = _next_randint(key, pos, n)
+                if next_action != action:
+                    action_dist[action] -= 1
+                    action_dist[next_action] += 1
+                    for a in range(n):
+                        payoff_vector[a] += payoff_columns[next_action, a] - \
+                            payoff_columns[action, a]
+                    num_updates += 2
+                continue
+
+        if model == _SAMPLING_BRD:
+            action_dist[action] -= 1
+            # As in np.random.choice with p
+            c = 0.
+            for a in range(n):
+                c += action_dist[a] / (N-1)
+                cdf[a] = c
+            for a in range(n):
+                cdf[a] /= c
+            query[:] = 0
+            for _ in range(k):
+                u = _next_double(key, pos)
+                idx = n - 1
+                for a in range(n):
+                    if cdf[a] > u:
+                        idx = a
+                        break
+                query[idx] += 1
+            _payoff_vector_counts(payoff_matrix, query, cdf)
+            next_action = _argmax_bound(cdf, error_unit * 2 * n)
+            if next_action == -1:
+                return t
+            action_dist[next_action] += 1
+            continue
+
+        action_dist[action] -= 1
+        if error_unit > 0 and num_updates >= n:
+            _payoff_vector_counts(payoff_matrix, action_dist, payoff_vector)
+            num_updates = 0
+        else:
+            for a in range(n):
+                payoff_vector[a] -= payoff_columns[action, a]
+            num_updates += 1
+        next_action = _argmax_bound(payoff_vector,
+                                    error_unit * (2*n + num_updates))
+        if next_action == -1:  # Near tie within the rounding errors
+            _payoff_vector_counts(payoff_matrix, action_dist, payoff_vector)
+            num_updates = 0
+            next_action = _argmax_bound(payoff_vector, error_unit * 2 * n)
+            if next_action == -1:
+                query[:] = action_dist
+                return t
+        action_dist[next_action] += 1
+        for a in range(n):
+            payoff_vector[a] += payoff_columns[next_action, a]
+        num_updates += 1
+
+    return ts_length
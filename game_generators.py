@@ -0,0 +1,223 @@
+"""
+Filename: game_generators.py
+
+Generators of random normal form games.
+
+The payoff arrays are generated directly in the layout of `Player`,
+where player i's payoff array has shape (n_i, n_{i+1}, ..., n_{i-1}),
+without going through a payoff profile array. `random_games` generates
+a batch of games into one buffer, of which the players' payoff arrays
+are views.
+
+>>> g = random_game((2, 3), random_state=1234)
+>>> g.nums_actions
+(2, 3)
+>>> g_batch = random_games((2, 3), num_games=10, random_state=1234)
+>>> bool((g_batch[0].payoff_profile_array == g.payoff_profile_array).all())
+True
+
+"""
+from __future__ import division
+
+import numpy as np
+from normal_form_game import Player, NormalFormGame
+from util import check_random_state
+
+# Number of payoffs drawn at a time into a preallocated buffer
+_FILL_CHUNK_SIZE = 2**16
+
+
+def random_game(nums_actions, random_state=None):
+    """
+    Return a random NormalFormGame instance where the payoffs are drawn
+    independently from the uniform distribution on [0, 1).
+
+    Parameters
+    ----------
+    nums_actions : tuple(int)
+        Tuple of the numbers of actions, one for each player.
+
+    random_state : scalar(int) or np.random.RandomState,
+                   optional(default=None)
+        Random seed (integer) or np.random.RandomState instance to set
+        the initial state of the random number generator for
+        reproducibility. If None, the global RandomState instance of
+        `np.random` is used.
+
+    Returns
+    -------
+    NormalFormGame
+
+    """
+    return random_games(nums_actions, 1, random_state=random_state)[0]
+
+
+def random_games(nums_actions, num_games, random_state=None, out=None):
+    """
+    Return a list of random NormalFormGame instances where the payoffs
+    are drawn independently from the uniform distribution on [0, 1).
+
+    The payoffs of all the games are generated in one call to the random
+    number generator into one buffer, and the players' payoff arrays are
+    views of the buffer. The first game is equal to the one returned by
+    `random_game` with the same `random_state`.
+
+    Parameters
+    ----------
+    nums_actions : tuple(int)
+        Tuple of the numbers of actions, one for each player.
+
+    num_games : scalar(int)
+        Number of games to generate.
+
+    random_state : scalar(int) or np.random.RandomState,
+                   optional(default=None)
+        See `random_game`.
+
+    out : ndarray(float, ndim=1), optional(default=None)
+        Preallocated buffer of floats of size `num_games *
+        payoff_buffer_size(nums_actions)` into which the payoffs are
+        generated, in blocks so that no temporary array of the same size
+        is allocated. Its data type determines that of the payoff
+        arrays.
+
+    Returns
+    -------
+    list(NormalFormGame)
+        List of `num_games` NormalFormGame instances.
+
+    """
+    nums_actions = _check_nums_actions(nums_actions)
+    random_state = check_random_state(random_state)
+    size = num_games * payoff_buffer_size(nums_actions)
+
+    if out is None:
+        out = random_state.random_sample(size)
+    else:
+        if out.shape != (size,):
+            raise ValueError('out must be of shape ({0},)'.format(size))
+        if out.dtype.kind != 'f':
+            raise ValueError('out must be an array of floats')
+        # The draws in blocks are the same as those in one call
+        for start in range(0, size, _FILL_CHUNK_SIZE):
+            stop = min(start+_FILL_CHUNK_SIZE, size)
+            out[start:stop] = random_state.random_sample(stop-start)
+
+    return _games_from_buffer(out, nums_actions, num_games)
+
+
+def covariance_game(nums_actions, rho, random_state=None):
+    """
+    Return a random NormalFormGame instance where the payoff profiles
+    are drawn independently from the standard multivariate normal
+    distribution with the covariance of any pair of payoffs equal to
+    `rho`.
+
+    Parameters
+    ----------
+    nums_actions : tuple(int)
+        Tuple of the numbers of actions, one for each of N >= 2 players.
+
+    rho : scalar(float)
+        Covariance of a pair of payoff values. Must be in [-1/(N-1), 1].
+
+    random_state : scalar(int) or np.random.RandomState,
+                   optional(default=None)
+        See `random_game`.
+
+    Returns
+    -------
+    NormalFormGame
+
+    References
+    ----------
+    E. Nudelman, J. Wortman, Y. Shoham, and K. Leyton-Brown, "Run the
+    GAMUT: A Comprehensive Approach to Evaluating Game-Theoretic
+    Algorithms," 2004.
+
+    """
+    nums_actions = _check_nums_actions(nums_actions)
+    N = len(nums_actions)
+    if N <= 1:
+        raise ValueError('length of nums_actions must be at least 2')
+    if not (-1 / (N - 1) <= rho <= 1):
+        raise ValueError('rho must be in [-1/(N-1), 1]')
+    random_state = check_random_state(random_state)
+
+    # Factor L of the covariance matrix with L L' = cov; by the
+    # eigendecomposition since cov is singular for rho = -1/(N-1) or 1
+    cov = np.full((N, N), rho, dtype=float)
+    np.fill_diagonal(cov, 1)
+    eigvals, eigvecs = np.linalg.eigh(cov)
+    L = eigvecs * np.sqrt(np.maximum(eigvals, 0))
+
+    # Z[k] is the k-th independent standard normal array in the common
+    # axis order; player i's payoff array is sum_k L[i, k] Z[k], written
+    # in player i's axis order
+    Z = random_state.standard_normal((N,) + nums_actions)
+    buffer = np.empty(payoff_buffer_size(nums_actions))
+    payoff_arrays = _payoff_array_views(buffer, nums_actions)
+    for i, payoff_array in enumerate(payoff_arrays):
+        axes = [0] + [(i+j) % N + 1 for j in range(N)]
+        np.einsum(L[i], [0], Z.transpose(axes), list(range(N+1)),
+                  list(range(1, N+1)), out=payoff_array)
+
+    return NormalFormGame([Player(payoff_array)
+                           for payoff_array in payoff_arrays])
+
+
+def payoff_buffer_size(nums_actions):
+    """
+    Return the number of payoff values of a game with `nums_actions`,
+    i.e., N times the number of action profiles.
+
+    """
+    return len(nums_actions) * int(np.prod(nums_actions))
+
+
+def _check_nums_actions(nums_actions):
+    nums_actions = tuple(int(n) for n in nums_actions)
+    if len(nums_actions) == 0 or min(nums_actions) < 1:
+        raise ValueError('nums_actions must be a nonempty tuple of ' +
+                         'positive integers')
+    return nums_actions
+
+
+def _payoff_array_views(buffer, nums_actions):
+    """
+    Return the list of the players' payoff arrays as views of the
+    1-dimensional `buffer`, in which they are stored consecutively.
+
+    """
+    N = len(nums_actions)
+    num_profiles = int(np.prod(nums_actions))
+    return [
+        buffer[i*num_profiles:(i+1)*num_profiles].reshape(
+            nums_actions[i:] + nums_actions[:i]
+        ) for i in range(N)
+    ]
+
+
+def _games_from_buffer(buffer, nums_actions, num_games):
+    """
+    Return the list of `num_games` NormalFormGame instances whose
+    payoff arrays are views of `buffer`.
+
+    """
+    N = len(nums_actions)
+    num_profiles = int(np.prod(nums_actions))
+    shapes = [nums_actions[i:] + nums_actions[:i] for i in range(N)]
+
+    # The views are consistent by construction, so the Players and the
+    # NormalFormGames are constructed without the input checks
+    arrays = buffer.reshape(num_games, N, num_profiles)
+    # payoff_arrays[i][k] is player i's payoff array in the k-th game
+    payoff_arrays = [arrays[:, i].reshape((num_games,) + shapes[i])
+                     for i in range(N)]
+    games = []
+    for k in range(num_games):
+        players = tuple(
+            Player(payoff_arrays[i][k], _validate=False) for i in range(N)
+        )
+        games.append(NormalFormGame(players, _validate=False))
+    return games
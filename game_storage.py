@@ -0,0 +1,180 @@
+"""
+Filename: game_storage.py
+
+Binary on-disk storage of normal form games, which can be loaded by
+memory mapping without copying the payoff arrays.
+
+A file consists of a magic string, a little-endian 4-byte unsigned
+integer giving the length of the header, the header, and the payoff
+arrays of the players in C order. The header is an ASCII-encoded JSON
+object with keys `'N'`, `'nums_actions'` and `'players'`, the last being
+the list of `{'dtype': ..., 'shape': ..., 'offset': ...}`, one for each
+player, where `'offset'` is the byte offset of the payoff array from the
+end of the header. The header is padded with spaces so that the data
+are aligned to `ALIGNMENT` bytes.
+
+>>> import os, tempfile
+>>> g = NormalFormGame([[(1, -1), (-1, 1)], [(-1, 1), (1, -1)]])
+>>> path = os.path.join(tempfile.mkdtemp(), 'matching_pennies.nfg')
+>>> save_game(g, path)
+>>> g_loaded = load_game(path)
+>>> print(g_loaded.players[0])
+Player in a 2-player normal form game with payoff array:
+[[ 1, -1],
+ [-1,  1]]
+>>> g_loaded.is_nash(([1/2, 1/2], [1/2, 1/2]))
+True
+
+"""
+from __future__ import division
+
+import json
+import struct
+import numpy as np
+from normal_form_game import Player, NormalFormGame
+
+MAGIC = b'\x93NFGAME\x01'
+ALIGNMENT = 64
+
+
+def save_game(g, path):
+    """
+    Save a normal form game to a binary file.
+
+    The payoff arrays are written through memory maps, so that no copy
+    of an array is made in memory even if it is not C-contiguous.
+
+    Parameters
+    ----------
+    g : NormalFormGame
+        NormalFormGame instance to save.
+
+    path : str
+        Path of the file to write.
+
+    """
+    if not isinstance(g, NormalFormGame):
+        raise ValueError('input must be a NormalFormGame')
+
+    players_meta = []
+    offset = 0
+    for player in g.players:
+        payoff_array = player.payoff_array
+        if payoff_array.dtype.hasobject:
+            raise ValueError('payoff arrays of object dtype are not supported')
+        players_meta.append({
+            'dtype': payoff_array.dtype.str,
+            'shape': [int(n) for n in payoff_array.shape],
+            'offset': offset,
+        })
+        offset += _aligned(payoff_array.nbytes)
+
+    header = json.dumps({
+        'N': g.N,
+        'nums_actions': [int(n) for n in g.nums_actions],
+        'players': players_meta,
+    }).encode('ascii')
+    preamble_nbytes = len(MAGIC) + 4
+    header += b' ' * (_aligned(preamble_nbytes + len(header)) -
+                      (preamble_nbytes + len(header)))
+    data_offset = preamble_nbytes + len(header)
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        f.truncate(data_offset + offset)
+
+    for player, meta in zip(g.players, players_meta):
+        if player.payoff_array.size == 0:
+            continue
+        mapped = np.memmap(path, dtype=meta['dtype'], mode='r+',
+                           offset=data_offset+meta['offset'],
+                           shape=tuple(meta['shape']))
+        mapped[...] = player.payoff_array
+        mapped.flush()
+        del mapped
+
+
+def load_game(path, mmap_mode='r'):
+    """
+    Load a normal form game saved by `save_game`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to read.
+
+    mmap_mode : {'r', 'r+', 'c', None}, optional(default='r')
+        Mode in which the payoff arrays are memory-mapped (see
+        `np.memmap`). With 'r', the payoff arrays are read-only; with
+        'r+', assignments to the game are written to the file; with
+        'c', assignments are made in memory only. If None, the payoff
+        arrays are read into memory.
+
+    Returns
+    -------
+    NormalFormGame
+        NormalFormGame instance whose players' payoff arrays are views
+        of the memory maps of the file, unless `mmap_mode=None`.
+
+    """
+    if mmap_mode not in ('r', 'r+', 'c', None):
+        raise ValueError("mmap_mode must be one of 'r', 'r+', 'c' or None")
+
+    header, data_offset = read_header(path)
+
+    payoff_arrays = []
+    for meta in header['players']:
+        dtype = np.dtype(meta['dtype'])
+        shape = tuple(meta['shape'])
+        offset = data_offset + meta['offset']
+        if mmap_mode is None or np.prod(shape) == 0:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                payoff_array = np.fromfile(
+                    f, dtype=dtype, count=int(np.prod(shape))
+                ).reshape(shape)
+        else:
+            payoff_array = np.memmap(path, dtype=dtype, mode=mmap_mode,
+                                     offset=offset, shape=shape)
+        payoff_arrays.append(payoff_array)
+
+    return NormalFormGame([Player(payoff_array)
+                           for payoff_array in payoff_arrays])
+
+
+def read_header(path):
+    """
+    Read the header of a file saved by `save_game`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to read.
+
+    Returns
+    -------
+    header : dict
+        Dictionary with keys 'N', 'nums_actions' and 'players'.
+
+    data_offset : scalar(int)
+        Byte offset of the data from the beginning of the file.
+
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError('{0} is not a normal form game file'.format(path))
+        header_nbytes, = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_nbytes).decode('ascii'))
+
+    return header, len(MAGIC) + 4 + header_nbytes
+
+
+def _aligned(nbytes):
+    """
+    Round `nbytes` up to a multiple of `ALIGNMENT`.
+
+    """
+    return -(-nbytes // ALIGNMENT) * ALIGNMENT
@@ -0,0 +1,417 @@
+"""
+Filename: lazy_player.py
+
+Player whose payoffs are given by a vectorized function rather than by
+a dense payoff array, for games too large to materialize.
+
+Only the slices of the payoff array that are needed to compute payoff
+vectors, i.e., with the pure actions of the opponents fixed and the
+axes of the opponents playing mixed actions left free, are evaluated.
+Evaluated slices are kept in an LRU cache within a memory budget, and a
+slice larger than the budget is evaluated and contracted block by block
+over the player's own actions.
+
+>>> def payoff_function(a0, a1, a2):
+...     return -(a0 - (a1 + a2) / 2)**2
+>>> player = LazyPlayer(payoff_function, (5, 5, 5))
+>>> print(player.best_response((4, 2)))
+3
+>>> from normal_form_game import NormalFormGame
+>>> g = NormalFormGame([LazyPlayer(payoff_function, (5, 5, 5))
+...                     for i in range(3)])
+>>> g.is_nash((2, 2, 2))
+True
+
+"""
+from __future__ import division
+
+import numbers
+from collections import OrderedDict
+import numpy as np
+from normal_form_game import Player, _default_tol, _batch_opponents_actions
+
+
+class LazyPlayer(Player):
+    """
+    Class representing a player in an N-player normal form game whose
+    payoff function is given by a vectorized function.
+
+    Parameters
+    ----------
+    payoff_function : callable
+        Vectorized function such that `payoff_function(a_0, a_1, ...,
+        a_{N-1})`, for integer arrays a_0, ..., a_{N-1} broadcastable
+        to a common shape, returns the array of payoffs to the player
+        when the player plays a_0 while the N-1 opponents play a_1, ...,
+        a_{N-1}, in the same convention as `Player.payoff_array`.
+
+    nums_actions : array_like(int, ndim=1)
+        Numbers of actions (n_0, n_1, ..., n_{N-1}), where n_0 is the
+        number of the player's actions and n_j that of the j-th
+        opponent.
+
+    memory_budget : scalar(int), optional(default=2**28)
+        Maximum number of bytes of the evaluated slices to be cached,
+        which is also the maximum size of a slice evaluated at a time.
+
+    Attributes
+    ----------
+    payoff_function : callable
+        See Parameters.
+
+    memory_budget : scalar(int)
+        See Parameters.
+
+    num_actions : scalar(int)
+        The number of actions available to the player.
+
+    num_opponents : scalar(int)
+        The number of opponent players.
+
+    """
+    def __init__(self, payoff_function, nums_actions, memory_budget=2**28):
+        self.payoff_function = payoff_function
+        self._payoff_array_shape = tuple(int(n) for n in nums_actions)
+
+        if len(self._payoff_array_shape) == 0:
+            raise ValueError('nums_actions must be of length at least 1')
+
+        self.num_opponents = len(self._payoff_array_shape) - 1
+        self.num_actions = self._payoff_array_shape[0]
+        self.memory_budget = memory_budget
+
+        self.tol = _default_tol(np.dtype(float))
+
+        self._cache = OrderedDict()
+        self._cache_nbytes = 0
+        self._br_table = None
+        # Payoff array materialized for the best response table
+        self._materialized_payoff_array = None
+
+    @property
+    def payoff_array_shape(self):
+        """
+        Shape of the (virtual) payoff array, (n_0, n_1, ..., n_{N-1}).
+
+        """
+        return self._payoff_array_shape
+
+    @property
+    def payoff_array(self):
+        """
+        Materialized payoff array. Raise MemoryError if its size exceeds
+        `memory_budget`. The array is evaluated on each access, except
+        while the best response table is kept (see
+        `precompute_best_response_table`), in which case the read-only
+        array the table was built from is returned.
+
+        """
+        if self._materialized_payoff_array is not None:
+            return self._materialized_payoff_array
+        nbytes = np.prod(self._payoff_array_shape) * \
+            np.dtype(float).itemsize
+        if nbytes > self.memory_budget:
+            raise MemoryError(
+                'payoff array of {0} bytes exceeds memory_budget'.format(
+                    nbytes
+                )
+            )
+        return self._payoff_slice((None,) * self.num_opponents)
+
+    def __str__(self):
+        s = self.__repr__()
+        s += ' with payoff function {0}'.format(self.payoff_function)
+        return s
+
+    def clear_cache(self):
+        """
+        Clear the cache of the evaluated slices.
+
+        """
+        self._cache.clear()
+        self._cache_nbytes = 0
+
+    def precompute_best_response_table(self):
+        """
+        Precompute the best response table as in
+        `Player.precompute_best_response_table`, from the payoff array
+        materialized once and kept until `clear_best_response_table` is
+        called. Raise MemoryError if the payoff array exceeds
+        `memory_budget`.
+
+        """
+        payoff_array = self.payoff_array
+        payoff_array.flags.writeable = False
+        self._materialized_payoff_array = payoff_array
+        Player.precompute_best_response_table(self)
+
+    def clear_best_response_table(self):
+        """
+        Discard the table computed by `precompute_best_response_table`,
+        together with the materialized payoff array.
+
+        """
+        self._materialized_payoff_array = None
+        Player.clear_best_response_table(self)
+
+    def payoff_vector(self, opponents_actions):
+        """
+        Return an array of payoff values, one for each own action, given
+        a profile of the opponents' actions.
+
+        Parameters
+        ----------
+        opponents_actions : see `Player.best_response`.
+
+        Returns
+        -------
+        payoff_vector : ndarray(float, ndim=1)
+            An array representing the player's payoff vector given the
+            profile of the opponents' actions.
+
+        """
+        if self.num_opponents == 0:
+            opponents_actions = ()
+        elif self.num_opponents == 1:
+            opponents_actions = (opponents_actions,)
+        elif len(opponents_actions) != self.num_opponents:
+            raise ValueError(
+                'opponents_actions must be of length {0}'.format(
+                    self.num_opponents
+                )
+            )
+
+        pattern = tuple(
+            _normalize_action(action, self._payoff_array_shape[j+1], j)
+            if isinstance(action, numbers.Integral) else None
+            for j, action in enumerate(opponents_actions)
+        )
+        mixed_actions = [action for action, fixed
+                         in zip(opponents_actions, pattern) if fixed is None]
+
+        slice_shape = (self.num_actions,) + tuple(
+            self._payoff_array_shape[j+1]
+            for j, fixed in enumerate(pattern) if fixed is None
+        )
+        row_nbytes = \
+            np.prod(slice_shape[1:]) * np.dtype(float).itemsize
+
+        if row_nbytes * self.num_actions <= self.memory_budget:
+            payoff_slice = self._cached_payoff_slice(pattern)
+            return _contract(payoff_slice, mixed_actions)
+
+        # Evaluate and contract the slice block by block of own actions
+        chunk_size = max(1, int(self.memory_budget // row_nbytes))
+        payoff_vector = np.empty(self.num_actions)
+        for start in range(0, self.num_actions, chunk_size):
+            own_actions = np.arange(start,
+                                    min(start+chunk_size, self.num_actions))
+            payoff_vector[start:start+chunk_size] = _contract(
+                self._payoff_slice(pattern, own_actions), mixed_actions
+            )
+        return payoff_vector
+
+    def payoff_vectors(self, opponents_actions_batch):
+        """
+        Return an array of payoff vectors, one for each of B profiles of
+        the opponents' actions.
+
+        Parameters
+        ----------
+        opponents_actions_batch : see `Player.payoff_vectors`.
+
+        Returns
+        -------
+        payoff_vectors : ndarray(float, ndim=2)
+            Array of shape (B, n_0) whose b-th row is the player's
+            payoff vector given the b-th profile of the opponents'
+            actions.
+
+        """
+        if self.num_opponents == 0:
+            return self.payoff_vector(None)[np.newaxis, :]
+
+        actions_list = _batch_opponents_actions(self.num_opponents,
+                                                opponents_actions_batch)
+        for j, actions in enumerate(actions_list):
+            n_j = self._payoff_array_shape[j+1]
+            if actions.ndim == 2 and actions.shape[1] != n_j:
+                raise ValueError(
+                    'mixed actions of opponent {0} must be of length '
+                    '{1}'.format(j, n_j)
+                )
+        B = actions_list[0].shape[0]
+
+        # Number of bytes of the payoffs to evaluate per profile
+        free_shape = tuple(self._payoff_array_shape[j+1]
+                           for j, actions in enumerate(actions_list)
+                           if actions.ndim == 2)
+        profile_nbytes = self.num_actions * np.prod(free_shape) * \
+            np.dtype(float).itemsize
+
+        payoff_vectors = np.empty((B, self.num_actions))
+        if profile_nbytes > self.memory_budget:
+            # Evaluate the payoff vectors one at a time block by block
+            for b in range(B):
+                opponents_actions = [
+                    int(actions[b]) if actions.ndim == 1 else actions[b]
+                    for actions in actions_list
+                ]
+                if self.num_opponents == 1:
+                    opponents_actions = opponents_actions[0]
+                payoff_vectors[b] = self.payoff_vector(opponents_actions)
+            return payoff_vectors
+
+        # Evaluate the payoff function once for each block of profiles
+        chunk_size = max(1, int(self.memory_budget // profile_nbytes))
+        for start in range(0, B, chunk_size):
+            stop = min(start+chunk_size, B)
+            payoff_vectors[start:stop] = self._batch_payoff_vectors(
+                [actions[start:stop] for actions in actions_list]
+            )
+        return payoff_vectors
+
+    def _batch_payoff_vectors(self, actions_list):
+        """
+        Return the payoff vectors for the batch of profiles
+        `actions_list` (see `payoff_vectors`), evaluating the payoff
+        function once over the array of shape (B, n_0, m_1, ..., m_k),
+        where m_1, ..., m_k are the numbers of actions of the opponents
+        playing mixed actions.
+
+        """
+        num_free = sum(actions.ndim == 2 for actions in actions_list)
+        ndim = num_free + 2
+
+        own_shape = [1] * ndim
+        own_shape[1] = self.num_actions
+        actions = [np.arange(self.num_actions).reshape(own_shape)]
+        mixed_actions = []
+        k = 0
+        for j, opponent_actions in enumerate(actions_list):
+            n_j = self._payoff_array_shape[j+1]
+            if opponent_actions.ndim == 1:
+                opponent_actions = _normalize_action(opponent_actions, n_j, j)
+                actions.append(opponent_actions.reshape(
+                    (-1,) + (1,) * (ndim-1)
+                ))
+            else:
+                shape = [1] * ndim
+                shape[k+2] = n_j
+                actions.append(np.arange(n_j).reshape(shape))
+                mixed_actions.append(opponent_actions)
+                k += 1
+
+        B = actions_list[0].shape[0]
+        batch_shape = (B, self.num_actions) + tuple(
+            actions.shape[1] for actions in mixed_actions
+        )
+        payoffs = np.broadcast_to(
+            np.asarray(self.payoff_function(*actions), dtype=float),
+            batch_shape
+        )
+        for opponent_actions in reversed(mixed_actions):
+            payoffs = np.einsum('b...j,bj->b...', payoffs, opponent_actions)
+        return payoffs
+
+    def best_response(self, opponents_actions, tie_breaking='smallest',
+                      payoff_perturbation=None, random_state=None):
+        """
+        Return the best response action(s) to `opponents_actions`. See
+        `Player.best_response`.
+
+        """
+        if payoff_perturbation is None:
+            lookup = self._lookup_best_response_table(opponents_actions)
+            if lookup is not None:
+                return self._best_response_from_table(
+                    lookup, tie_breaking, random_state
+                )
+
+        payoff_vector = self.payoff_vector(opponents_actions)
+        if payoff_perturbation is not None:
+            payoff_vector += payoff_perturbation
+
+        return self._select_best_response(payoff_vector, tie_breaking,
+                                          random_state)
+
+    def _cached_payoff_slice(self, pattern):
+        """
+        Return the slice of the payoff array for `pattern` from the LRU
+        cache, evaluating it if not cached.
+
+        """
+        try:
+            payoff_slice = self._cache[pattern]
+            self._cache.move_to_end(pattern)
+            return payoff_slice
+        except KeyError:
+            pass
+
+        payoff_slice = self._payoff_slice(pattern)
+        self._cache[pattern] = payoff_slice
+        self._cache_nbytes += payoff_slice.nbytes
+        while self._cache_nbytes > self.memory_budget:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_nbytes -= evicted.nbytes
+
+        return payoff_slice
+
+    def _payoff_slice(self, pattern, own_actions=None):
+        """
+        Evaluate the slice of the payoff array, with the own actions
+        `own_actions` (all if None) and the opponents' actions fixed as
+        in `pattern`, where None stands for a free axis.
+
+        """
+        if own_actions is None:
+            own_actions = np.arange(self.num_actions)
+        num_free = sum(fixed is None for fixed in pattern)
+
+        actions = [own_actions.reshape((-1,) + (1,) * num_free)]
+        k = 0
+        for j, fixed in enumerate(pattern):
+            if fixed is None:
+                shape = [1] * (num_free + 1)
+                shape[k+1] = self._payoff_array_shape[j+1]
+                actions.append(
+                    np.arange(self._payoff_array_shape[j+1]).reshape(shape)
+                )
+                k += 1
+            else:
+                actions.append(np.array(fixed))
+
+        slice_shape = (len(own_actions),) + tuple(
+            self._payoff_array_shape[j+1]
+            for j, fixed in enumerate(pattern) if fixed is None
+        )
+        payoff_slice = np.asarray(self.payoff_function(*actions), dtype=float)
+        return np.ascontiguousarray(np.broadcast_to(payoff_slice, slice_shape))
+
+
+def _contract(payoff_slice, mixed_actions):
+    """
+    Contract the axes 1, ..., k of `payoff_slice` with the k mixed
+    actions, from the last axis backward.
+
+    """
+    payoff_vector = payoff_slice
+    for action in reversed(mixed_actions):
+        payoff_vector = payoff_vector.dot(action)
+    if payoff_vector is payoff_slice:
+        payoff_vector = payoff_vector.copy()
+    return payoff_vector
+
+
+def _normalize_action(action, n, j):
+    """
+    Return the pure action(s) `action` of opponent j with n actions,
+    with negative actions counted from the end as in indexing, or raise
+    IndexError if out of bounds.
+
+    """
+    if np.any((action < -n) | (action >= n)):
+        raise IndexError(
+            'action {0} is out of bounds for opponent {1}'.format(action, j)
+        )
+    return action % n
@@ -0,0 +1,295 @@
+"""
+Filename: lemke_howson.py
+
+Compute mixed Nash equilibria of a 2-player normal form game by the
+Lemke-Howson algorithm.
+
+The complementary pivoting is performed on a pair of compact tableaux,
+one for each player, in a routine compiled by Numba in nopython mode
+(with the GIL released), so that the paths from all the initial dropped
+labels can be followed in parallel threads.
+
+References
+----------
+B. von Stengel, "Equilibrium Computation for Two-Player Games in
+Strategic and Extensive Form," Chapter 3, N. Nisan, T. Roughgarden, E.
+Tardos, and V. Vazirani eds., Algorithmic Game Theory, 2007.
+
+"""
+from __future__ import division
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from numba import jit
+from normal_form_game import NormalFormGame
+
+TOL_PIV = 1e-10
+TOL_RATIO_DIFF = 1e-15
+
+
+def lemke_howson(g, init_pivot=0, max_iter=10**6, full_output=False):
+    """
+    Find one mixed-action Nash equilibrium of a 2-player normal form
+    game by the Lemke-Howson algorithm.
+
+    Parameters
+    ----------
+    g : NormalFormGame
+        NormalFormGame instance with 2 players.
+
+    init_pivot : scalar(int), optional(default=0)
+        Initial pivot, an integer k such that 0 <= k < m+n, where
+        integers 0, ..., m-1 and m, ..., m+n-1 correspond to the actions
+        of players 0 and 1, respectively.
+
+    max_iter : scalar(int), optional(default=10**6)
+        Maximum number of pivoting steps.
+
+    full_output : bool, optional(default=False)
+        If True, also return whether the algorithm converged and the
+        number of pivoting steps.
+
+    Returns
+    -------
+    NE : tuple(ndarray(float, ndim=1))
+        Tuple of computed Nash equilibrium mixed actions.
+
+    converged : bool
+        Whether the algorithm converged within `max_iter` steps.
+        Returned only if `full_output=True`.
+
+    num_iter : scalar(int)
+        Number of pivoting steps. Returned only if `full_output=True`.
+
+    """
+    A, B = _payoff_matrices(g)
+    if not 0 <= init_pivot < sum(g.nums_actions):
+        raise ValueError(
+            'init_pivot must be an integer k such that 0 <= k < {0}'.format(
+                sum(g.nums_actions)
+            )
+        )
+
+    x, y, converged, num_iter = \
+        _lemke_howson_nb(A, B, init_pivot, max_iter)
+
+    if full_output:
+        return (x, y), converged, num_iter
+    return x, y
+
+
+def lemke_howson_all(g, num_threads=None, max_iter=10**6):
+    """
+    Run the Lemke-Howson algorithm from every initial pivot in parallel
+    threads, and return the distinct Nash equilibria found.
+
+    Parameters
+    ----------
+    g : NormalFormGame
+        NormalFormGame instance with 2 players.
+
+    num_threads : scalar(int), optional(default=None)
+        Number of threads, passed to `ThreadPoolExecutor` as
+        `max_workers`.
+
+    max_iter : scalar(int), optional(default=10**6)
+        Maximum number of pivoting steps for each initial pivot.
+
+    Returns
+    -------
+    list(tuple(ndarray(float, ndim=1)))
+        List of the distinct Nash equilibria found, in the order of the
+        smallest initial pivots from which they are reached. Paths that
+        do not converge within `max_iter` steps are discarded.
+
+    """
+    A, B = _payoff_matrices(g)
+    num_labels = sum(g.nums_actions)
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        results = list(executor.map(
+            lambda init_pivot: _lemke_howson_nb(A, B, init_pivot, max_iter),
+            range(num_labels)
+        ))
+
+    tol = max(player.tol for player in g.players)
+    NEs = []
+    for x, y, converged, num_iter in results:
+        if not converged:
+            continue
+        if not any(np.allclose(x, x_, rtol=0, atol=tol) and
+                   np.allclose(y, y_, rtol=0, atol=tol) for x_, y_ in NEs):
+            NEs.append((x, y))
+
+    return NEs
+
+
+def _payoff_matrices(g):
+    """
+    Return the payoff matrices of `g` as C-contiguous float arrays.
+
+    """
+    if not isinstance(g, NormalFormGame) or g.N != 2:
+        raise ValueError('input must be a 2-player NormalFormGame')
+    return tuple(np.ascontiguousarray(player.payoff_array, dtype=float)
+                 for player in g.players)
+
+
+@jit(nopython=True, nogil=True)
+def _lemke_howson_nb(A, B, init_pivot, max_iter):
+    """
+    Main body of `lemke_howson` compiled in nopython mode.
+
+    Tableau 0, with one row for each of player 1's actions, has the
+    columns of player 0's action variables 0, ..., m-1, of the slack
+    variables m, ..., m+n-1 and of the right hand side; tableau 1, with
+    one row for each of player 0's actions, has the columns of the slack
+    variables 0, ..., m-1, of player 1's action variables m, ..., m+n-1
+    and of the right hand side. Payoffs are shifted to be positive.
+
+    """
+    m, n = A.shape
+    tableau_0 = np.zeros((n, m+n+1))
+    tableau_1 = np.zeros((m, m+n+1))
+    basis_0 = np.empty(n, dtype=np.intp)
+    basis_1 = np.empty(m, dtype=np.intp)
+
+    const_0 = 0.
+    min_0 = A.min()
+    if min_0 <= 0:
+        const_0 = -min_0 + 1
+    const_1 = 0.
+    min_1 = B.min()
+    if min_1 <= 0:
+        const_1 = -min_1 + 1
+
+    for i in range(n):
+        for j in range(m):
+            tableau_0[i, j] = B[i, j] + const_1
+        tableau_0[i, m+i] = 1
+        tableau_0[i, -1] = 1
+        basis_0[i] = m + i
+    for i in range(m):
+        for j in range(n):
+            tableau_1[i, m+j] = A[i, j] + const_0
+        tableau_1[i, i] = 1
+        tableau_1[i, -1] = 1
+        basis_1[i] = i
+
+    argmins = np.empty(max(m, n), dtype=np.intp)
+
+    # A pivot of player 0's action enters tableau 0, and that of player
+    # 1's action enters tableau 1
+    player = 0 if init_pivot < m else 1
+    pivot = init_pivot
+    converged = False
+    num_iter = 0
+    while num_iter < max_iter:
+        if player == 0:
+            row_min = _lex_min_ratio_test(tableau_0, pivot, m, argmins)
+            _pivoting(tableau_0, pivot, row_min)
+            basis_0[row_min], pivot = pivot, basis_0[row_min]
+        else:
+            row_min = _lex_min_ratio_test(tableau_1, pivot, 0, argmins)
+            _pivoting(tableau_1, pivot, row_min)
+            basis_1[row_min], pivot = pivot, basis_1[row_min]
+        num_iter += 1
+        if pivot == init_pivot:
+            converged = True
+            break
+        player = 1 - player
+
+    x = np.zeros(m)
+    for i in range(n):
+        if basis_0[i] < m:
+            x[basis_0[i]] = tableau_0[i, -1]
+    y = np.zeros(n)
+    for i in range(m):
+        if basis_1[i] >= m:
+            y[basis_1[i]-m] = tableau_1[i, -1]
+    x /= x.sum()
+    y /= y.sum()
+
+    return x, y, converged, num_iter
+
+
+@jit(nopython=True, nogil=True)
+def _pivoting(tableau, pivot, pivot_row):
+    """
+    Perform a pivoting step on `tableau` in place, with `pivot` the
+    entering column and `pivot_row` the leaving row.
+
+    """
+    nrows, ncols = tableau.shape
+
+    pivot_elt = tableau[pivot_row, pivot]
+    for j in range(ncols):
+        tableau[pivot_row, j] /= pivot_elt
+
+    for i in range(nrows):
+        if i == pivot_row:
+            continue
+        multiplier = tableau[i, pivot]
+        if multiplier == 0:
+            continue
+        for j in range(ncols):
+            tableau[i, j] -= tableau[pivot_row, j] * multiplier
+
+
+@jit(nopython=True, nogil=True)
+def _min_ratio_test_no_tie_breaking(tableau, pivot, test_col, argmins,
+                                    num_candidates):
+    """
+    Perform the minimum ratio test, without tie breaking, over the rows
+    in `argmins[:num_candidates]`, store the indices of the minimizing
+    rows in `argmins` and return their number.
+
+    """
+    ratio_min = np.inf
+    num_argmins = 0
+
+    for k in range(num_candidates):
+        i = argmins[k]
+        if tableau[i, pivot] <= TOL_PIV:  # Treated as nonpositive
+            continue
+        ratio = tableau[i, test_col] / tableau[i, pivot]
+        if ratio > ratio_min + TOL_RATIO_DIFF:  # Ratio large for i
+            continue
+        elif ratio < ratio_min - TOL_RATIO_DIFF:  # Ratio smaller for i
+            ratio_min = ratio
+            num_argmins = 1
+        else:  # Ratio equal
+            num_argmins += 1
+        argmins[num_argmins-1] = i
+
+    return num_argmins
+
+
+@jit(nopython=True, nogil=True)
+def _lex_min_ratio_test(tableau, pivot, slack_start, argmins):
+    """
+    Perform the lexico-minimum ratio test and return the index of the
+    leaving row, where the ties in the ratios of the right hand side are
+    broken by the columns of the slack variables.
+
+    """
+    nrows = tableau.shape[0]
+    num_candidates = nrows
+
+    for i in range(nrows):
+        argmins[i] = i
+
+    num_argmins = _min_ratio_test_no_tie_breaking(tableau, pivot, -1,
+                                                  argmins, num_candidates)
+    if num_argmins == 1:
+        return argmins[0]
+
+    for j in range(slack_start, slack_start+nrows):
+        if j == pivot:
+            continue
+        num_argmins = _min_ratio_test_no_tie_breaking(tableau, pivot, j,
+                                                      argmins, num_argmins)
+        if num_argmins == 1:
+            return argmins[0]
+
+    return argmins[0]
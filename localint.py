@@ -29,6 +29,10 @@ class LocalInteraction(object):
         asymmetry in interactions are allowed, where adj_matrix[i, j] is
         the weight of player j's action on player i.
 
+    dtype : data-type, optional(default=None)
+        Data type of the payoff matrix (see `Player`). If None, the data
+        type is inferred from `payoff_matrix`.
+
     Attributes
     ----------
     players : list(Player)
@@ -50,14 +54,14 @@ class LocalInteraction(object):
         the players.
 
     """
-    def __init__(self, payoff_matrix, adj_matrix):
+    def __init__(self, payoff_matrix, adj_matrix, dtype=None):
         self.adj_matrix = sparse.csr_matrix(adj_matrix)
         M, N = self.adj_matrix.shape
         if N != M:
             raise ValueError('adjacency matrix must be square')
         self.N = N  # Number of players
 
-        A = np.asarray(payoff_matrix)
+        A = np.asarray(payoff_matrix, dtype=dtype)
         if A.ndim != 2 or A.shape[0] != A.shape[1]:
             raise ValueError('payoff matrix must be square')
         self.num_actions = A.shape[0]  # Number of actions
@@ -104,11 +108,10 @@ class LocalInteraction(object):
             self.adj_matrix[player_ind].dot(
                 self.current_actions_mixed).toarray()
 
-        best_responses = np.empty(len(player_ind), dtype=int)
-        for k, i in enumerate(player_ind):
-            best_responses[k] = \
-                self.players[i].best_response(opponent_act_dists[k, :],
-                                              tie_breaking=self.tie_breaking)
+        # All the players share the same payoff matrix
+        best_responses = \
+            self.players[0].best_responses(opponent_act_dists,
+                                           tie_breaking=self.tie_breaking)
 
         self._current_actions[player_ind] = best_responses
 
@@ -9,6 +9,8 @@ Logit dynamics.
 from __future__ import division
 
 import numpy as np
+from normal_form_game import _compute_dtype
+from potential_game import potential_function
 
 
 class LogitDynamics(object):
@@ -19,12 +21,17 @@ class LogitDynamics(object):
 
     beta : scalar(float)
 
+    dtype : data-type, optional(default=None)
+        Data type of the logit choice cdfs. If None, the data type in
+        which the players' payoff vectors are computed is used.
+
     """
-    def __init__(self, g, beta=1.0):
+    def __init__(self, g, beta=1.0, dtype=None):
         self.g = g
         self.N = self.g.N
         self.players = self.g.players
         self.nums_actions = self.g.nums_actions
+        self.dtype = dtype
 
         self.beta = beta
 
@@ -41,16 +48,44 @@ class LogitDynamics(object):
 
     def _set_choice_probs(self):
         for player in self.players:
-            payoff_array_rotated = \
-                player.payoff_array.transpose(list(range(1, self.N)) + [0])
+            dtype = self.dtype
+            if dtype is None:
+                dtype = _compute_dtype(player.payoff_array.dtype)
+            payoff_array_rotated = np.asarray(
+                player.payoff_array.transpose(list(range(1, self.N)) + [0]),
+                dtype=dtype
+            )
             # Shift payoffs so that max = 0 for each opponent action profile
-            payoff_array_rotated -= \
+            # (into a new array, leaving the player's payoff array intact)
+            payoff_array_rotated = payoff_array_rotated - \
                 payoff_array_rotated.max(axis=-1)[..., np.newaxis]
+            payoff_array_rotated *= self.beta
+            np.exp(payoff_array_rotated, out=payoff_array_rotated)
             # cdfs left unnormalized
-            player.logit_choice_cdfs = \
-                np.exp(payoff_array_rotated*self.beta).cumsum(axis=-1)
+            player.logit_choice_cdfs = payoff_array_rotated.cumsum(axis=-1)
             # player.logit_choice_cdfs /= player.logit_choice_cdfs[..., [-1]]
 
+    def stationary_distribution(self):
+        """
+        Return the stationary distribution of the logit dynamics for an
+        exact potential game, which is the Gibbs distribution
+        proportional to exp(beta * Phi), Phi the potential.
+
+        Returns
+        -------
+        ndarray(float, ndim=N)
+            Array of shape `nums_actions` of the stationary
+            probabilities of the action profiles.
+
+        """
+        potential = potential_function(self.g)
+        if potential is None:
+            raise ValueError('g must be an exact potential game')
+        weights = potential * self.beta
+        weights -= weights.max()
+        np.exp(weights, out=weights)
+        return weights / weights.sum()
+
     def set_init_actions(self, init_actions=None):
         if init_actions is None:
             init_actions = np.empty(self.N, dtype=int)
@@ -130,8 +130,11 @@ action, while `k` refers to the opponent player's action.
 
 """
 import re
+import mmap
 import numbers
 import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
 from numba import jit
 from util import check_random_state
 
@@ -148,6 +151,13 @@ class Player(object):
         when the player plays action a_0 while his N-1 opponents play
         actions a_1, ..., a_{N-1}, respectively.
 
+    dtype : data-type, optional(default=None)
+        Data type of the payoff array. If None, the data type is
+        inferred from `payoff_array`. For payoff arrays of a compact
+        data type such as `np.float32` or `np.int16`, the payoff vectors
+        against mixed actions are computed in single precision (see
+        `tol`).
+
     Attributes
     ----------
     payoff_array : ndarray(float, ndim=N)
@@ -159,17 +169,40 @@ class Player(object):
     num_opponents : scalar(int)
         The number of opponent players.
 
-    """
-    def __init__(self, payoff_array):
-        self.payoff_array = np.asarray(payoff_array)
+    tol : scalar(float)
+        Tolerance used in determining best responses: 1e-8 if the
+        payoff vectors are computed in double precision, and larger in
+        proportion to the square root of the machine epsilon if they are
+        computed in lower precision. The tolerance is absolute: it
+        accounts for the rounding errors of payoffs of order one, and
+        should be set larger for payoffs of large magnitude.
 
-        if self.payoff_array.ndim == 0:
-            raise ValueError('payoff_array must be an array_like')
+    """
+    def __init__(self, payoff_array, dtype=None, _validate=True):
+        # `_validate=False` is for internal use with an ndarray
+        # `payoff_array` that is already valid, skipping the input
+        # conversion and checks
+        if _validate:
+            self.payoff_array = np.asarray(payoff_array, dtype=dtype)
+            if self.payoff_array.ndim == 0:
+                raise ValueError('payoff_array must be an array_like')
+        else:
+            self.payoff_array = payoff_array
 
         self.num_opponents = self.payoff_array.ndim - 1
         self.num_actions = self.payoff_array.shape[0]
 
-        self.tol = 1e-8
+        self.tol = _default_tol(self.payoff_array.dtype)
+        self._br_table = None
+        self._contraction_plans = {}
+
+    @property
+    def payoff_array_shape(self):
+        """
+        Shape of the payoff array, (n_0, n_1, ..., n_{N-1}).
+
+        """
+        return self.payoff_array.shape
 
     def __repr__(self):
         N = self.num_opponents + 1
@@ -197,6 +230,27 @@ class Player(object):
             An array representing the player's payoff vector given the
             profile of the opponents' actions.
 
+        """
+        if self.num_opponents >= 1 and _is_memmap(self.payoff_array):
+            # Stream over blocks of own actions, so that only one block
+            # of the mapped array is paged in at a time
+            row_nbytes = self.payoff_array[0].nbytes
+            chunk_size = max(1, _MMAP_CHUNK_NBYTES // max(row_nbytes, 1))
+            return np.concatenate([
+                self._payoff_vector(
+                    opponents_actions,
+                    self.payoff_array[start:start+chunk_size]
+                ) for start in range(0, self.num_actions, chunk_size)
+            ])
+
+        return self._payoff_vector(opponents_actions, self.payoff_array)
+
+    def _payoff_vector(self, opponents_actions, payoff_array):
+        """
+        Return the payoff vector for the own actions in the rows of
+        `payoff_array`, which is `self.payoff_array` or a block of its
+        rows.
+
         """
         def reduce_last_player(payoff_array, action):
             """
@@ -207,21 +261,110 @@ class Player(object):
             if isinstance(action, numbers.Integral):  # pure action
                 return payoff_array.take(action, axis=-1)
             else:  # mixed action
-                return payoff_array.dot(action)
+                return payoff_array.dot(
+                    _mixed_action_astype(action, payoff_array.dtype)
+                )
 
         if self.num_opponents == 1:
             payoff_vector = \
-                reduce_last_player(self.payoff_array, opponents_actions)
+                reduce_last_player(payoff_array, opponents_actions)
         elif self.num_opponents >= 2:
-            payoff_vector = self.payoff_array
-            for i in reversed(range(self.num_opponents)):
-                payoff_vector = \
-                    reduce_last_player(payoff_vector, opponents_actions[i])
+            if len(opponents_actions) != self.num_opponents:
+                raise ValueError(
+                    'opponents_actions must be of length {0}'.format(
+                        self.num_opponents
+                    )
+                )
+            if payoff_array.size <= _SMALL_NUM_ENTRIES:
+                # Reduce the last player one at a time, which has the
+                # least overhead for small arrays
+                payoff_vector = payoff_array
+                for i in reversed(range(self.num_opponents)):
+                    payoff_vector = reduce_last_player(payoff_vector,
+                                                       opponents_actions[i])
+            else:
+                payoff_vector = self._payoff_vector_nplayer(opponents_actions,
+                                                            payoff_array)
         else:  # Trivial case with self.num_opponents == 0
-            payoff_vector = self.payoff_array
+            payoff_vector = payoff_array
 
         return payoff_vector
 
+    def _payoff_vector_nplayer(self, opponents_actions, payoff_array):
+        """
+        Return the payoff vector for N >= 3 players.
+
+        The pure opponents are fixed by basic indexing, which only
+        creates a view, and the mixed opponents are contracted one at a
+        time following a plan (see `_contraction_plan`) that is cached
+        for each pattern of pure and mixed opponents.
+
+        """
+        is_pure = tuple(isinstance(action, numbers.Integral)
+                        for action in opponents_actions)
+        key = (is_pure, payoff_array.shape, payoff_array.dtype)
+        dtype = payoff_array.dtype
+        payoff_array = payoff_array[
+            (slice(None),) +
+            tuple(action if pure else slice(None)
+                  for action, pure in zip(opponents_actions, is_pure))
+        ]
+        mixed_actions = [_mixed_action_astype(action, dtype)
+                         for action, pure in zip(opponents_actions, is_pure)
+                         if not pure]
+        if not mixed_actions:
+            return payoff_array.copy()
+
+        try:
+            plan = self._contraction_plans[key]
+        except KeyError:
+            plan = _contraction_plan(payoff_array.shape)
+            self._contraction_plans[key] = plan
+
+        # The intermediate arrays are allocated per call, so that the
+        # method is reentrant and thread-safe
+        payoff_vector = payoff_array
+        for k, subscripts, out_subscripts in plan:
+            payoff_vector = np.einsum(payoff_vector, subscripts,
+                                      mixed_actions[k], [k+1],
+                                      out_subscripts)
+
+        return payoff_vector
+
+    def payoff_vectors(self, opponents_actions_batch):
+        """
+        Return an array of payoff vectors, one for each of B profiles of
+        the opponents' actions, computed in a single tensor contraction.
+
+        Parameters
+        ----------
+        opponents_actions_batch : array_like(int, ndim=1) or
+                                  array_like(float, ndim=2) or
+                                  array_like(array_like)
+            A batch of B profiles of N-1 opponents' actions. If N=2,
+            then it must be a 1-dimensional array of B integers (pure
+            actions) or a 2-dimensional array of shape (B, n_1) whose
+            rows are mixed actions. If N>2, then it must be an array of
+            N-1 objects, where the j-th object is either a 1-dimensional
+            array of B integers or a 2-dimensional array of shape (B,
+            n_j), so that pure and mixed opponents may be combined
+            within the same batch. Ignored if N=1.
+
+        Returns
+        -------
+        payoff_vectors : ndarray(float, ndim=2)
+            Array of shape (B, n_0) whose b-th row is the player's
+            payoff vector given the b-th profile of the opponents'
+            actions. If N=1, an array of shape (1, n_0) is returned.
+
+        """
+        if self.num_opponents == 0:  # Trivial case
+            return self.payoff_array[np.newaxis, :]
+
+        actions_list = _batch_opponents_actions(self.num_opponents,
+                                                opponents_actions_batch)
+        return _payoff_vectors(self.payoff_array, actions_list)
+
     def is_best_response(self, own_action, opponents_actions):
         """
         Return True if `own_action` is a best response to
@@ -242,6 +385,19 @@ class Player(object):
             `opponents_actions`; False otherwise.
 
         """
+        lookup = self._lookup_best_response_table(opponents_actions)
+        if lookup is not None:
+            table, k, opponents_actions = lookup
+            payoff_max = table['payoff_max'][k]
+            if isinstance(own_action, numbers.Integral):
+                payoff = self.payoff_array[(own_action,) + opponents_actions]
+            else:
+                payoff = np.dot(
+                    own_action,
+                    self.payoff_array[(slice(None),) + opponents_actions]
+                )
+            return payoff >= payoff_max - self.tol
+
         payoff_vector = self.payoff_vector(opponents_actions)
         payoff_max = payoff_vector.max()
 
@@ -294,25 +450,177 @@ class Player(object):
             from the best response actions.
 
         """
+        if payoff_perturbation is None:
+            lookup = self._lookup_best_response_table(opponents_actions)
+            if lookup is not None:
+                return self._best_response_from_table(
+                    lookup, tie_breaking, random_state
+                )
+
+        # Small payoff arrays are reduced by `payoff_vector`, as the
+        # conversion of the input to the compiled kernel costs more than
+        # the kernel saves
+        if self.num_opponents >= 2 and \
+                tie_breaking in ('smallest', 'random') and \
+                self.payoff_array.size > _SMALL_NUM_ENTRIES and \
+                _is_nb_payoff_array(self.payoff_array):
+            pure_actions, mixed_actions = \
+                _opponents_actions_nb(self.payoff_array.shape,
+                                      opponents_actions)
+        else:
+            pure_actions = None
+
+        # Dispatch to the compiled N-player kernel unless the number of
+        # payoff entries to be reduced is so large that the contraction
+        # in `payoff_vector` is faster
+        if pure_actions is not None and \
+                _num_entries(self.payoff_array.shape, pure_actions) <= \
+                _NB_MAX_NUM_ENTRIES:
+            if payoff_perturbation is None:
+                payoff_perturbation = np.zeros(0)
+            else:
+                payoff_perturbation = \
+                    np.asarray(payoff_perturbation, dtype=float)
+            if tie_breaking == 'smallest':
+                return best_response_np(
+                    self.payoff_array.reshape(self.num_actions, -1),
+                    pure_actions, mixed_actions,
+                    np.array(self.payoff_array.shape[1:]),
+                    payoff_perturbation
+                )
+            # Break the tie in Python by `random_choice`, so that the
+            # random draw is the same as in the other paths
+            payoff_vector = payoff_vector_np(
+                self.payoff_array.reshape(self.num_actions, -1),
+                pure_actions, mixed_actions,
+                np.array(self.payoff_array.shape[1:])
+            )
+            if payoff_perturbation.shape[0] > 0:
+                payoff_vector += payoff_perturbation
+            return self._select_best_response(payoff_vector, tie_breaking,
+                                              random_state)
+
         payoff_vector = self.payoff_vector(opponents_actions)
         if payoff_perturbation is not None:
             payoff_vector += payoff_perturbation
 
+        return self._select_best_response(payoff_vector, tie_breaking,
+                                          random_state)
+
+    def _select_best_response(self, payoff_vector, tie_breaking,
+                              random_state):
+        """
+        Return the best response action(s) given `payoff_vector`, with
+        `tie_breaking` and `random_state` as in `best_response`.
+
+        """
+        return _select_best_response(payoff_vector, tie_breaking, self.tol,
+                                     random_state)
+
+    def is_best_responses(self, own_actions, opponents_actions_batch):
+        """
+        Vectorized version of `is_best_response` over a batch of B
+        profiles of the opponents' actions.
+
+        Parameters
+        ----------
+        own_actions : array_like(int, ndim=1) or array_like(float, ndim=2)
+            Array of B integers representing pure actions, or array of
+            shape (B, n_0) whose rows are mixed actions.
+
+        opponents_actions_batch : see `payoff_vectors`.
+
+        Returns
+        -------
+        ndarray(bool, ndim=1)
+            Array of length B whose b-th entry is True if the b-th own
+            action is a best response to the b-th profile of the
+            opponents' actions.
+
+        """
+        payoff_vectors = self.payoff_vectors(opponents_actions_batch)
+        payoff_max = payoff_vectors.max(axis=1)
+
+        own_actions = np.asarray(own_actions)
+        if own_actions.ndim == 1:
+            payoffs = payoff_vectors[np.arange(payoff_vectors.shape[0]),
+                                     own_actions]
+        else:
+            payoffs = (own_actions * payoff_vectors).sum(axis=1)
+
+        return payoffs >= payoff_max - self.tol
+
+    def best_responses(self, opponents_actions_batch, tie_breaking='smallest',
+                       payoff_perturbations=None, random_state=None):
+        """
+        Vectorized version of `best_response` over a batch of B profiles
+        of the opponents' actions.
+
+        Parameters
+        ----------
+        opponents_actions_batch : see `payoff_vectors`.
+
+        tie_breaking : {'smallest', 'random', False},
+                       optional(default='smallest')
+            Control how, or whether, to break a tie (see Returns for
+            details).
+
+        payoff_perturbations : array_like(float), optional(default=None)
+            Array of shape (B, n_0), or of length n_0 to be used for all
+            the profiles, containing the values ("noises") to be added to
+            the payoffs in determining the best responses.
+
+        random_state : scalar(int) or np.random.RandomState,
+                       optional(default=None)
+            Random seed (integer) or np.random.RandomState instance to
+            set the initial state of the random number generator for
+            reproducibility. If None, a randomly initialized RandomState
+            is used. Relevant only when tie_breaking='random'.
+
+        Returns
+        -------
+        ndarray(int, ndim=1) or tuple(ndarray(int, ndim=1))
+            If tie_breaking='smallest', returns an array of length B of
+            the best response actions with the smallest index; if
+            tie_breaking='random', returns an array of length B of
+            actions each randomly chosen from the best response actions.
+            If tie_breaking=False, returns a tuple `(indices, indptr)`
+            in compressed sparse row format, where the best response
+            actions to the b-th profile are given by
+            `indices[indptr[b]:indptr[b+1]]`.
+
+        """
+        payoff_vectors = self.payoff_vectors(opponents_actions_batch)
+        if payoff_perturbations is not None:
+            payoff_vectors = payoff_vectors + payoff_perturbations
+
         if tie_breaking == 'smallest':
-            best_response = np.argmax(payoff_vector)
-            return best_response
+            return payoff_vectors.argmax(axis=1)
+
+        best_responses_mask = \
+            payoff_vectors >= payoff_vectors.max(axis=1)[:, np.newaxis] - \
+            self.tol
+        if tie_breaking == 'random':
+            random_state = check_random_state(random_state)
+            nums_best_responses = best_responses_mask.sum(axis=1)
+            # Index, among the best responses, of the action to choose,
+            # drawn only for the ties as by `random_choice`, so that the
+            # random state is used as by `best_response` on each profile
+            idx = np.zeros(len(nums_best_responses), dtype=int)
+            for b in np.nonzero(nums_best_responses > 1)[0]:
+                idx[b] = random_state.randint(nums_best_responses[b])
+            return (best_responses_mask.cumsum(axis=1) >
+                    idx[:, np.newaxis]).argmax(axis=1)
+        elif tie_breaking is False:
+            indices = best_responses_mask.nonzero()[1]
+            indptr = np.empty(best_responses_mask.shape[0]+1, dtype=int)
+            indptr[0] = 0
+            best_responses_mask.sum(axis=1).cumsum(out=indptr[1:])
+            return indices, indptr
         else:
-            best_responses = \
-                np.where(payoff_vector >= payoff_vector.max() - self.tol)[0]
-            if tie_breaking == 'random':
-                return self.random_choice(best_responses,
-                                          random_state=random_state)
-            elif tie_breaking is False:
-                return best_responses
-            else:
-                msg = "tie_breaking must be one of 'smallest', 'random' " + \
-                      "or False"
-                raise ValueError(msg)
+            msg = "tie_breaking must be one of 'smallest', 'random' " + \
+                  "or False"
+            raise ValueError(msg)
 
     def random_choice(self, actions=None, random_state=None):
         """
@@ -355,6 +663,101 @@ class Player(object):
         else:
             return idx
 
+    def precompute_best_response_table(self):
+        """
+        Precompute the table of the pure-action best responses to all
+        the pure-action profiles of the opponents: the maximum payoff,
+        the best response with the smallest index, and the set of all
+        the best responses in compressed sparse row format. Afterwards,
+        `best_response` (without `payoff_perturbation`) and
+        `is_best_response` look up the table for pure-action opponents.
+
+        The table is discarded if the `payoff_array` attribute is
+        replaced or the payoffs are set through `NormalFormGame`; if the
+        payoff array is modified in place otherwise, call
+        `clear_best_response_table`.
+
+        """
+        payoff_matrix = self.payoff_array.reshape(self.num_actions, -1)
+        payoff_max = payoff_matrix.max(axis=0)
+        best_responses_mask = payoff_matrix >= payoff_max - self.tol
+
+        # Column k of the mask contains the best responses to the k-th
+        # opponents' profile in C order
+        indices = best_responses_mask.T.nonzero()[1]
+        indptr = np.empty(payoff_matrix.shape[1]+1, dtype=int)
+        indptr[0] = 0
+        best_responses_mask.sum(axis=0).cumsum(out=indptr[1:])
+
+        self._br_table = {
+            'payoff_array': self.payoff_array,
+            'payoff_max': payoff_max,
+            'best_response': payoff_matrix.argmax(axis=0),
+            'indices': indices,
+            'indptr': indptr,
+        }
+
+    def clear_best_response_table(self):
+        """
+        Discard the table computed by `precompute_best_response_table`.
+
+        """
+        self._br_table = None
+
+    def _lookup_best_response_table(self, opponents_actions):
+        """
+        If the best response table is available and `opponents_actions`
+        is a profile of pure actions, return the table, the index of the
+        profile in C order and the profile as a tuple (with negative
+        actions counted from the end as in indexing); otherwise return
+        None, in particular for out-of-range actions, which are then
+        reported by the computation without the table.
+
+        """
+        table = getattr(self, '_br_table', None)
+        if table is None or table['payoff_array'] is not self.payoff_array:
+            return None
+
+        if self.num_opponents == 0:
+            return table, 0, ()
+        if self.num_opponents == 1:
+            opponents_actions = (opponents_actions,)
+        opponents_actions = tuple(opponents_actions)
+        if not all(isinstance(action, numbers.Integral)
+                   for action in opponents_actions):
+            return None
+        nums_actions = self.payoff_array.shape[1:]
+        if len(opponents_actions) != len(nums_actions) or \
+                not all(-n <= action < n for action, n
+                        in zip(opponents_actions, nums_actions)):
+            return None
+        opponents_actions = tuple(action % n for action, n
+                                  in zip(opponents_actions, nums_actions))
+        k = np.ravel_multi_index(opponents_actions, nums_actions)
+        return table, k, opponents_actions
+
+    def _best_response_from_table(self, lookup, tie_breaking, random_state):
+        """
+        Return the best response action(s) looked up in the table, with
+        `tie_breaking` and `random_state` as in `best_response`.
+
+        """
+        table, k, _ = lookup
+        if tie_breaking == 'smallest':
+            return table['best_response'][k]
+
+        best_responses = \
+            table['indices'][table['indptr'][k]:table['indptr'][k+1]]
+        if tie_breaking == 'random':
+            return self.random_choice(best_responses,
+                                      random_state=random_state)
+        elif tie_breaking is False:
+            return best_responses.copy()
+        else:
+            msg = "tie_breaking must be one of 'smallest', 'random' " + \
+                  "or False"
+            raise ValueError(msg)
+
 
 class NormalFormGame(object):
     """
@@ -375,6 +778,11 @@ class NormalFormGame(object):
         game will be a symmetric two-player game where the payoff matrix
         of each player is given by the input matrix.
 
+    dtype : data-type, optional(default=None)
+        Data type of the players' payoff arrays (see `Player`). If None,
+        the data type is inferred from `data`, and is float if `data`
+        represents the numbers of actions.
+
     Attributes
     ----------
     players : tuple(Player)
@@ -387,15 +795,27 @@ class NormalFormGame(object):
         Tuple of the numbers of actions, one for each player.
 
     """
-    def __init__(self, data):
+    def __init__(self, data, dtype=None, _validate=True):
+        # `_validate=False` is for internal use with a tuple of Players
+        # whose shapes are known to be consistent, skipping the checks
+        if not _validate:
+            N = len(data)
+            self.players = data
+
         # data represents an array_like of Players
-        if hasattr(data, '__getitem__') and isinstance(data[0], Player):
+        elif hasattr(data, '__getitem__') and isinstance(data[0], Player):
             N = len(data)
+            if dtype is not None:
+                data = [
+                    player if player.payoff_array.dtype == dtype else
+                    Player(player.payoff_array, dtype=dtype)
+                    for player in data
+                ]
 
             # Check that the shapes of the payoff arrays are consistent
-            shape_0 = data[0].payoff_array.shape
+            shape_0 = data[0].payoff_array_shape
             for i in range(1, N):
-                shape = data[i].payoff_array.shape
+                shape = data[i].payoff_array_shape
                 if not (
                     len(shape) == N and
                     shape == shape_0[i:] + shape_0[:i]
@@ -413,7 +833,7 @@ class NormalFormGame(object):
             if data.ndim == 0:  # data represents action size
                 # Trivial game consisting of one player
                 N = 1
-                self.players = (Player(np.zeros(data)),)
+                self.players = (Player(np.zeros(data, dtype=dtype)),)
 
             elif data.ndim == 1:  # data represents action sizes
                 N = data.size
@@ -421,7 +841,8 @@ class NormalFormGame(object):
                 # with payoff_arrays filled with zeros
                 # Payoff values set via __setitem__
                 self.players = tuple(
-                    Player(np.zeros(tuple(data[i:]) + tuple(data[:i])))
+                    Player(np.zeros(tuple(data[i:]) + tuple(data[:i]),
+                                    dtype=dtype))
                     for i in range(N)
                 )
 
@@ -434,7 +855,8 @@ class NormalFormGame(object):
                         'by a square matrix'
                     )
                 N = 2
-                self.players = tuple(Player(data) for i in range(N))
+                self.players = tuple(Player(data, dtype=dtype)
+                                     for i in range(N))
 
             else:  # data represents a payoff array
                 # data must be of shape (n_0, ..., n_{N-1}, N),
@@ -449,7 +871,8 @@ class NormalFormGame(object):
                 self.players = tuple(
                     Player(
                         data.take(i, axis=-1).transpose(list(range(i, N)) +
-                                                        list(range(i)))
+                                                        list(range(i))),
+                        dtype=dtype
                     ) for i in range(N)
                 )
 
@@ -460,17 +883,45 @@ class NormalFormGame(object):
 
     @property
     def payoff_profile_array(self):
-        N = self.N
-        dtype = \
-            np.result_type(*(player.payoff_array for player in self.players))
-        payoff_profile_array = \
-            np.empty(self.players[0].payoff_array.shape + (N,), dtype=dtype)
-        for i, player in enumerate(self.players):
-            payoff_profile_array[..., i] = \
-                player.payoff_array.transpose(list(range(N-i, N)) +
-                                              list(range(N-i)))
+        """
+        Array of shape (n_0, ..., n_{N-1}, N) of the payoff profiles.
+
+        The array is computed on the first access and cached; the cache
+        is updated by `__setitem__` and recomputed if a player's
+        `payoff_array` attribute is replaced. A read-only view of the
+        cache is returned. If a player's payoff array is modified in
+        place other than through the game, call
+        `clear_payoff_profile_array` to discard the cache.
+
+        """
+        payoff_arrays = tuple(player.payoff_array for player in self.players)
+        cache = getattr(self, '_payoff_profile_cache', None)
+        if cache is None or \
+                any(a is not b for a, b in zip(cache[0], payoff_arrays)):
+            cache = (payoff_arrays, _payoff_profile_array(payoff_arrays))
+            self._payoff_profile_cache = cache
+
+        payoff_profile_array = cache[1].view()
+        payoff_profile_array.flags.writeable = False
         return payoff_profile_array
 
+    def clear_payoff_profile_array(self):
+        """
+        Discard the cached payoff profile array.
+
+        """
+        self._payoff_profile_cache = None
+
+    def precompute_best_response_tables(self):
+        """
+        Precompute the best response tables of all the players (see
+        `Player.precompute_best_response_table`), with which `is_nash`
+        at pure action profiles is answered by table lookups.
+
+        """
+        for player in self.players:
+            player.precompute_best_response_table()
+
     def __repr__(self):
         s = '{N}-player NormalFormGame'.format(N=self.N)
         return s
@@ -508,6 +959,8 @@ class NormalFormGame(object):
             if not isinstance(action_profile, numbers.Integral):
                 raise TypeError('index must be an integer')
             self.players[0].payoff_array[action_profile] = payoff_profile
+            self._update_payoff_profile_cache((action_profile,))
+            self.players[0].clear_best_response_table()
             return None
 
         # Non-trivial game with 2 or more players
@@ -529,6 +982,140 @@ class NormalFormGame(object):
             player.payoff_array[
                 tuple(action_profile[i:]) + tuple(action_profile[:i])
             ] = payoff_profile[i]
+        self._update_payoff_profile_cache(tuple(action_profile))
+        for player in self.players:
+            player.clear_best_response_table()
+
+    def _update_payoff_profile_cache(self, action_profile):
+        """
+        Copy the payoffs at `action_profile`, as stored in the players'
+        payoff arrays, into the cached payoff profile array, if any. If
+        some players' payoff arrays share memory (as for a symmetric
+        two-player game created from a square matrix), a write may
+        change the payoffs at other action profiles, so the cache is
+        discarded instead.
+
+        """
+        cache = getattr(self, '_payoff_profile_cache', None)
+        if cache is None:
+            return
+        payoff_arrays, payoff_profile_array = cache
+        if any(a is not player.payoff_array
+               for a, player in zip(payoff_arrays, self.players)) or \
+                any(np.may_share_memory(payoff_arrays[i], payoff_arrays[j])
+                    for i in range(self.N) for j in range(i+1, self.N)):
+            self._payoff_profile_cache = None
+            return
+        for i, player in enumerate(self.players):
+            payoff_profile_array[action_profile + (i,)] = player.payoff_array[
+                action_profile[i:] + action_profile[:i]
+            ]
+
+    def get_payoffs(self, action_profiles):
+        """
+        Vectorized version of `__getitem__`, which returns the payoff
+        profiles at K pure action profiles.
+
+        Parameters
+        ----------
+        action_profiles : array_like(int, ndim=2)
+            Array of shape (K, N) whose rows are pure action profiles.
+
+        Returns
+        -------
+        ndarray(ndim=2)
+            Array of shape (K, N) whose k-th row is the payoff profile
+            at the k-th action profile.
+
+        """
+        index = self._action_profiles_index(action_profiles)
+        dtype = \
+            np.result_type(*(player.payoff_array for player in self.players))
+        payoff_profiles = np.empty((len(index[0]), self.N), dtype=dtype)
+        for i, player in enumerate(self.players):
+            payoff_profiles[:, i] = player.payoff_array[index[i:] + index[:i]]
+        return payoff_profiles
+
+    def set_payoffs(self, action_profiles, payoff_profiles):
+        """
+        Vectorized version of `__setitem__`, which sets the payoff
+        profiles at K pure action profiles. If an action profile appears
+        more than once, the payoff profile set last is retained.
+
+        Parameters
+        ----------
+        action_profiles : array_like(int, ndim=2)
+            Array of shape (K, N) whose rows are pure action profiles.
+
+        payoff_profiles : array_like(float, ndim=2)
+            Array of shape (K, N) whose k-th row is the payoff profile
+            to be set at the k-th action profile.
+
+        """
+        index = self._action_profiles_index(action_profiles)
+        payoff_profiles = np.asarray(payoff_profiles)
+        if payoff_profiles.shape != (len(index[0]), self.N):
+            raise ValueError(
+                'payoff_profiles must be of shape ({0}, {1})'.format(
+                    len(index[0]), self.N
+                )
+            )
+        for i, player in enumerate(self.players):
+            player.payoff_array[index[i:] + index[:i]] = payoff_profiles[:, i]
+        self._update_payoff_profile_cache(index)
+        for player in self.players:
+            player.clear_best_response_table()
+
+    def _action_profiles_index(self, action_profiles):
+        """
+        Check the shape of `action_profiles` and return the tuple of its
+        N columns.
+
+        """
+        action_profiles = np.asarray(action_profiles)
+        if action_profiles.ndim != 2 or action_profiles.shape[1] != self.N:
+            raise ValueError(
+                'action_profiles must be of shape (K, {0})'.format(self.N)
+            )
+        if action_profiles.size > 0 and \
+                not np.issubdtype(action_profiles.dtype, np.integer):
+            raise TypeError('action_profiles must be an array of integers')
+        return tuple(action_profiles.T)
+
+    @classmethod
+    def from_payoff_table(cls, nums_actions, action_profiles,
+                          payoff_profiles, dtype=None):
+        """
+        Construct a NormalFormGame from a flat table of action profiles
+        and payoff profiles. The payoffs at the action profiles not in
+        the table are zero.
+
+        Parameters
+        ----------
+        nums_actions : array_like(int, ndim=1)
+            Numbers of actions of the N players.
+
+        action_profiles : array_like(int, ndim=2)
+            Array of shape (K, N) whose rows are pure action profiles.
+
+        payoff_profiles : array_like(float, ndim=2)
+            Array of shape (K, N) of the corresponding payoff profiles.
+
+        dtype : data-type, optional(default=None)
+            Data type of the players' payoff arrays (see `Player`). If
+            None, the data type of `payoff_profiles` is used.
+
+        Returns
+        -------
+        NormalFormGame
+
+        """
+        payoff_profiles = np.asarray(payoff_profiles)
+        if dtype is None:
+            dtype = payoff_profiles.dtype
+        g = cls(np.asarray(nums_actions, dtype=int), dtype=dtype)
+        g.set_payoffs(action_profiles, payoff_profiles)
+        return g
 
     def is_nash(self, action_profile):
         """
@@ -569,6 +1156,425 @@ class NormalFormGame(object):
 
         return True
 
+    def regrets(self, action_profiles):
+        """
+        Return the regrets of the players, i.e., the best response
+        payoffs minus the realized payoffs, at each of B action profiles.
+
+        Parameters
+        ----------
+        action_profiles : array_like(array_like)
+            A batch of B action profiles given as an array of N objects,
+            where the i-th object is either a 1-dimensional array of B
+            integers (pure actions of player i) or a 2-dimensional array
+            of shape (B, n_i) whose rows are mixed actions of player i.
+            Pure and mixed actions may be combined across players.
+
+        Returns
+        -------
+        ndarray(float, ndim=2)
+            Array of shape (B, N) whose (b, i) entry is player i's
+            regret at the b-th action profile.
+
+        """
+        N = self.N
+        if len(action_profiles) != N:
+            raise ValueError(
+                'action_profiles must be of length {0}'.format(N)
+            )
+        action_profiles = [np.asarray(actions) for actions in action_profiles]
+        B = action_profiles[0].shape[0]
+
+        regrets = np.empty((B, N))
+        for i, player in enumerate(self.players):
+            if N == 1:
+                opponents_actions_batch = None
+            elif N == 2:
+                opponents_actions_batch = action_profiles[1-i]
+            else:
+                opponents_actions_batch = \
+                    action_profiles[i+1:] + action_profiles[:i]
+            payoff_vectors = np.broadcast_to(
+                player.payoff_vectors(opponents_actions_batch),
+                (B, player.num_actions)
+            )
+
+            own_actions = action_profiles[i]
+            if own_actions.ndim == 1:
+                payoffs = payoff_vectors[np.arange(B), own_actions]
+            else:
+                payoffs = (own_actions * payoff_vectors).sum(axis=1)
+            # Subtracted in float, so that compact integer payoffs do not
+            # wrap around
+            regrets[:, i] = payoff_vectors.max(axis=1).astype(float) - payoffs
+
+        return regrets
+
+    def is_nash_batch(self, action_profiles, epsilon=0):
+        """
+        Vectorized version of `is_nash` over a batch of B action
+        profiles, which checks for epsilon-Nash equilibria.
+
+        Parameters
+        ----------
+        action_profiles : see `regrets`.
+
+        epsilon : scalar(float), optional(default=0)
+            Tolerated regret. Each player's regret is compared with
+            `epsilon` plus the player's `tol`, so that `epsilon=0`
+            agrees with `is_nash`.
+
+        Returns
+        -------
+        ndarray(bool, ndim=1)
+            Array of length B whose b-th entry is True if the b-th
+            action profile is an epsilon-Nash equilibrium.
+
+        """
+        tols = np.array([player.tol for player in self.players])
+        return (self.regrets(action_profiles) <= epsilon + tols).all(axis=1)
+
+    def pure_nash_equilibria(self, chunk_size=None):
+        """
+        Return all the pure-action Nash equilibria of the game.
+
+        Parameters
+        ----------
+        chunk_size : scalar(int), optional(default=None)
+            See `pure_nash_equilibria_iter`.
+
+        Returns
+        -------
+        list(tuple(int))
+            List of the pure-action Nash equilibria, in lexicographic
+            order.
+
+        """
+        return list(self.pure_nash_equilibria_iter(chunk_size=chunk_size))
+
+    def pure_nash_equilibria_iter(self, chunk_size=None):
+        """
+        Iterator version of `pure_nash_equilibria`.
+
+        For each player, the mask of the action profiles at which the
+        player's action is a best response is computed by comparing the
+        payoff array with its maximum along the own action axis, and the
+        masks, rotated to the common axis order, are intersected.
+
+        Parameters
+        ----------
+        chunk_size : scalar(int), optional(default=None)
+            Number of player 0's actions to process at a time. If None,
+            the whole action space is processed in one pass; otherwise
+            the masks are computed block by block, so that only arrays
+            of size proportional to `chunk_size` are allocated, and the
+            equilibria in each block are yielded before the next block
+            is processed.
+
+        Yields
+        ------
+        tuple(int)
+            Pure-action Nash equilibrium.
+
+        """
+        N = self.N
+        n_0 = self.nums_actions[0]
+        if chunk_size is None:
+            chunk_size = n_0
+        elif chunk_size < 1:
+            raise ValueError('chunk_size must be a positive integer')
+
+        # Player 0's own axis is the one to be split into blocks
+        payoff_max_0 = self.players[0].payoff_array.max(axis=0)
+
+        for start in range(0, n_0, chunk_size):
+            block = slice(start, min(start+chunk_size, n_0))
+            payoff_array = self.players[0].payoff_array[block]
+            ne_mask = payoff_array >= payoff_max_0 - self.players[0].tol
+
+            for i in range(1, N):
+                player = self.players[i]
+                # Axis of player 0's action in player i's payoff array
+                axis = N - i
+                index = [slice(None)] * N
+                index[axis] = block
+                payoff_array = player.payoff_array[tuple(index)]
+                br_mask = payoff_array >= \
+                    payoff_array.max(axis=0) - player.tol
+                ne_mask &= br_mask.transpose(list(range(N-i, N)) +
+                                             list(range(N-i)))
+
+            for action_profile in zip(*ne_mask.nonzero()):
+                action_profile = (action_profile[0] + start,) + \
+                    action_profile[1:]
+                yield tuple(int(a) for a in action_profile)
+
+    def eliminate_dominated(self, mixed=False):
+        """
+        Iteratively eliminate the strictly dominated actions.
+
+        In each round, the actions of a player that are strictly
+        dominated by pure actions are detected by comparing all pairs of
+        actions at once, and if `mixed=True`, those that are strictly
+        dominated by mixed actions by solving a linear program, one for
+        all the remaining actions of the player. Only the players some
+        of whose opponents have lost actions since the player's last
+        check are rechecked.
+
+        Parameters
+        ----------
+        mixed : bool, optional(default=False)
+            If True, eliminate also the actions that are strictly
+            dominated by mixed actions.
+
+        Returns
+        -------
+        g_reduced : NormalFormGame
+            The game consisting of the remaining actions.
+
+        actions : tuple(ndarray(int, ndim=1))
+            Tuple of N arrays, where `actions[i][k]` is the action in the
+            original game of player i's action k in `g_reduced`.
+
+        """
+        N = self.N
+        actions = [np.arange(n) for n in self.nums_actions]
+
+        def reduced_payoff_array(i):
+            return self.players[i].payoff_array[
+                np.ix_(*[actions[(i+j) % N] for j in range(N)])
+            ]
+
+        players_to_check = set(range(N))
+        while players_to_check:
+            i = min(players_to_check)
+            players_to_check.remove(i)
+            if len(actions[i]) <= 1:
+                continue
+
+            payoff_matrix = \
+                reduced_payoff_array(i).reshape(len(actions[i]), -1)
+            tol = self.players[i].tol
+            dominated = _pure_dominated(payoff_matrix, tol)
+            if mixed and not dominated.all():
+                undominated = np.nonzero(~dominated)[0]
+                dominated[undominated] = \
+                    _mixed_dominated(payoff_matrix, undominated, tol)
+
+            if dominated.any():
+                actions[i] = actions[i][~dominated]
+                players_to_check.update(j for j in range(N) if j != i)
+
+        g_reduced = NormalFormGame(
+            [Player(reduced_payoff_array(i)) for i in range(N)]
+        )
+        return g_reduced, tuple(actions)
+
+    def correlated_equilibrium(self, objective='utilitarian'):
+        """
+        Compute a correlated equilibrium by linear programming.
+
+        The incentive constraints, n_i (n_i-1) for each player i, one
+        for each pair of a recommended action a_i and a deviation b_i,
+
+            sum_{a_{-i}} p(a_i, a_{-i}) (u_i(b_i, a_{-i}) -
+                                         u_i(a_i, a_{-i})) <= 0,
+
+        are generated for all the pairs at once directly as a sparse
+        matrix over the prod(n) profile probabilities, and the linear
+        program is solved by `scipy.optimize.linprog` with HiGHS.
+
+        Parameters
+        ----------
+        objective : {'utilitarian', 'egalitarian', None} or
+                    array_like(float, ndim=N),
+                    optional(default='utilitarian')
+            If 'utilitarian', maximize the sum of the players' expected
+            payoffs; if 'egalitarian', maximize the minimum of the
+            players' expected payoffs; if None, return any correlated
+            equilibrium. If an array of shape `nums_actions`, maximize
+            its expectation.
+
+        Returns
+        -------
+        ndarray(float, ndim=N)
+            Array of shape `nums_actions` of the probabilities of the
+            action profiles.
+
+        """
+        N = self.N
+        num_profiles = int(np.prod(self.nums_actions))
+        profile_indices = \
+            np.arange(num_profiles).reshape(self.nums_actions)
+
+        A_ub_blocks = []
+        for i, player in enumerate(self.players):
+            n_i = self.nums_actions[i]
+            if n_i == 1:
+                continue
+            # Payoff matrix with rows for player i's actions and columns
+            # for the opponents' profiles (as float, so that the payoff
+            # differences do not overflow), and the index of the profile
+            # with player i's action set to 0
+            payoff_array = np.moveaxis(
+                player.payoff_array.transpose(list(range(N-i, N)) +
+                                              list(range(N-i))),
+                i, 0
+            )
+            payoff_matrix = payoff_array.reshape(n_i, -1).astype(float)
+            base = np.moveaxis(profile_indices, i, 0)[0].ravel()
+            stride = num_profiles // np.prod(self.nums_actions[:i+1])
+
+            # Pairs (a, b) of recommended actions and deviations
+            a, b = np.nonzero(~np.eye(n_i, dtype=bool))
+            data = payoff_matrix[b] - payoff_matrix[a]
+            indices = base[np.newaxis, :] + a[:, np.newaxis] * stride
+            M = payoff_matrix.shape[1]
+            A_ub_blocks.append(sparse.csr_matrix(
+                (data.ravel(), indices.ravel(),
+                 np.arange(0, (len(a)+1)*M, M)),
+                shape=(len(a), num_profiles)
+            ))
+
+        if A_ub_blocks:
+            A_ub = sparse.vstack(A_ub_blocks, format='csr')
+        else:
+            A_ub = sparse.csr_matrix((0, num_profiles))
+        A_eq = sparse.csr_matrix(np.ones((1, num_profiles)))
+        b_eq = np.ones(1)
+        bounds = [(0, None)] * num_profiles
+
+        # In float, so that compact integer payoffs are not negated with
+        # overflow
+        payoff_profiles = \
+            self.payoff_profile_array.reshape(num_profiles, N).astype(float)
+        if objective is None:
+            c = np.zeros(num_profiles)
+        elif isinstance(objective, str) and objective == 'utilitarian':
+            c = -payoff_profiles.sum(axis=1)
+        elif isinstance(objective, str) and objective == 'egalitarian':
+            # Additional variable t with t <= sum_a p(a) u_i(a) for all i
+            c = np.zeros(num_profiles+1)
+            c[-1] = -1
+            A_ub = sparse.vstack([
+                sparse.hstack([A_ub, sparse.csr_matrix((A_ub.shape[0], 1))]),
+                sparse.hstack([sparse.csr_matrix(-payoff_profiles.T),
+                               np.ones((N, 1))])
+            ], format='csr')
+            A_eq = sparse.hstack([A_eq, sparse.csr_matrix((1, 1))],
+                                 format='csr')
+            bounds.append((None, None))
+        elif isinstance(objective, str):
+            raise ValueError(
+                "objective must be one of 'utilitarian', 'egalitarian', " +
+                "None or an array"
+            )
+        else:
+            objective = np.asarray(objective, dtype=float)
+            if objective.shape != self.nums_actions:
+                raise ValueError(
+                    'objective must be of shape {0}'.format(self.nums_actions)
+                )
+            c = -objective.ravel()
+
+        res = linprog(c, A_ub=A_ub, b_ub=np.zeros(A_ub.shape[0]),
+                      A_eq=A_eq, b_eq=b_eq, bounds=bounds, method='highs')
+        if not res.success:
+            raise RuntimeError(
+                'linear program failed to solve: {0}'.format(res.message)
+            )
+
+        probs = np.maximum(res.x[:num_profiles], 0)
+        probs /= probs.sum()
+        return probs.reshape(self.nums_actions)
+
+
+def _pure_dominated(payoff_matrix, tol, max_block_size=2**22):
+    """
+    Return the boolean array of the rows of `payoff_matrix` that are
+    strictly dominated, by more than `tol` in every column, by other
+    rows. The pairs of rows are compared in blocks of at most
+    `max_block_size` entries.
+
+    """
+    n, M = payoff_matrix.shape
+    # Cast so that the differences of small integers do not wrap around
+    payoff_matrix = payoff_matrix.astype(_compute_dtype(payoff_matrix.dtype),
+                                         copy=False)
+    dominated = np.zeros(n, dtype=bool)
+    chunk_size = max(1, max_block_size // max(n * M, 1))
+    for start in range(0, n, chunk_size):
+        block = payoff_matrix[start:start+chunk_size]
+        # diffs[a, b, c] = payoff_matrix[b, c] - block[a, c]
+        diffs = payoff_matrix[np.newaxis, :, :] - block[:, np.newaxis, :]
+        dominated[start:start+chunk_size] = \
+            (diffs > tol).all(axis=2).any(axis=1)
+    return dominated
+
+
+def _mixed_dominated(payoff_matrix, candidates, tol):
+    """
+    Return the boolean array of whether each row of `payoff_matrix` in
+    `candidates` is strictly dominated, by more than `tol` in every
+    column, by a mixture of the other rows.
+
+    For each candidate a, the linear program
+
+        max eps s.t. x' payoff_matrix[:, c] - eps >= payoff_matrix[a, c]
+                     for all c, x >= 0, x_a = 0, sum(x) = 1
+
+    is solved, where these K programs are stacked into one linear
+    program with block-diagonal constraint matrices.
+
+    """
+    n, M = payoff_matrix.shape
+    K = len(candidates)
+    payoff_matrix = np.asarray(payoff_matrix, dtype=float)
+
+    # Variables for each candidate: x_0, ..., x_{n-1}, eps
+    block_ub = np.hstack((-payoff_matrix.T, np.ones((M, 1))))
+    block_eq = np.append(np.ones(n), 0)[np.newaxis, :]
+    A_ub = sparse.kron(sparse.identity(K, format='csr'),
+                       sparse.csr_matrix(block_ub), format='csr')
+    A_eq = sparse.kron(sparse.identity(K, format='csr'),
+                       sparse.csr_matrix(block_eq), format='csr')
+    b_ub = -payoff_matrix[candidates].ravel()
+    b_eq = np.ones(K)
+    c = np.zeros((K, n+1))
+    c[:, n] = -1
+
+    bounds = np.empty((K, n+1, 2))
+    bounds[:, :n, 0] = 0
+    bounds[:, :n, 1] = 1
+    bounds[np.arange(K), candidates, 1] = 0
+    bounds[:, n, 0] = -np.inf
+    bounds[:, n, 1] = np.inf
+
+    res = linprog(c.ravel(), A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
+                  bounds=bounds.reshape(-1, 2), method='highs')
+    if not res.success:
+        raise RuntimeError(
+            'linear program failed to solve: {0}'.format(res.message)
+        )
+
+    return res.x.reshape(K, n+1)[:, n] > tol
+
+
+def _payoff_profile_array(payoff_arrays):
+    """
+    Return the payoff profile array of the players' payoff arrays
+    `payoff_arrays`.
+
+    """
+    N = len(payoff_arrays)
+    dtype = np.result_type(*payoff_arrays)
+    payoff_profile_array = \
+        np.empty(payoff_arrays[0].shape + (N,), dtype=dtype)
+    for i, payoff_array in enumerate(payoff_arrays):
+        payoff_profile_array[..., i] = \
+            payoff_array.transpose(list(range(N-i, N)) + list(range(N-i)))
+    return payoff_profile_array
+
 
 def _payoff_array2string(payoff_array, class_name=None):
     prefix, suffix = '', ''
@@ -600,6 +1606,297 @@ def _payoff_profile_array2string(payoff_profile_array, class_name=None):
     return s
 
 
+def _contraction_plan(shape):
+    """
+    Plan the contraction of an array of shape `shape` = (n_0, m_1, ...,
+    m_k) with k mixed actions along the axes 1, ..., k.
+
+    The axes are reduced in decreasing order of their sizes, which
+    minimizes the sizes of the intermediate arrays.
+
+    Returns
+    -------
+    plan : list(tuple)
+        List of tuples `(k, subscripts, out_subscripts)`, one for each
+        step, where `k` is the index of the mixed action to contract,
+        and `subscripts` and `out_subscripts` are the subscripts of the
+        input and the output arrays for `np.einsum`.
+
+    """
+    num_mixed = len(shape) - 1
+    order = sorted(range(num_mixed), key=lambda k: -shape[k+1])
+
+    plan = []
+    subscripts = list(range(num_mixed+1))
+    for k in order:
+        out_subscripts = [s for s in subscripts if s != k+1]
+        plan.append((k, subscripts, out_subscripts))
+        subscripts = out_subscripts
+
+    return plan
+
+
+def _batch_opponents_actions(num_opponents, opponents_actions_batch):
+    """
+    Convert `opponents_actions_batch` (see `Player.payoff_vectors`) to a
+    list of `num_opponents` ndarrays, checking the shapes.
+
+    """
+    if num_opponents == 1:
+        opponents_actions_batch = [opponents_actions_batch]
+    elif len(opponents_actions_batch) != num_opponents:
+        raise ValueError(
+            'opponents_actions_batch must be of length {0}'.format(
+                num_opponents
+            )
+        )
+
+    actions_list = []
+    for actions in opponents_actions_batch:
+        actions = np.asarray(actions)
+        if actions.ndim == 1:
+            if not np.issubdtype(actions.dtype, np.integer):
+                raise ValueError(
+                    'a batch of pure actions must be an array of integers'
+                )
+        elif actions.ndim != 2:
+            raise ValueError(
+                'a batch of actions must be an array with ndim 1 or 2'
+            )
+        actions_list.append(actions)
+
+    if len(set(actions.shape[0] for actions in actions_list)) != 1:
+        raise ValueError('batch sizes of the opponents must be equal')
+
+    return actions_list
+
+
+def _payoff_vectors(payoff_array, actions_list):
+    """
+    Contract `payoff_array` with a list of batches of opponents' actions,
+    one for each of the axes 1, ..., N-1, and return the array of shape
+    (B, n_0) of payoff vectors.
+
+    Batches of pure actions are first gathered by fancy indexing, and
+    the remaining mixed axes are contracted in one call to `np.einsum`.
+
+    """
+    pure_axes = [j+1 for j, actions in enumerate(actions_list)
+                 if actions.ndim == 1]
+    mixed_axes = [j+1 for j, actions in enumerate(actions_list)
+                  if actions.ndim == 2]
+    num_mixed = len(mixed_axes)
+
+    # Subscripts: 0 for the batch axis, 1 for the own action axis,
+    # 2, ..., num_mixed+1 for the mixed opponents' axes
+    if pure_axes:
+        A = payoff_array.transpose(pure_axes + [0] + mixed_axes)
+        A = A[tuple(actions_list[j-1] for j in pure_axes)]
+        if num_mixed == 0:
+            return A
+        A_subscripts = [0, 1] + list(range(2, num_mixed+2))
+    else:
+        A = payoff_array
+        A_subscripts = list(range(1, num_mixed+2))
+
+    operands = [A, A_subscripts]
+    for k, j in enumerate(mixed_axes):
+        operands += [_mixed_action_astype(actions_list[j-1],
+                                          payoff_array.dtype),
+                     [0, k+2]]
+
+    return np.einsum(*(operands + [[0, 1]]), optimize=True)
+
+
+def _compute_dtype(dtype):
+    """
+    Return the data type in which the payoff vectors against mixed
+    actions are computed for payoff arrays of data type `dtype`: the
+    smallest floating point type of at least single precision that
+    represents the payoffs exactly, memoized by data type.
+
+    """
+    try:
+        return _COMPUTE_DTYPES[dtype]
+    except KeyError:
+        pass
+    compute_dtype = np.result_type(dtype, np.float32)
+    _COMPUTE_DTYPES[dtype] = compute_dtype
+    return compute_dtype
+
+
+_COMPUTE_DTYPES = {}
+
+
+def _select_best_response(payoff_vector, tie_breaking, tol, random_state):
+    """
+    Return the best response action(s) given `payoff_vector`, with
+    `tie_breaking` and `random_state` as in `Player.best_response` and
+    tolerance `tol`. A random tie break draws as by
+    `Player.random_choice`, i.e., only if there is a tie.
+
+    """
+    if tie_breaking == 'smallest':
+        best_response = np.argmax(payoff_vector)
+        return best_response
+    else:
+        best_responses = \
+            np.where(payoff_vector >= payoff_vector.max() - tol)[0]
+        if tie_breaking == 'random':
+            random_state = check_random_state(random_state)
+            n = len(best_responses)
+            idx = 0 if n == 1 else random_state.randint(n)
+            return best_responses[idx]
+        elif tie_breaking is False:
+            return best_responses
+        else:
+            msg = "tie_breaking must be one of 'smallest', 'random' " + \
+                  "or False"
+            raise ValueError(msg)
+
+
+def _default_tol(dtype):
+    """
+    Return the default tolerance for payoff arrays of data type `dtype`
+    (see `Player`), memoized by data type.
+
+    """
+    try:
+        return _DEFAULT_TOLS[dtype]
+    except KeyError:
+        pass
+    compute_dtype = _compute_dtype(dtype)
+    if compute_dtype.kind != 'f':
+        tol = 1e-8
+    else:
+        eps_ratio = np.finfo(compute_dtype).eps / np.finfo(np.float64).eps
+        tol = max(1e-8, 1e-8 * float(np.sqrt(eps_ratio)))
+    _DEFAULT_TOLS[dtype] = tol
+    return tol
+
+
+_DEFAULT_TOLS = {}
+
+
+def _mixed_action_astype(action, dtype):
+    """
+    Cast the (batch of) mixed action(s) `action` to the data type in
+    which the payoff vectors are computed for payoff arrays of data type
+    `dtype`, if it is of lower than double precision, so that the
+    contraction is not upcast.
+
+    """
+    compute_dtype = _compute_dtype(dtype)
+    if compute_dtype.kind == 'f' and compute_dtype.itemsize < 8:
+        return np.asarray(action, dtype=compute_dtype)
+    return action
+
+
+def _is_nb_payoff_array(payoff_array):
+    """
+    Return True if `payoff_array` can be passed to the compiled kernels
+    without copying: it must be a C-contiguous array of a real dtype.
+
+    """
+    return payoff_array.flags.c_contiguous and \
+        payoff_array.dtype.kind in 'biuf'
+
+
+def _is_memmap(payoff_array):
+    """
+    Return True if `payoff_array` is (a view of) a memory-mapped array.
+
+    """
+    array = payoff_array
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return isinstance(array, mmap.mmap)
+
+
+# Number of bytes of a block of rows of a memory-mapped payoff array
+# processed at a time in `Player.payoff_vector`
+_MMAP_CHUNK_NBYTES = 2**26
+
+
+# Maximum number of payoff entries for which `Player.best_response`
+# dispatches to the compiled kernel
+_NB_MAX_NUM_ENTRIES = 2**14
+
+# Maximum size of a payoff array for which `Player.payoff_vector`
+# reduces the opponents one at a time instead of by a contraction plan,
+# and `Player.best_response` does not dispatch to the compiled kernel
+_SMALL_NUM_ENTRIES = 2**11
+
+
+def _num_entries(shape, pure_actions):
+    """
+    Return the number of entries of a payoff array of shape `shape`
+    involved in the payoff vector against opponents some of whom play
+    the pure actions `pure_actions` (see `_opponents_actions_nb`).
+
+    """
+    num_entries = shape[0]
+    for j, action in enumerate(pure_actions):
+        if action < 0:
+            num_entries *= shape[j+1]
+    return num_entries
+
+
+def _opponents_actions_nb(shape, opponents_actions):
+    """
+    Convert a profile of N-1 opponents' actions (see
+    `Player.best_response`) to the input of the compiled kernels for a
+    payoff array of shape `shape` with N >= 3.
+
+    Returns
+    -------
+    pure_actions : ndarray(int, ndim=1)
+        Array of length N-1 containing the pure actions of the
+        opponents playing pure actions, and -1 for those playing mixed
+        actions.
+
+    mixed_actions : ndarray(float, ndim=1)
+        Concatenation of the mixed actions of the opponents playing
+        mixed actions.
+
+    """
+    num_opponents = len(shape) - 1
+    if len(opponents_actions) != num_opponents:
+        raise ValueError(
+            'opponents_actions must be of length {0}'.format(num_opponents)
+        )
+
+    pure_actions = np.empty(num_opponents, dtype=int)
+    mixed_actions_list = []
+    for j, action in enumerate(opponents_actions):
+        n = shape[j+1]
+        if isinstance(action, numbers.Integral):  # pure action
+            if not -n <= action < n:
+                raise IndexError(
+                    'action {0} is out of bounds for opponent {1}'.format(
+                        action, j
+                    )
+                )
+            pure_actions[j] = action % n
+        else:  # mixed action
+            if len(action) != n:
+                raise ValueError(
+                    'mixed action of opponent {0} must be of length '
+                    '{1}'.format(j, n)
+                )
+            pure_actions[j] = -1
+            mixed_actions_list.append(action)
+
+    if mixed_actions_list:
+        mixed_actions = np.concatenate(mixed_actions_list).astype(float)
+    else:
+        mixed_actions = np.empty(0)
+
+    return pure_actions, mixed_actions
+
+
 def pure2mixed(num_actions, action):
     """
     Convert a pure action to the corresponding mixed action.
@@ -667,3 +1964,149 @@ def best_response_2p(payoff_matrix, opponent_mixed_action):
             best_response = a
 
     return best_response
+
+
+@jit(nopython=True)
+def payoff_vector_np(payoff_matrix, pure_actions, mixed_actions,
+                     nums_actions):
+    """
+    Numba-optimized version of `Player.payoff_vector` compiled in
+    nopython mode, for N-player games with N >= 3.
+
+    The expected payoffs are accumulated only over the profiles in the
+    product of the supports of the opponents' actions, so that a pure
+    opponent costs no more than a reduction of the payoff array, and
+    the last opponent's axis is traversed contiguously.
+
+    Parameters
+    ----------
+    payoff_matrix : ndarray(float, ndim=2)
+        Payoff array of the player reshaped (in C order) to (n_0, -1).
+
+    pure_actions : ndarray(int, ndim=1)
+        Array of length N-1 containing the pure actions of the
+        opponents playing pure actions, and -1 for those playing mixed
+        actions.
+
+    mixed_actions : ndarray(float, ndim=1)
+        Concatenation of the mixed actions of the opponents playing
+        mixed actions.
+
+    nums_actions : ndarray(int, ndim=1)
+        Array of length N-1 containing the numbers of actions of the
+        opponents.
+
+    Return
+    ------
+    ndarray(float, ndim=1)
+        Payoff vector.
+
+    """
+    n = payoff_matrix.shape[0]
+    num_opponents = nums_actions.shape[0]
+
+    strides = np.ones(num_opponents, dtype=np.intp)
+    for j in range(num_opponents-2, -1, -1):
+        strides[j] = strides[j+1] * nums_actions[j+1]
+    offsets = np.zeros(num_opponents, dtype=np.intp)
+    offset = 0
+    for j in range(num_opponents):
+        offsets[j] = offset
+        if pure_actions[j] < 0:
+            offset += nums_actions[j]
+
+    # Columns of payoff_matrix at which the last opponent's axis starts,
+    # and their probabilities, over the first N-2 opponents' supports
+    num_profiles = 1
+    for j in range(num_opponents-1):
+        if pure_actions[j] < 0:
+            num_profiles *= nums_actions[j]
+    cols = np.empty(num_profiles, dtype=np.intp)
+    weights = np.empty(num_profiles)
+
+    counters = np.zeros(num_opponents-1, dtype=np.intp)
+    k = 0
+    for _ in range(num_profiles):
+        col = 0
+        weight = 1.
+        for j in range(num_opponents-1):
+            if pure_actions[j] < 0:
+                col += counters[j] * strides[j]
+                weight *= mixed_actions[offsets[j]+counters[j]]
+            else:
+                col += pure_actions[j] * strides[j]
+        if weight != 0:  # Skip profiles outside the supports
+            cols[k] = col
+            weights[k] = weight
+            k += 1
+
+        # Advance counters of mixed opponents, the last one fastest
+        j = num_opponents - 2
+        while j >= 0:
+            if pure_actions[j] < 0:
+                counters[j] += 1
+                if counters[j] < nums_actions[j]:
+                    break
+                counters[j] = 0
+            j -= 1
+    num_profiles = k
+
+    last = num_opponents - 1
+    payoff_vector = np.zeros(n)
+    if pure_actions[last] >= 0:
+        for a in range(n):
+            payoff = 0.
+            for k in range(num_profiles):
+                payoff += \
+                    payoff_matrix[a, cols[k]+pure_actions[last]] * weights[k]
+            payoff_vector[a] = payoff
+    else:
+        m = nums_actions[last]
+        x = mixed_actions[offsets[last]:offsets[last]+m]
+        for a in range(n):
+            payoff = 0.
+            for k in range(num_profiles):
+                col = cols[k]
+                s = 0.
+                for b in range(m):
+                    s += payoff_matrix[a, col+b] * x[b]
+                payoff += s * weights[k]
+            payoff_vector[a] = payoff
+
+    return payoff_vector
+
+
+@jit(nopython=True)
+def best_response_np(payoff_matrix, pure_actions, mixed_actions,
+                     nums_actions, payoff_perturbation):
+    """
+    Numba-optimized version of `Player.best_response` compiled in
+    nopython mode, for N-player games with N >= 3 and
+    `tie_breaking='smallest'`. (With `tie_breaking='random'`,
+    `Player.best_response` breaks the tie in Python on the payoff
+    vector by `payoff_vector_np`, so that the random draw is made by
+    `random_choice`.)
+
+    Parameters
+    ----------
+    payoff_matrix, pure_actions, mixed_actions, nums_actions :
+        See `payoff_vector_np`.
+
+    payoff_perturbation : ndarray(float, ndim=1)
+        Array of length `payoff_matrix.shape[0]` containing the values
+        to be added to the payoffs, or an empty array for no
+        perturbation.
+
+    Return
+    ------
+    scalar(int)
+        Best response action (with the smallest index if more than
+        one).
+
+    """
+    payoff_vector = payoff_vector_np(payoff_matrix, pure_actions,
+                                     mixed_actions, nums_actions)
+    if payoff_perturbation.shape[0] > 0:
+        payoff_vector += payoff_perturbation
+
+    return np.argmax(payoff_vector)
@@ -0,0 +1,175 @@
+r"""
+Filename: potential_game.py
+
+Detection of potential games and computation of potential functions.
+
+A normal form game is a weighted potential game with weights w_0, ...,
+w_{N-1} > 0 if there exists a function Phi on the action profiles, a
+potential, such that for all players i, actions a_i, a'_i and opponents'
+actions a_{-i},
+
+.. math::
+
+    w_i (u_i(a'_i, a_{-i}) - u_i(a_i, a_{-i}))
+    = \Phi(a'_i, a_{-i}) - \Phi(a_i, a_{-i}),
+
+and an exact potential game if this holds with w_i = 1 for all i.
+
+The candidate potential is constructed by accumulating the players'
+unilateral deviation differences along the axes, and the condition is
+then checked for all the players and all the profiles at once, in the
+common axis order (n_0, ..., n_{N-1}).
+
+>>> from normal_form_game import NormalFormGame
+>>> prisoners_dilemma = [[(1, 1), (-2, 3)], [(3, -2), (0, 0)]]
+>>> g = NormalFormGame(prisoners_dilemma)
+>>> print(potential_function(g))
+[[0. 2.]
+ [2. 4.]]
+
+References
+----------
+D. Monderer and L. S. Shapley, "Potential Games," Games and Economic
+Behavior 14 (1996), 124-143.
+
+"""
+from __future__ import division
+
+from collections import deque
+import numpy as np
+
+
+def potential_function(g, weights=None):
+    """
+    Return the potential of a (weighted) potential game, normalized to
+    be zero at the profile (0, ..., 0).
+
+    Parameters
+    ----------
+    g : NormalFormGame
+        NormalFormGame instance.
+
+    weights : array_like(float, ndim=1), optional(default=None)
+        Positive weights of the N players. If None, test for an exact
+        potential game.
+
+    Returns
+    -------
+    ndarray(float, ndim=N) or None
+        Potential array of shape `g.nums_actions`, or None if `g` is not
+        a (weighted) potential game with `weights`.
+
+    """
+    N = g.N
+    if weights is None:
+        weights = np.ones(N)
+    else:
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != (N,) or (weights <= 0).any():
+            raise ValueError(
+                'weights must be an array of {0} positive numbers'.format(N)
+            )
+    tol = max(player.tol for player in g.players) * weights.max()
+    payoff_arrays = [w * U for w, U in zip(weights, _payoff_arrays(g))]
+
+    # Phi(a) = sum_i [U_i(a_0, ..., a_i, 0, ..., 0) -
+    #                 U_i(a_0, ..., a_{i-1}, 0, ..., 0)]
+    potential = np.zeros(g.nums_actions)
+    for i, U in enumerate(payoff_arrays):
+        index = tuple(slice(None) if j <= i else 0 for j in range(N))
+        index_0 = tuple(slice(None) if j < i else slice(0, 1)
+                        if j == i else 0 for j in range(N))
+        diffs = U[index] - U[index_0]
+        potential += diffs.reshape(diffs.shape + (1,)*(N-i-1))
+
+    # U_i - Phi must not depend on a_i
+    for i, U in enumerate(payoff_arrays):
+        V = U - potential
+        if not (np.abs(V - V.take([0], axis=i)) <= tol).all():
+            return None
+
+    return potential
+
+
+def potential_weights(g):
+    """
+    Find positive weights with which `g` is a weighted potential game.
+
+    For each pair of players i and j, the weighted potential condition
+    on the 4-cycles of deviations by i and j requires w_i D_i = w_j D_j,
+    where D_i is the second difference of player i's payoffs with
+    respect to the actions of i and j. The ratios of the weights are
+    determined from these conditions along a spanning tree of the pairs
+    with nonzero second differences, and the weights are then verified
+    by `potential_function`.
+
+    Parameters
+    ----------
+    g : NormalFormGame
+        NormalFormGame instance.
+
+    Returns
+    -------
+    ndarray(float, ndim=1) or None
+        Array of the weights normalized with w_0 = 1, or None if `g` is
+        not a weighted potential game.
+
+    """
+    N = g.N
+    payoff_arrays = _payoff_arrays(g)
+
+    def second_diffs(U, i, j):
+        U_0 = U - U.take([0], axis=i)
+        return U_0 - U_0.take([0], axis=j)
+
+    weights = np.full(N, np.nan)
+    for root in range(N):
+        if not np.isnan(weights[root]):
+            continue
+        weights[root] = 1
+        queue = deque([root])
+        while queue:
+            i = queue.popleft()
+            for j in range(N):
+                if not np.isnan(weights[j]):
+                    continue
+                D_i = second_diffs(payoff_arrays[i], i, j)
+                D_j = second_diffs(payoff_arrays[j], i, j)
+                denom = (D_j**2).sum()
+                if denom == 0:
+                    continue
+                ratio = (D_i * D_j).sum() / denom
+                if ratio <= 0:
+                    return None
+                weights[j] = weights[i] * ratio
+                queue.append(j)
+
+    weights /= weights[0]
+    if potential_function(g, weights) is None:
+        return None
+    return weights
+
+
+def is_potential_game(g, weighted=False):
+    """
+    Return True if `g` is an exact potential game, or a weighted
+    potential game if `weighted=True`.
+
+    """
+    if weighted:
+        return potential_weights(g) is not None
+    return potential_function(g) is not None
+
+
+def _payoff_arrays(g):
+    """
+    Return the list of the players' payoff arrays in the common axis
+    order (n_0, ..., n_{N-1}), as float arrays.
+
+    """
+    N = g.N
+    return [
+        np.asarray(player.payoff_array, dtype=float).transpose(
+            list(range(N-i, N)) + list(range(N-i))
+        ) for i, player in enumerate(g.players)
+    ]
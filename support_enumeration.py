@@ -0,0 +1,292 @@
+"""
+Filename: support_enumeration.py
+
+Compute all mixed Nash equilibria of a 2-player (non-degenerate) normal
+form game by support enumeration.
+
+The support pairs of equal size k are enumerated, and for each pair the
+indifference conditions are solved for the mixed actions supported on
+them. The linear systems for a block of support pairs are stacked and
+solved in one call to `np.linalg.solve`, and the candidates are verified
+with `best_response_2p`. The blocks may be distributed over the workers
+of a `concurrent.futures.ProcessPoolExecutor`.
+
+References
+----------
+B. von Stengel, "Equilibrium Computation for Two-Player Games in
+Strategic and Extensive Form," Chapter 3, N. Nisan, T. Roughgarden, E.
+Tardos, and V. Vazirani eds., Algorithmic Game Theory, 2007.
+
+"""
+from __future__ import division
+
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from normal_form_game import NormalFormGame, best_response_2p
+from util import binomial_coefficient
+
+
+def support_enumeration(g, num_workers=1, chunk_size=16):
+    """
+    Compute the Nash equilibria of a 2-player normal form game by
+    support enumeration.
+
+    Parameters
+    ----------
+    g : NormalFormGame
+        NormalFormGame instance with 2 players.
+
+    num_workers : scalar(int), optional(default=1)
+        See `support_enumeration_gen`.
+
+    chunk_size : scalar(int), optional(default=16)
+        See `support_enumeration_gen`.
+
+    Returns
+    -------
+    list(tuple(ndarray(float, ndim=1)))
+        List of Nash equilibrium mixed action profiles. If
+        `num_workers=1`, they are ordered by the support size and then
+        lexicographically by the supports.
+
+    """
+    return list(support_enumeration_gen(g, num_workers=num_workers,
+                                        chunk_size=chunk_size))
+
+
+def support_enumeration_gen(g, num_workers=1, chunk_size=16):
+    """
+    Generator version of `support_enumeration`, which yields the Nash
+    equilibria as they are found.
+
+    Parameters
+    ----------
+    g : NormalFormGame
+        NormalFormGame instance with 2 players.
+
+    num_workers : scalar(int), optional(default=1)
+        Number of worker processes. If 1, the support pairs are
+        processed in the current process; otherwise the blocks of
+        support pairs are submitted to a `ProcessPoolExecutor` with
+        `num_workers` workers (`None` for the number of processors), and
+        the equilibria are yielded in the order in which the blocks are
+        completed.
+
+    chunk_size : scalar(int), optional(default=16)
+        Number of supports of player 0 in each block, which is paired
+        with all the supports of player 1 of the same size.
+
+    Yields
+    ------
+    tuple(ndarray(float, ndim=1))
+        Tuple of Nash equilibrium mixed actions.
+
+    """
+    if not isinstance(g, NormalFormGame) or g.N != 2:
+        raise ValueError('input must be a 2-player NormalFormGame')
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be a positive integer')
+
+    payoff_matrices = tuple(player.payoff_array for player in g.players)
+    tol = max(player.tol for player in g.players)
+    tasks = _support_enumeration_tasks(g.nums_actions, chunk_size)
+
+    if num_workers == 1:
+        for k, start, stop in tasks:
+            for NE in _support_enumeration_task(payoff_matrices, k, start,
+                                                stop, tol):
+                yield NE
+        return
+
+    # Number of blocks submitted to the executor at a time
+    max_num_pending = 2 * (num_workers or os.cpu_count() or 1)
+    tasks = iter(tasks)
+    executor = ProcessPoolExecutor(max_workers=num_workers)
+    pending = set()
+    try:
+        while True:
+            for k, start, stop in tasks:
+                pending.add(executor.submit(_support_enumeration_task,
+                                            payoff_matrices, k, start, stop,
+                                            tol))
+                if len(pending) >= max_num_pending:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for NE in future.result():
+                    yield NE
+    finally:
+        # Do not wait for the pending blocks if the generator is closed
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _support_enumeration_tasks(nums_actions, chunk_size):
+    """
+    Return the list of tasks `(k, start, stop)`, each consisting of the
+    supports of size k of player 0 with indices from `start` to `stop`
+    in lexicographic order, paired with all the supports of size k of
+    player 1.
+
+    """
+    tasks = []
+    for k in range(1, min(nums_actions)+1):
+        num_supports = binomial_coefficient(nums_actions[0], k)
+        for start in range(0, num_supports, chunk_size):
+            tasks.append((k, start, min(start+chunk_size, num_supports)))
+    return tasks
+
+
+def _supports(n, k, start=0, stop=None):
+    """
+    Return the array of the supports of size k of n actions with
+    indices from `start` to `stop` in lexicographic order.
+
+    The support with index `start` is obtained directly by unranking,
+    and the following ones by successively incrementing it.
+
+    """
+    num_supports = binomial_coefficient(n, k)
+    if stop is None or stop > num_supports:
+        stop = num_supports
+    supports = np.empty((max(stop - start, 0), k), dtype=int)
+    if supports.shape[0] == 0:
+        return supports
+
+    # Unrank: choose the entries one at a time, skipping the blocks of
+    # combinations that start with smaller entries
+    support = []
+    r = start
+    a = 0
+    for i in range(k):
+        while True:
+            num_skipped = binomial_coefficient(n - a - 1, k - i - 1)
+            if r < num_skipped:
+                break
+            r -= num_skipped
+            a += 1
+        support.append(a)
+        a += 1
+
+    for m in range(supports.shape[0]):
+        supports[m] = support
+        # Next combination in lexicographic order
+        i = k - 1
+        while i >= 0 and support[i] == n - k + i:
+            i -= 1
+        if i < 0:
+            break
+        support[i] += 1
+        for j in range(i+1, k):
+            support[j] = support[j-1] + 1
+
+    return supports
+
+
+def _support_enumeration_task(payoff_matrices, k, start, stop, tol):
+    """
+    Return the list of the Nash equilibria supported on the pairs of
+    the supports of size k of player 0 with indices from `start` to
+    `stop` and all the supports of size k of player 1.
+
+    """
+    A, B = payoff_matrices
+    n_0, n_1 = A.shape
+
+    supports_0 = _supports(n_0, k, start, stop)
+    supports_1 = _supports(n_1, k)
+    num_supports_1 = supports_1.shape[0]
+    supports_0 = np.repeat(supports_0, num_supports_1, axis=0)
+    supports_1 = np.tile(supports_1, (stop - start, 1))
+
+    # Player 1's mixed actions that make player 0 indifferent, and
+    # player 0's mixed actions that make player 1 indifferent
+    ys, payoffs_0, valid = _indiff_mixed_actions(A, supports_0, supports_1)
+    xs, payoffs_1, valid_1 = \
+        _indiff_mixed_actions(B, supports_1, supports_0)
+    valid &= valid_1
+
+    NEs = []
+    for m in np.nonzero(valid)[0]:
+        x = np.zeros(n_0)
+        x[supports_0[m]] = xs[m]
+        y = np.zeros(n_1)
+        y[supports_1[m]] = ys[m]
+        if _is_best_response_value(A, y, payoffs_0[m], tol) and \
+                _is_best_response_value(B, x, payoffs_1[m], tol):
+            NEs.append((x, y))
+
+    return NEs
+
+
+def _indiff_mixed_actions(payoff_matrix, own_supports, opponent_supports):
+    """
+    For a batch of K support pairs of size k, solve for the opponent's
+    mixed actions supported on `opponent_supports` that make the player
+    indifferent among the actions in `own_supports`.
+
+    Parameters
+    ----------
+    payoff_matrix : ndarray(float, ndim=2)
+        The player's payoff matrix.
+
+    own_supports : ndarray(int, ndim=2)
+        Array of shape (K, k) of the player's supports.
+
+    opponent_supports : ndarray(int, ndim=2)
+        Array of shape (K, k) of the opponent's supports.
+
+    Returns
+    -------
+    mixed_actions : ndarray(float, ndim=2)
+        Array of shape (K, k) of the probabilities on the opponent's
+        supports.
+
+    payoffs : ndarray(float, ndim=1)
+        Array of length K of the player's indifferent payoff values.
+
+    valid : ndarray(bool, ndim=1)
+        Array of length K which is True where the system is nonsingular
+        and the solution is completely mixed on the support.
+
+    """
+    K, k = own_supports.shape
+
+    # Systems [[P, -1], [1', 0]] [z; u] = [0; 1] with P the submatrix
+    M = np.empty((K, k+1, k+1))
+    M[:, :k, :k] = payoff_matrix[own_supports[:, :, np.newaxis],
+                                 opponent_supports[:, np.newaxis, :]]
+    M[:, :k, k] = -1
+    M[:, k, :k] = 1
+    M[:, k, k] = 0
+
+    # Detect (numerically) singular systems by comparing the
+    # determinants with Hadamard's bound
+    dets = np.abs(np.linalg.det(M))
+    bounds = np.sqrt((M**2).sum(axis=2)).prod(axis=1)
+    nonsingular = dets > bounds * 1e-10
+
+    solutions = np.zeros((K, k+1))
+    rhs = np.zeros((nonsingular.sum(), k+1, 1))
+    rhs[:, k, 0] = 1
+    solutions[nonsingular] = np.linalg.solve(M[nonsingular], rhs)[..., 0]
+
+    mixed_actions = solutions[:, :k]
+    valid = nonsingular & (mixed_actions > 0).all(axis=1)
+
+    return mixed_actions, solutions[:, k], valid
+
+
+def _is_best_response_value(payoff_matrix, opponent_mixed_action, payoff,
+                            tol):
+    """
+    Return True if `payoff` is the best response payoff (up to `tol`)
+    against `opponent_mixed_action`.
+
+    """
+    br = best_response_2p(payoff_matrix, opponent_mixed_action)
+    return payoff_matrix[br].dot(opponent_mixed_action) <= payoff + tol
@@ -0,0 +1,292 @@
+r"""
+Filename: symmetric_game.py
+
+Compact representation of symmetric N-player normal form games.
+
+In a symmetric (anonymous) game, the payoff to a player depends only on
+the player's own action and on the numbers of the opponents playing each
+action. The payoffs are thus stored in a table of shape (n, M), where
+n is the number of actions and M the number of *count vectors*, i.e.,
+vectors :math:`c = (c_0, \ldots, c_{n-1})` of nonnegative integers with
+:math:`c_0 + \cdots + c_{n-1} = N-1`, instead of an array with
+:math:`n^N` entries for each of the N players.
+
+The count vectors are indexed by the combinatorial number system applied
+to the positions of the bars in the "stars and bars" representation:
+with :math:`s_a = c_0 + \cdots + c_a`, the index of c is
+
+.. math::
+
+    \sum_{a=0}^{n-2} \binom{s_a + a}{a + 1}.
+
+>>> g = SymmetricNormalFormGame(3, [[1, 0, 0], [0, 0, 2]])
+>>> g.count_vectors
+array([[0, 2],
+       [1, 1],
+       [2, 0]])
+>>> print(g.payoff_vector([1/2, 1/2]))
+[0.25 0.5 ]
+
+"""
+from __future__ import division
+
+import numpy as np
+from scipy.special import gammaln
+from normal_form_game import (
+    Player, NormalFormGame, _default_tol, _select_best_response
+)
+from util import (
+    binomial_coefficient, composition_rank, composition_unrank
+)
+
+
+class SymmetricNormalFormGame(object):
+    """
+    Class representing a symmetric N-player normal form game.
+
+    Parameters
+    ----------
+    N : scalar(int)
+        The number of players.
+
+    payoff_table : array_like(float, ndim=2)
+        Array of shape (n, M), where payoff_table[a, k] is the payoff to
+        a player who plays action a while the opponents' actions are
+        counted by the count vector `count_vectors[k]`.
+
+    Attributes
+    ----------
+    N : scalar(int)
+        See Parameters.
+
+    payoff_table : ndarray(float, ndim=2)
+        See Parameters.
+
+    num_actions : scalar(int)
+        The number of actions available to each player.
+
+    count_vectors : ndarray(int, ndim=2)
+        Array of shape (M, n) of the count vectors of the opponents'
+        actions, in the order of their indices.
+
+    """
+    def __init__(self, N, payoff_table):
+        self.payoff_table = np.asarray(payoff_table)
+        if self.payoff_table.ndim != 2:
+            raise ValueError('payoff_table must be a 2-dimensional array')
+        if N < 2:
+            raise ValueError('N must be at least 2')
+
+        self.N = N
+        self.num_actions = self.payoff_table.shape[0]
+        self.tol = _default_tol(self.payoff_table.dtype)
+
+        n, K = self.num_actions, N - 1
+        num_count_vectors = binomial_coefficient(K + n - 1, n - 1)
+        if self.payoff_table.shape[1] != num_count_vectors:
+            raise ValueError(
+                'payoff_table must be of shape ({0}, {1})'.format(
+                    n, num_count_vectors
+                )
+            )
+
+        self.count_vectors = composition_unrank(K, n)
+
+        # Log of the multinomial coefficients (N-1)! / prod(c_a!)
+        self._log_multinomial_coefs = \
+            gammaln(K + 1) - gammaln(self.count_vectors + 1).sum(axis=1)
+
+    def __repr__(self):
+        s = 'Symmetric {N}-player NormalFormGame with {n} actions'.format(
+            N=self.N, n=self.num_actions
+        )
+        return s
+
+    def __str__(self):
+        s = self.__repr__()
+        s += ' with payoff table:\n'
+        s += np.array2string(self.payoff_table, separator=', ')
+        return s
+
+    def index(self, count_vectors):
+        """
+        Return the indices of count vectors.
+
+        Parameters
+        ----------
+        count_vectors : array_like(int)
+            Count vector, or array of count vectors along the last
+            axis.
+
+        Returns
+        -------
+        scalar(int) or ndarray(int)
+            Index, or array of indices, of `count_vectors`.
+
+        """
+        return composition_rank(count_vectors, self.N - 1)
+
+    def payoff_vector(self, mixed_action):
+        """
+        Return the payoff vector when all the opponents play the same
+        mixed action `mixed_action`, computed as the sum over the count
+        vectors weighted by the multinomial probabilities.
+
+        Parameters
+        ----------
+        mixed_action : array_like(float, ndim=1)
+            Mixed action played by each opponent.
+
+        Returns
+        -------
+        ndarray(float, ndim=1)
+            Payoff vector.
+
+        """
+        return self.payoff_table.dot(self._count_vector_probs(mixed_action))
+
+    def payoff_vector_counts(self, count_vector):
+        """
+        Return the payoff vector when the opponents' actions are counted
+        by `count_vector`.
+
+        Parameters
+        ----------
+        count_vector : array_like(int, ndim=1)
+            Count vector of the opponents' actions, which must sum to
+            N-1.
+
+        Returns
+        -------
+        ndarray(float, ndim=1)
+            Payoff vector.
+
+        """
+        count_vector = np.asarray(count_vector)
+        if count_vector.sum() != self.N - 1:
+            raise ValueError(
+                'count_vector must sum to {0}'.format(self.N - 1)
+            )
+        return self.payoff_table[:, self.index(count_vector)]
+
+    def best_response(self, mixed_action, tie_breaking='smallest',
+                      random_state=None):
+        """
+        Return the best response action(s) when all the opponents play
+        `mixed_action`.
+
+        Parameters
+        ----------
+        mixed_action : array_like(float, ndim=1)
+            Mixed action played by each opponent.
+
+        tie_breaking : {'smallest', 'random', False},
+                       optional(default='smallest')
+            See `Player.best_response`.
+
+        random_state : scalar(int) or np.random.RandomState,
+                       optional(default=None)
+            See `Player.best_response`.
+
+        Returns
+        -------
+        scalar(int) or ndarray(int, ndim=1)
+            See `Player.best_response`.
+
+        """
+        payoff_vector = self.payoff_vector(mixed_action)
+        return _select_best_response(payoff_vector, tie_breaking, self.tol,
+                                     random_state)
+
+    def is_symmetric_nash(self, mixed_action):
+        """
+        Return True if the symmetric profile where every player plays
+        `mixed_action` is a Nash equilibrium.
+
+        """
+        payoff_vector = self.payoff_vector(mixed_action)
+        return np.dot(mixed_action, payoff_vector) >= \
+            payoff_vector.max() - self.tol
+
+    def to_normal_form_game(self):
+        """
+        Return the dense `NormalFormGame` representation.
+
+        Returns
+        -------
+        NormalFormGame
+
+        """
+        payoff_array = self.payoff_table[:, self._profile_indices()]
+        players = [Player(payoff_array.copy()) for i in range(self.N)]
+        return NormalFormGame(players)
+
+    @classmethod
+    def from_normal_form_game(cls, g):
+        """
+        Construct the compact representation of a symmetric
+        `NormalFormGame`.
+
+        Parameters
+        ----------
+        g : NormalFormGame
+            Symmetric NormalFormGame instance with N >= 2 players. Raise
+            ValueError if `g` is not symmetric.
+
+        Returns
+        -------
+        SymmetricNormalFormGame
+
+        """
+        N = g.N
+        n = g.nums_actions[0]
+        if N < 2 or any(num_actions != n for num_actions in g.nums_actions):
+            raise ValueError('g must be a symmetric game')
+
+        # Representative opponents' profile of each count vector, in
+        # the order of their indices: the actions sorted in increasing
+        # order
+        count_vectors = composition_unrank(N - 1, n)
+        representatives = np.repeat(
+            np.tile(np.arange(n), (count_vectors.shape[0], 1)).ravel(),
+            count_vectors.ravel()
+        ).reshape(count_vectors.shape[0], N-1)
+        payoff_array = g.players[0].payoff_array
+        table = payoff_array[(slice(None),) + tuple(representatives.T)]
+
+        symmetric_game = cls(N, table)
+
+        payoff_array_expected = \
+            symmetric_game.payoff_table[:, symmetric_game._profile_indices()]
+        for player in g.players:
+            if not np.array_equal(player.payoff_array,
+                                  payoff_array_expected):
+                raise ValueError('g must be a symmetric game')
+
+        return symmetric_game
+
+    def _count_vector_probs(self, mixed_action):
+        """
+        Return the multinomial probabilities of the count vectors when
+        the N-1 opponents play `mixed_action` independently.
+
+        """
+        mixed_action = np.asarray(mixed_action, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_mixed_action = np.log(mixed_action)
+            log_powers = np.where(self.count_vectors > 0,
+                                  self.count_vectors * log_mixed_action, 0)
+        return np.exp(self._log_multinomial_coefs + log_powers.sum(axis=1))
+
+    def _profile_indices(self):
+        """
+        Return the array of shape (n,)*(N-1) of the indices of the count
+        vectors of all the opponents' action profiles.
+
+        """
+        n, K = self.num_actions, self.N - 1
+        profiles = np.indices((n,)*K).reshape(K, -1)
+        count_vectors = np.zeros((profiles.shape[1], n), dtype=int)
+        for actions in profiles:
+            count_vectors[np.arange(profiles.shape[1]), actions] += 1
+        return self.index(count_vectors).reshape((n,)*K)
@@ -0,0 +1,88 @@
+"""
+Filename: test_best_reply_graph.py
+
+Tests for best_reply_graph.py
+
+"""
+from __future__ import division
+
+import itertools
+import numpy as np
+from numpy.testing import assert_array_equal
+from nose.tools import eq_, ok_
+
+from normal_form_game import NormalFormGame
+from best_reply_graph import BestReplyGraph
+
+
+class TestBestReplyGraph_3p:
+    '''Test BestReplyGraph with a random 3-player game'''
+
+    def setUp(self):
+        '''Setup a random 3-player game'''
+        self.nums_actions = (3, 2, 4)
+        random_state = np.random.RandomState(0)
+        self.g = NormalFormGame(
+            random_state.randint(3, size=self.nums_actions+(3,))
+        )
+
+    def brute_force_adj_matrix(self, better_reply):
+        adj_matrix = np.zeros((24, 24), dtype=bool)
+        profiles = list(itertools.product(*map(range, self.nums_actions)))
+        for a in profiles:
+            for i, player in enumerate(self.g.players):
+                opponents_actions = a[i+1:] + a[:i]
+                payoff_vector = player.payoff_vector(opponents_actions)
+                for b_i in range(self.nums_actions[i]):
+                    if better_reply:
+                        edge = payoff_vector[b_i] > payoff_vector[a[i]]
+                    else:
+                        edge = \
+                            payoff_vector[b_i] == payoff_vector.max() and \
+                            payoff_vector[a[i]] < payoff_vector.max()
+                    if edge:
+                        b = a[:i] + (b_i,) + a[i+1:]
+                        u = np.ravel_multi_index(a, self.nums_actions)
+                        v = np.ravel_multi_index(b, self.nums_actions)
+                        adj_matrix[u, v] = True
+        return adj_matrix
+
+    def test_adj_matrix(self):
+        for better_reply in [False, True]:
+            graph = BestReplyGraph(self.g, better_reply=better_reply)
+            assert_array_equal(graph.adj_matrix.toarray(),
+                               self.brute_force_adj_matrix(better_reply))
+
+    def test_singleton_sinks_are_nash(self):
+        for better_reply in [False, True]:
+            graph = BestReplyGraph(self.g, better_reply=better_reply)
+            singleton_sinks = [sink[0] for sink in graph.sink_equilibria()
+                               if len(sink) == 1]
+            eq_(singleton_sinks, self.g.pure_nash_equilibria())
+
+
+def test_coordination_game():
+    g = NormalFormGame([[4, 0], [3, 2]])
+    graph = BestReplyGraph(g)
+    ok_(graph.is_acyclic())
+    ok_(graph.is_weakly_acyclic())
+    eq_(graph.sink_equilibria(), [[(0, 0)], [(1, 1)]])
+
+
+def test_matching_pennies():
+    g = NormalFormGame([[(1, -1), (-1, 1)], [(-1, 1), (1, -1)]])
+    graph = BestReplyGraph(g)
+    ok_(not graph.is_acyclic())
+    ok_(not graph.is_weakly_acyclic())
+    num_components, labels = graph.strongly_connected_components()
+    eq_(num_components, 1)
+
+
+if __name__ == '__main__':
+    import sys
+    import nose
+
+    argv = sys.argv[:]
+    argv.append('--verbose')
+    argv.append('--nocapture')
+    nose.main(argv=argv, defaultTest=__file__)
@@ -8,10 +8,10 @@ Tests for brd.py
 from __future__ import division
 
 import numpy as np
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_equal, assert_allclose
 from nose.tools import eq_, ok_, raises
 
-from brd import BRD
+from brd import BRD, KMR, SamplingBRD
 
 
 class TestBRD:
@@ -58,6 +58,253 @@ class TestBRD:
             )
 
 
+def test_brd_dtype():
+    brd = BRD([[4, 0], [3, 2]], N=4, dtype=np.float32)
+    eq_(brd.player.payoff_array.dtype, np.float32)
+    np.random.seed(22)
+    assert_array_equal(brd.simulate(ts_length=3, init_action_dist=[2, 2]),
+                       [[2, 2], [1, 3], [0, 4]])
+
+
+def test_simulate_nb_same_as_simulate_iter():
+    payoff_matrix = [[3, -1, 0], [2, 2, -4], [0, 1, 1.5]]
+    N = 7
+    for brd in [BRD(payoff_matrix, N), KMR(payoff_matrix, N, epsilon=0.2),
+                SamplingBRD(payoff_matrix, N, k=3)]:
+        np.random.seed(0)
+        seq = brd.simulate(ts_length=200)
+        reps = brd.replicate(T=20, num_reps=10)
+        x = np.random.random()
+
+        # Run by the Python generator
+        np.random.seed(0)
+        seq_iter = np.array(
+            [a.copy() for a in brd.simulate_iter(ts_length=200)]
+        )
+        reps_iter = np.empty_like(reps)
+        for j in range(10):
+            for a in brd.simulate_iter(ts_length=21):
+                pass
+            reps_iter[j] = a
+
+        assert_array_equal(seq, seq_iter)
+        assert_array_equal(reps, reps_iter)
+        eq_(x, np.random.random())
+
+
+def test_simulate_incremental_payoffs():
+    # Many actions, with near ties by rounding
+    n, N = 60, 50
+    payoff_matrix = np.random.RandomState(0).standard_normal((n, n))
+    payoff_matrix[1] = payoff_matrix[0] + 1e-15
+    for brd in [BRD(payoff_matrix, N), KMR(payoff_matrix, N, epsilon=0.3)]:
+        np.random.seed(1)
+        seq = brd.simulate(ts_length=1000)
+        np.random.seed(1)
+        for t, a in enumerate(brd.simulate_iter(ts_length=1000)):
+            assert_array_equal(seq[t], a)
+
+
+def test_simulate_decimal_payoffs():
+    # Exact ties among decimal payoffs, such as 0.1 + 0.2 == 0.3, up to
+    # the order of the summation
+    n, N = 8, 9
+    for seed in [4, 5, 6, 21]:
+        payoff_matrix = np.round(
+            np.random.RandomState(seed).standard_normal((n, n)), 1
+        )
+        for brd in [BRD(payoff_matrix, N),
+                    KMR(payoff_matrix, N, epsilon=0.1),
+                    SamplingBRD(payoff_matrix, N, k=3)]:
+            np.random.seed(seed)
+            seq = brd.simulate(ts_length=300)
+            state = np.random.get_state()
+            np.random.seed(seed)
+            for t, a in enumerate(brd.simulate_iter(ts_length=300)):
+                assert_array_equal(seq[t], a)
+            assert_array_equal(np.random.get_state()[1], state[1])
+            eq_(np.random.get_state()[2], state[2])
+
+
+def test_simulate_baseline_trajectories():
+    # Best responses by argmax of the payoff vector, where
+    # 0.1 + 0.2 > 0.3 in floating point
+    brd = BRD([[0.3, 0.0], [0.1, 0.2]], 3)
+    brd.set_init_action_dist([2, 1])
+    brd.play(current_action=0)
+    assert_array_equal(brd.current_action_dist, [1, 2])
+    np.random.seed(0)
+    assert_array_equal(
+        brd.simulate(ts_length=6, init_action_dist=[2, 1]),
+        [[2, 1], [1, 2], [1, 2], [0, 3], [0, 3], [0, 3]]
+    )
+
+    payoff_matrix = [[0.4, 0.7, 0.0, 0.3],
+                     [0.1, 0.1, 0.2, 0.3],
+                     [0.4, 0.5, 0.4, 0.7],
+                     [0.2, 0.9, 0.0, 0.7]]
+    np.random.seed(3)
+    assert_array_equal(
+        KMR(payoff_matrix, 6, epsilon=0.2).simulate(
+            ts_length=8, init_action_dist=[1, 2, 2, 1]
+        ),
+        [[1, 2, 2, 1], [1, 1, 3, 1], [0, 1, 4, 1], [0, 1, 4, 1],
+         [0, 1, 4, 1], [1, 0, 4, 1], [0, 0, 4, 2], [0, 0, 4, 2]]
+    )
+    np.random.seed(4)
+    assert_array_equal(
+        SamplingBRD(payoff_matrix, 6, k=3).simulate(
+            ts_length=8, init_action_dist=[1, 2, 2, 1]
+        ),
+        [[1, 2, 2, 1], [1, 1, 3, 1], [1, 1, 4, 0], [1, 0, 5, 0],
+         [0, 0, 6, 0], [0, 0, 6, 0], [0, 0, 6, 0], [0, 0, 6, 0]]
+    )
+    np.random.seed(2)
+    assert_array_equal(
+        KMR(payoff_matrix, 5).replicate(T=20, num_reps=5),
+        [[0, 0, 5, 0], [0, 0, 5, 0], [1, 0, 3, 1], [1, 0, 4, 0],
+         [0, 1, 3, 1]]
+    )
+
+
+def test_replicate_timing():
+    # The distributions after T+1 revisions are returned
+    brd = BRD([[0, 1], [1, 0]], 2)
+    for vectorized in [False, True]:
+        assert_array_equal(
+            brd.replicate(T=0, num_reps=1, init_action_dist=[0, 2],
+                          vectorized=vectorized),
+            [[1, 1]]
+        )
+
+
+def test_replicate_vectorized():
+    payoff_matrix = [[4, 0, 1], [3, 2, 0], [0, 1, 3]]
+    N = 6
+    np.random.seed(0)
+    for brd in [BRD(payoff_matrix, N), KMR(payoff_matrix, N, epsilon=0.2),
+                SamplingBRD(payoff_matrix, N, k=2)]:
+        out = brd.replicate(T=10, num_reps=50, vectorized=True)
+        eq_(out.shape, (50, 3))
+        ok_((out >= 0).all())
+        ok_((out.sum(axis=1) == N).all())
+
+    # Rest point
+    brd = BRD(payoff_matrix, N)
+    assert_array_equal(
+        brd.replicate(T=10, num_reps=5, init_action_dist=[6, 0, 0],
+                      vectorized=True),
+        np.tile([6, 0, 0], (5, 1))
+    )
+
+
+def test_init_action_dists_uniform():
+    brd = BRD([[4, 0, 1], [3, 2, 0], [0, 1, 3]], N=3)
+    np.random.seed(0)
+    action_dists = brd._init_action_dists(10000)
+    ok_((action_dists.sum(axis=1) == 3).all())
+    _, counts = np.unique(action_dists, axis=0, return_counts=True)
+    eq_(len(counts), 10)  # Number of compositions of 3 into 3 parts
+    ok_((np.abs(counts - 1000) < 150).all())
+
+
+class TestMarkovChain:
+    '''Test the Markov chain methods of BRD and KMR'''
+
+    def setUp(self):
+        self.payoff_matrix = [[4, 0, 1], [3, 2, 0], [0, 1, 3]]
+        self.N = 5
+        self.brd = BRD(self.payoff_matrix, self.N)
+        self.kmr = KMR(self.payoff_matrix, self.N, epsilon=0.2)
+
+    def test_states(self):
+        states = self.brd.states()
+        eq_(states.shape, (21, 3))
+        ok_((states.sum(axis=1) == self.N).all())
+        eq_(len(np.unique(states, axis=0)), 21)
+        assert_array_equal(self.brd.state_index(states), np.arange(21))
+        assert_array_equal(self.brd.states([7]),
+                           [states[7]])
+
+    def test_transition_matrix(self):
+        P = self.kmr.transition_matrix()
+        assert_allclose(P.sum(axis=1), 1)
+        # From (5, 0, 0), a player playing 0 best responds to (4, 0, 0)
+        # with 0, and mutates to each action with probability 0.2/3
+        i, j = self.kmr.state_index([[5, 0, 0], [4, 1, 0]])
+        assert_allclose(P[i, i], 0.8 + 0.2/3)
+        assert_allclose(P[i, j], 0.2/3)
+
+    def test_stationary_distribution(self):
+        dist = self.kmr.stationary_distribution()
+        P = self.kmr.transition_matrix()
+        assert_allclose(dist.dot(P.toarray()), dist)
+        assert_allclose(dist.sum(), 1)
+
+    def test_stationary_distribution_birth_death(self):
+        kmr = KMR([[4, 0], [3, 2]], N=8, epsilon=0.1)
+        dist = kmr.stationary_distribution()
+        assert_allclose(dist.dot(kmr.transition_matrix().toarray()), dist)
+
+    @raises(ValueError)
+    def test_stationary_distribution_reducible(self):
+        self.brd.stationary_distribution()
+
+    def test_absorption_probabilities(self):
+        recurrent_classes, probs = self.brd.absorption_probabilities()
+        eq_([self.brd.states(c).tolist() for c in recurrent_classes],
+            [[[0, 0, 5]], [[0, 5, 0]], [[5, 0, 0]]])
+        assert_allclose(probs.sum(axis=1), 1)
+        # From (2, 2, 1): the revisers playing 0 switch to 1
+        i = self.brd.state_index([2, 2, 1])
+        assert_allclose(probs[i], [0, 0.6, 0.4])
+
+    def test_hitting_times(self):
+        conventions = [[5, 0, 0], [0, 5, 0], [0, 0, 5]]
+        times = self.brd.hitting_times(conventions)
+        eq_(times[self.brd.state_index([5, 0, 0])], 0)
+        ok_(np.isfinite(times).all())
+        # (0, 5, 0) is never left
+        times = self.brd.hitting_times([5, 0, 0])
+        eq_(times[self.brd.state_index([0, 5, 0])], np.inf)
+
+        # Ties are broken to the smallest action 0, so from (1, 1) the
+        # player playing 1 switches to 0 with probability 1/2 per step
+        brd = BRD([[1, 0], [0, 0]], N=2)
+        assert_allclose(brd.hitting_times([2, 0]), [3, 2, 0])
+
+
+def test_simulate_events():
+    payoff_matrix = [[4, 0, 1], [3, 2, 0], [0, 1, 3]]
+    kmr = KMR(payoff_matrix, N=5, epsilon=0.3)
+    ts_length = 100000
+    np.random.seed(0)
+    times, action_dists = kmr.simulate_events(ts_length)
+    eq_(times[0], 0)
+    ok_((np.diff(times) > 0).all())
+    ok_((action_dists.sum(axis=1) == 5).all())
+    ok_((np.abs(np.diff(action_dists, axis=0)).sum(axis=1) == 2).all())
+
+    # Occupation frequencies against the stationary distribution
+    action_dist_sequence = np.repeat(
+        action_dists, np.diff(np.append(times, ts_length)), axis=0
+    )
+    freqs = np.bincount(kmr.state_index(action_dist_sequence),
+                        minlength=21) / ts_length
+    assert_allclose(freqs, kmr.stationary_distribution(), atol=0.02)
+
+    # Rest point of BRD
+    brd = BRD(payoff_matrix, N=5)
+    times, action_dists = brd.simulate_events(100, init_action_dist=[5, 0, 0])
+    assert_array_equal(times, [0])
+    assert_array_equal(action_dists, [[5, 0, 0]])
+
+    # Empty simulation
+    times, action_dists = kmr.simulate_events(0)
+    eq_(times.shape, (0,))
+    eq_(action_dists.shape, (0, 3))
+
+
 # Invalid inputs #
 
 @raises(ValueError)
@@ -0,0 +1,98 @@
+"""
+Filename: test_game_generators.py
+
+Tests for game_generators.py
+
+"""
+from __future__ import division
+
+import numpy as np
+from numpy.testing import assert_array_equal, assert_allclose
+from nose.tools import eq_, ok_, raises
+
+from game_generators import (
+    random_game, random_games, covariance_game, payoff_buffer_size
+)
+
+
+def test_random_game():
+    nums_actions = (2, 3, 4)
+    g = random_game(nums_actions, random_state=0)
+    eq_(g.nums_actions, nums_actions)
+    for i, player in enumerate(g.players):
+        eq_(player.payoff_array.shape, nums_actions[i:] + nums_actions[:i])
+        ok_(player.payoff_array.flags.c_contiguous)
+        ok_(((player.payoff_array >= 0) & (player.payoff_array < 1)).all())
+
+    # Seeded
+    assert_array_equal(random_game(nums_actions, random_state=0)
+                       .payoff_profile_array, g.payoff_profile_array)
+
+
+def test_random_games():
+    nums_actions = (3, 2)
+    num_games = 5
+    out = np.empty(num_games * payoff_buffer_size(nums_actions))
+    games = random_games(nums_actions, num_games, random_state=0, out=out)
+    eq_(len(games), num_games)
+    assert_array_equal(games[0].payoff_profile_array,
+                       random_game(nums_actions, random_state=0)
+                       .payoff_profile_array)
+    for g in games:
+        for player in g.players:
+            ok_(np.shares_memory(player.payoff_array, out))
+
+
+def test_random_games_out_chunked():
+    nums_actions = (3, 4, 5)
+    num_games = 400  # More payoffs than in one block
+    out = np.empty(num_games * payoff_buffer_size(nums_actions))
+    random_games(nums_actions, num_games, random_state=0, out=out)
+    assert_array_equal(
+        out,
+        np.random.RandomState(0).random_sample(out.size)
+    )
+
+
+def test_covariance_game():
+    nums_actions = (20, 30, 40)
+    rho = 0.5
+    g = covariance_game(nums_actions, rho, random_state=0)
+    eq_(g.nums_actions, nums_actions)
+    payoff_profiles = g.payoff_profile_array.reshape(-1, 3)
+    cov = np.full((3, 3), rho)
+    np.fill_diagonal(cov, 1)
+    assert_allclose(np.cov(payoff_profiles, rowvar=False), cov, atol=0.05)
+
+
+def test_covariance_game_singular():
+    nums_actions = (4, 5)
+    g = covariance_game(nums_actions, 1, random_state=0)
+    assert_allclose(g.players[0].payoff_array, g.players[1].payoff_array.T)
+    g = covariance_game(nums_actions, -1, random_state=0)
+    assert_allclose(g.players[0].payoff_array, -g.players[1].payoff_array.T)
+
+
+@raises(ValueError)
+def test_covariance_game_invalid_rho():
+    covariance_game((2, 2, 2), -0.6)
+
+
+@raises(ValueError)
+def test_random_games_invalid_out():
+    random_games((2, 2), 3, out=np.empty(3))
+
+
+@raises(ValueError)
+def test_random_games_invalid_out_dtype():
+    random_games((2, 2), 3, out=np.empty(3*8, dtype=np.int8))
+
+
+if __name__ == '__main__':
+    import sys
+    import nose
+
+    argv = sys.argv[:]
+    argv.append('--verbose')
+    argv.append('--nocapture')
+    nose.main(argv=argv, defaultTest=__file__)
@@ -0,0 +1,119 @@
+"""
+Filename: test_game_storage.py
+
+Tests for game_storage.py
+
+"""
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import numpy as np
+from numpy.testing import assert_array_equal, assert_allclose
+from nose.tools import eq_, ok_, raises
+
+import normal_form_game
+from normal_form_game import Player, NormalFormGame
+from game_storage import save_game, load_game, read_header
+
+
+class TestSaveLoad_3p:
+    '''Test save_game and load_game with a 3-player game'''
+
+    def setUp(self):
+        '''Setup a 3-player game with players of different dtypes'''
+        random_state = np.random.RandomState(0)
+        payoff_arrays = [random_state.standard_normal((4, 3, 5)),
+                         random_state.randint(10, size=(3, 5, 4)),
+                         random_state.standard_normal((5, 4, 3))]
+        # Non C-contiguous payoff array
+        payoff_arrays[2] = np.asfortranarray(payoff_arrays[2])
+        self.g = NormalFormGame([Player(payoff_array)
+                                 for payoff_array in payoff_arrays])
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'game.nfg')
+        save_game(self.g, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_header(self):
+        header, data_offset = read_header(self.path)
+        eq_(header['N'], 3)
+        eq_(header['nums_actions'], [4, 3, 5])
+        eq_(data_offset % 64, 0)
+
+    def test_load_mmap(self):
+        g = load_game(self.path)
+        eq_(g.nums_actions, self.g.nums_actions)
+        for player, player_saved in zip(g.players, self.g.players):
+            ok_(normal_form_game._is_memmap(player.payoff_array))
+            eq_(player.payoff_array.dtype, player_saved.payoff_array.dtype)
+            assert_array_equal(player.payoff_array, player_saved.payoff_array)
+
+    def test_load_in_memory(self):
+        g = load_game(self.path, mmap_mode=None)
+        for player, player_saved in zip(g.players, self.g.players):
+            ok_(not normal_form_game._is_memmap(player.payoff_array))
+            assert_array_equal(player.payoff_array, player_saved.payoff_array)
+
+    def test_mmap_mode_r_plus(self):
+        g = load_game(self.path, mmap_mode='r+')
+        g[0, 0, 0] = 10, 20, 30
+        g.players[0].payoff_array.base.flush()
+        del g
+        eq_(load_game(self.path)[0, 0, 0], [10, 20, 30])
+
+    def test_payoff_vector_chunked(self):
+        g = load_game(self.path)
+        opponents_actions_list = [
+            (1, 2), ([1/3, 1/3, 1/3], 4), (2, [0, 1/2, 0, 1/2, 0]),
+            ([1/2, 0, 1/2], [1/5, 1/5, 1/5, 1/5, 1/5])
+        ]
+        chunk_nbytes = normal_form_game._MMAP_CHUNK_NBYTES
+        # Blocks of 2 rows of player 0's payoff array
+        normal_form_game._MMAP_CHUNK_NBYTES = 2 * 3 * 5 * 8
+        try:
+            for opponents_actions in opponents_actions_list:
+                assert_allclose(
+                    g.players[0].payoff_vector(opponents_actions),
+                    self.g.players[0].payoff_vector(opponents_actions)
+                )
+        finally:
+            normal_form_game._MMAP_CHUNK_NBYTES = chunk_nbytes
+
+
+def test_save_load_2p():
+    g = NormalFormGame([[4, 0], [3, 2]])
+    path = os.path.join(tempfile.mkdtemp(), 'game.nfg')
+    try:
+        save_game(g, path)
+        g_loaded = load_game(path)
+        assert_array_equal(g_loaded.payoff_profile_array,
+                           g.payoff_profile_array)
+        eq_(g_loaded.players[0].best_response([1/2, 1/2]), 1)
+        eq_(g_loaded.players[0].payoff_vector(1).tolist(), [0, 2])
+    finally:
+        shutil.rmtree(os.path.dirname(path))
+
+
+@raises(ValueError)
+def test_load_invalid_file():
+    path = os.path.join(tempfile.mkdtemp(), 'game.nfg')
+    try:
+        with open(path, 'wb') as f:
+            f.write(b'not a game')
+        load_game(path)
+    finally:
+        shutil.rmtree(os.path.dirname(path))
+
+
+if __name__ == '__main__':
+    import sys
+    import nose
+
+    argv = sys.argv[:]
+    argv.append('--verbose')
+    argv.append('--nocapture')
+    nose.main(argv=argv, defaultTest=__file__)
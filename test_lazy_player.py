@@ -0,0 +1,181 @@
+"""
+Filename: test_lazy_player.py
+
+Tests for lazy_player.py
+
+"""
+from __future__ import division
+
+import numpy as np
+from numpy.testing import assert_array_equal, assert_allclose
+from nose.tools import eq_, ok_, raises, assert_raises
+
+from normal_form_game import Player, NormalFormGame
+from lazy_player import LazyPlayer
+
+
+class TestLazyPlayer_2opponents:
+    '''Test LazyPlayer against Player with the same payoff array'''
+
+    def setUp(self):
+        '''Setup a LazyPlayer and a Player'''
+        self.payoff_array = \
+            np.random.RandomState(0).standard_normal((4, 3, 5))
+
+        def payoff_function(a0, a1, a2):
+            return self.payoff_array[a0, a1, a2]
+
+        self.lazy_player = LazyPlayer(payoff_function,
+                                      self.payoff_array.shape,
+                                      memory_budget=4*5*8)
+        self.player = Player(self.payoff_array)
+        self.opponents_actions_list = [
+            (1, 2), ([1/3, 1/3, 1/3], 4), (2, [0, 1/2, 0, 1/2, 0]),
+            ([1/2, 0, 1/2], [1/5, 1/5, 1/5, 1/5, 1/5])
+        ]
+
+    def test_payoff_vector(self):
+        for opponents_actions in self.opponents_actions_list:
+            assert_allclose(self.lazy_player.payoff_vector(opponents_actions),
+                            self.player.payoff_vector(opponents_actions))
+
+    def test_best_response(self):
+        for opponents_actions in self.opponents_actions_list:
+            eq_(self.lazy_player.best_response(opponents_actions),
+                self.player.best_response(opponents_actions))
+
+    def test_payoff_vectors(self):
+        opponents_actions_batch = ([0, 2], [[0, 1, 0, 0, 0], [1, 0, 0, 0, 0]])
+        assert_allclose(
+            self.lazy_player.payoff_vectors(opponents_actions_batch),
+            self.player.payoff_vectors(opponents_actions_batch)
+        )
+
+    def test_payoff_vectors_single_evaluation(self):
+        num_calls = []
+
+        def payoff_function(a0, a1, a2):
+            num_calls.append(1)
+            return self.payoff_array[a0, a1, a2]
+
+        lazy_player = LazyPlayer(payoff_function, self.payoff_array.shape)
+        random_state = np.random.RandomState(0)
+        for opponents_actions_batch in [
+                ([0, 2, 1], [4, 0, 3]),
+                (random_state.dirichlet(np.ones(3), 3), [4, 0, 3]),
+                (random_state.dirichlet(np.ones(3), 3),
+                 random_state.dirichlet(np.ones(5), 3))]:
+            del num_calls[:]
+            assert_allclose(
+                lazy_player.payoff_vectors(opponents_actions_batch),
+                self.player.payoff_vectors(opponents_actions_batch)
+            )
+            eq_(len(num_calls), 1)
+
+    def test_out_of_range_actions(self):
+        # Negative actions are counted from the end as by Player
+        assert_allclose(self.lazy_player.payoff_vector((-1, -5)),
+                        self.player.payoff_vector((-1, -5)))
+        for opponents_actions in [(3, 0), (0, 7), (-4, 0)]:
+            assert_raises(IndexError, self.lazy_player.payoff_vector,
+                          opponents_actions)
+            assert_raises(IndexError, self.player.payoff_vector,
+                          opponents_actions)
+        assert_raises(IndexError, self.lazy_player.payoff_vectors,
+                      ([0, 2], [4, 7]))
+
+    def test_payoff_vectors_invalid_batch(self):
+        for opponents_actions_batch in [
+                ([0, 2], [4, 0, 3]),  # Batch sizes differ
+                ([0, 2], [[0, 1, 0], [1, 0, 0]]),  # Wrong mixed length
+                ([0, 2],),  # Wrong number of opponents
+                ([0., 2.], [4, 0])]:  # Non-integer pure actions
+            assert_raises(ValueError, self.lazy_player.payoff_vectors,
+                          opponents_actions_batch)
+
+    def test_tol(self):
+        eq_(self.lazy_player.tol, self.player.tol)
+
+    def test_cache_within_memory_budget(self):
+        for opponents_actions in self.opponents_actions_list:
+            self.lazy_player.payoff_vector(opponents_actions)
+            ok_(self.lazy_player._cache_nbytes <=
+                self.lazy_player.memory_budget)
+        self.lazy_player.clear_cache()
+        eq_(self.lazy_player._cache_nbytes, 0)
+
+    @raises(MemoryError)
+    def test_payoff_array_exceeds_memory_budget(self):
+        self.lazy_player.payoff_array
+
+
+def test_lazy_player_payoff_array():
+    def payoff_function(a0, a1):
+        return a0 * 10 + a1
+
+    player = LazyPlayer(payoff_function, (2, 3))
+    assert_array_equal(player.payoff_array, [[0, 1, 2], [10, 11, 12]])
+
+
+def test_lazy_player_best_response_table():
+    num_calls = []
+
+    def payoff_function(a0, a1, a2):
+        num_calls.append(1)
+        return (a0 * a1 + a2) % 3
+
+    nums_actions = (4, 3, 5)
+    lazy_player = LazyPlayer(payoff_function, nums_actions)
+    player = Player(lazy_player.payoff_array)
+    lazy_player.precompute_best_response_table()
+    del num_calls[:]
+    for opponents_actions in [(0, 0), (1, 2), (2, 4), (-1, -1)]:
+        eq_(lazy_player.best_response(opponents_actions),
+            player.best_response(opponents_actions))
+        assert_array_equal(
+            lazy_player.best_response(opponents_actions,
+                                      tie_breaking=False),
+            player.best_response(opponents_actions, tie_breaking=False)
+        )
+        eq_(lazy_player.is_best_response(0, opponents_actions),
+            player.is_best_response(0, opponents_actions))
+    # Answered by the table without evaluating the payoff function
+    eq_(len(num_calls), 0)
+
+    lazy_player.clear_best_response_table()
+    eq_(lazy_player.best_response((1, 2)), player.best_response((1, 2)))
+    ok_(len(num_calls) > 0)
+
+
+def test_lazy_player_large():
+    n = 3000
+
+    def payoff_function(a0, a1, a2):
+        return a0 - np.abs(a0 - a1) - a2
+
+    player = LazyPlayer(payoff_function, (n, n, n), memory_budget=2**20)
+    eq_(player.best_response((3, 1)), 3)
+    opponent_mixed_action = np.zeros(n)
+    opponent_mixed_action[[0, 1]] = 1/2
+    eq_(player.best_response((5, opponent_mixed_action)), 5)
+
+
+def test_normalformgame_with_lazy_players():
+    def payoff_function(a0, a1, a2):
+        return -(a0 - (a1 + a2) / 2)**2
+
+    g = NormalFormGame([LazyPlayer(payoff_function, (5, 5, 5))
+                        for i in range(3)])
+    eq_(g.nums_actions, (5, 5, 5))
+    ok_(g.is_nash((2, 2, 2)))
+    ok_(not g.is_nash((0, 2, 4)))
+
+
+if __name__ == '__main__':
+    import sys
+    import nose
+
+    argv = sys.argv[:]
+    argv.append('--verbose')
+    argv.append('--nocapture')
+    nose.main(argv=argv, defaultTest=__file__)
@@ -0,0 +1,86 @@
+"""
+Filename: test_lemke_howson.py
+
+Tests for lemke_howson.py
+
+"""
+from __future__ import division
+
+import numpy as np
+from numpy.testing import assert_allclose
+from nose.tools import eq_, ok_, raises
+
+from normal_form_game import Player, NormalFormGame
+from lemke_howson import lemke_howson, lemke_howson_all
+
+
+class TestLemkeHowson:
+    '''Test lemke_howson and lemke_howson_all'''
+
+    def setUp(self):
+        '''Setup a game and its Nash equilibria'''
+        # From von Stengel 2007 in Algorithmic Game Theory
+        A = [[3, 3],
+             [2, 5],
+             [0, 6]]
+        B = [[3, 2, 3],
+             [2, 6, 1]]
+        self.g = NormalFormGame((Player(A), Player(B)))
+        self.NEs_by_init_pivot = {
+            0: ([1, 0, 0], [1, 0]),
+            1: ([0, 1/3, 2/3], [1/3, 2/3])
+        }
+
+    def test_lemke_howson(self):
+        for init_pivot, NE in self.NEs_by_init_pivot.items():
+            NE_computed = lemke_howson(self.g, init_pivot=init_pivot)
+            for action_computed, action in zip(NE_computed, NE):
+                assert_allclose(action_computed, action)
+
+    def test_lemke_howson_full_output(self):
+        NE, converged, num_iter = \
+            lemke_howson(self.g, init_pivot=1, full_output=True)
+        ok_(converged)
+        eq_(num_iter, 4)
+
+        NE, converged, num_iter = \
+            lemke_howson(self.g, init_pivot=1, max_iter=2, full_output=True)
+        ok_(not converged)
+
+    def test_lemke_howson_all(self):
+        NEs_computed = lemke_howson_all(self.g, num_threads=2)
+        eq_(len(NEs_computed), 2)
+        for NE_computed, NE in zip(NEs_computed,
+                                   [self.NEs_by_init_pivot[0],
+                                    self.NEs_by_init_pivot[1]]):
+            for action_computed, action in zip(NE_computed, NE):
+                assert_allclose(action_computed, action)
+
+
+def test_lemke_howson_random_game_is_nash():
+    payoffs = np.random.RandomState(0).standard_normal((8, 6, 2))
+    g = NormalFormGame(payoffs)
+    for NE in lemke_howson_all(g):
+        ok_(g.is_nash(NE))
+
+
+# Invalid inputs #
+
+@raises(ValueError)
+def test_lemke_howson_invalid_g():
+    lemke_howson(NormalFormGame((2, 2, 2)))
+
+
+@raises(ValueError)
+def test_lemke_howson_invalid_init_pivot():
+    lemke_howson(NormalFormGame((2, 2)), init_pivot=4)
+
+
+if __name__ == '__main__':
+    import sys
+    import nose
+
+    argv = sys.argv[:]
+    argv.append('--verbose')
+    argv.append('--nocapture')
+    nose.main(argv=argv, defaultTest=__file__)
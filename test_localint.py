@@ -75,6 +75,35 @@ class TestLocalInteraction:
             )
 
 
+def test_play_random_tie_breaking_random_state():
+    # Circle network where players 1 and 4 face a tie
+    adj_matrix = [[0, 1, 0, 0, 1],
+                  [1, 0, 1, 0, 0],
+                  [0, 1, 0, 1, 0],
+                  [0, 0, 1, 0, 1],
+                  [1, 0, 0, 1, 0]]
+    payoff_matrix = [[1, 0],
+                     [0, 1]]
+    li = LocalInteraction(payoff_matrix, adj_matrix)
+    li.tie_breaking = 'random'
+    init_actions = [1, 0, 0, 0, 0]
+
+    # Players revising one by one, drawing only at ties
+    np.random.seed(0)
+    opponent_act_dists = \
+        np.asarray(adj_matrix).dot(np.eye(2, dtype=int)[init_actions])
+    expected = [li.players[i].best_response(opponent_act_dists[i],
+                                            tie_breaking='random')
+                for i in range(5)]
+    x = np.random.random()
+
+    np.random.seed(0)
+    li.set_init_actions(init_actions)
+    li.play()
+    assert_array_equal(li.current_actions, expected)
+    eq_(np.random.random(), x)
+
+
 # Invalid inputs #
 
 @raises(ValueError)
@@ -57,6 +57,12 @@ class TestLogitDynamics:
              [1, 1]]
         )
 
+    def test_stationary_distribution(self):
+        # 0.981367209 = prob that the stationary distribution assigns to [1, 1]
+        stationary_dist = self.ld.stationary_distribution()
+        ok_(np.abs(stationary_dist[1, 1]-0.981367209) < 1e-8)
+        ok_(np.abs(stationary_dist.sum()-1) < 1e-12)
+
     def test_simulate_lln(self):
         n = 100
         T = 1000
@@ -89,6 +95,17 @@ def test_set_choice_probs_with_asymmetric_payoff_matrix():
     assert_array_almost_equal_nulp(cdfs_computed, cdfs)
 
 
+def test_logitdyn_dtype():
+    bimatrix = np.array([[(4, 4), (1, 1), (0, 3)],
+                         [(3, 0), (1, 1), (2, 2)]])
+    g = NormalFormGame(bimatrix, dtype=np.float32)
+    ld = LogitDynamics(g)
+    for player in ld.players:
+        eq_(player.logit_choice_cdfs.dtype, np.float32)
+    # Payoff arrays are left intact
+    assert_array_equal(g.payoff_profile_array, bimatrix)
+
+
 if __name__ == '__main__':
     import sys
     import nose
@@ -8,11 +8,12 @@ Tests for normal_form_game.py
 from __future__ import division
 
 import numpy as np
-from numpy.testing import assert_array_equal
-from nose.tools import eq_, ok_, raises
+from numpy.testing import assert_array_equal, assert_allclose
+from nose.tools import eq_, ok_, raises, assert_raises
 
 from normal_form_game import (
-    Player, NormalFormGame, pure2mixed, best_response_2p
+    Player, NormalFormGame, pure2mixed, best_response_2p,
+    payoff_vector_np, best_response_np
 )
 
 
@@ -64,9 +65,69 @@ class TestPlayer_1opponent:
     def test_is_best_response_against_pure(self):
         ok_(self.player.is_best_response(0, 0))
 
+    def test_payoff_vectors_against_pure(self):
+        assert_array_equal(self.player.payoff_vectors([0, 1, 1]),
+                           [[4, 3], [0, 2], [0, 2]])
+
+    def test_payoff_vectors_against_mixed(self):
+        assert_array_equal(
+            self.player.payoff_vectors([[1/2, 1/2], [1, 0]]),
+            [[2, 5/2], [4, 3]]
+        )
+
     def test_is_best_response_against_mixed(self):
         ok_(self.player.is_best_response([1/2, 1/2], [2/3, 1/3]))
 
+    def test_best_responses_with_smallest_tie_breaking(self):
+        assert_array_equal(
+            self.player.best_responses([[1, 0], [2/3, 1/3], [0, 1]]),
+            [0, 0, 1]
+        )
+
+    def test_best_responses_with_random_tie_breaking(self):
+        opponents_actions_batch = [[1, 0], [2/3, 1/3], [0, 1]]
+        brs = self.player.best_responses(opponents_actions_batch,
+                                         tie_breaking='random')
+        eq_(brs[0], 0)
+        ok_(brs[1] in [0, 1])
+        eq_(brs[2], 1)
+
+        seed = 1234
+        brs0 = self.player.best_responses(opponents_actions_batch,
+                                          tie_breaking='random',
+                                          random_state=seed)
+        brs1 = self.player.best_responses(opponents_actions_batch,
+                                          tie_breaking='random',
+                                          random_state=seed)
+        assert_array_equal(brs0, brs1)
+
+    def test_best_responses_list_when_tie(self):
+        """best_responses with tie_breaking=False"""
+        indices, indptr = self.player.best_responses(
+            [[1, 0], [2/3, 1/3], [0, 1]], tie_breaking=False
+        )
+        assert_array_equal(indptr, [0, 1, 3, 4])
+        assert_array_equal(indices, [0, 0, 1, 1])
+
+    def test_best_responses_with_payoff_perturbations(self):
+        assert_array_equal(
+            self.player.best_responses([[2/3, 1/3], [2/3, 1/3]],
+                                       payoff_perturbations=[[0, 0.1],
+                                                             [0.1, 0]]),
+            [1, 0]
+        )
+
+    def test_is_best_responses(self):
+        assert_array_equal(
+            self.player.is_best_responses([0, 1, 0], [0, 0, 1]),
+            [True, False, False]
+        )
+        assert_array_equal(
+            self.player.is_best_responses([[1/2, 1/2], [0, 1]],
+                                          [[2/3, 1/3], [1/2, 1/2]]),
+            [True, True]
+        )
+
 
 class TestPlayer_2opponents:
     """Test the methods of Player with two opponent players"""
@@ -82,6 +143,25 @@ class TestPlayer_2opponents:
     def test_payoff_vector_against_pure(self):
         assert_array_equal(self.player.payoff_vector((0, 1)), [6, 0])
 
+    def test_payoff_vectors_against_pure_and_mixed(self):
+        opponents_actions_batch = ([0, 1, 0], [[0, 1], [1/2, 1/2], [1, 0]])
+        payoff_vectors = self.player.payoff_vectors(opponents_actions_batch)
+        for b, payoff_vector in enumerate(payoff_vectors):
+            opponents_actions = (opponents_actions_batch[0][b],
+                                 opponents_actions_batch[1][b])
+            assert_array_equal(payoff_vector,
+                               self.player.payoff_vector(opponents_actions))
+
+    @raises(ValueError)
+    def test_payoff_vectors_inconsistent_batch_sizes(self):
+        self.player.payoff_vectors(([0, 1], [0, 1, 1]))
+
+    def test_payoff_vector_against_mixed(self):
+        assert_array_equal(self.player.payoff_vector(([1/2, 1/2], 1)),
+                           [4, 7/2])
+        assert_array_equal(self.player.payoff_vector((0, [1/2, 1/2])),
+                           [9/2, 1/2])
+
     def test_is_best_response_against_pure(self):
         ok_(not self.player.is_best_response(0, (1, 0)))
 
@@ -130,6 +210,31 @@ class TestNormalFormGame_Sym2p:
     def test_is_nash_mixed(self):
         ok_(self.g.is_nash(([2/3, 1/3], [2/3, 1/3])))
 
+    def test_pure_nash_equilibria(self):
+        eq_(self.g.pure_nash_equilibria(), [(0, 0), (1, 1)])
+
+    def test_regrets(self):
+        assert_allclose(
+            self.g.regrets(([0, 1, 0], [[2/3, 1/3], [2/3, 1/3], [1, 0]])),
+            [[0, 1/3], [0, 4/3], [0, 0]]
+        )
+
+    def test_is_nash_batch(self):
+        assert_array_equal(
+            self.g.is_nash_batch(([0, 0, 1], [0, 1, 1])),
+            [True, False, True]
+        )
+        assert_array_equal(
+            self.g.is_nash_batch(([[2/3, 1/3], [1/2, 1/2]],
+                                  [[2/3, 1/3], [1/2, 1/2]])),
+            [True, False]
+        )
+        # Regret of 1/2 at the profile of [1/2, 1/2]
+        assert_array_equal(
+            self.g.is_nash_batch(([[1/2, 1/2]], [[1/2, 1/2]]), epsilon=1/2),
+            [True]
+        )
+
 
 class TestNormalFormGame_Asym2p:
     """Test the methods of NormalFormGame with asymmetric two players"""
@@ -149,6 +254,9 @@ class TestNormalFormGame_Asym2p:
     def test_is_nash_against_mixed(self):
         ok_(self.g.is_nash(([1/2, 1/2], [1/2, 1/2])))
 
+    def test_pure_nash_equilibria(self):
+        eq_(self.g.pure_nash_equilibria(), [])
+
 
 class TestNormalFormGame_3p:
     """Test the methods of NormalFormGame with three players"""
@@ -173,6 +281,75 @@ class TestNormalFormGame_3p:
         p = (1 + np.sqrt(65)) / 16
         ok_(self.g.is_nash(([1 - p, p], [1 - p, p], [1 - p, p])))
 
+    def test_pure_nash_equilibria(self):
+        eq_(self.g.pure_nash_equilibria(), [(0, 0, 0), (1, 1, 1)])
+
+    def test_is_nash_batch(self):
+        p = (1 + np.sqrt(65)) / 16
+        x = [[1 - p, p], [1 - p, p]]
+        assert_array_equal(
+            self.g.is_nash_batch(([0, 0], [0, 1], x)),
+            [self.g.is_nash((0, 0, [1 - p, p])),
+             self.g.is_nash((0, 1, [1 - p, p]))]
+        )
+        assert_array_equal(self.g.is_nash_batch((x, x, x)), [True, True])
+
+    def test_pure_nash_equilibria_chunked(self):
+        eq_(list(self.g.pure_nash_equilibria_iter(chunk_size=1)),
+            [(0, 0, 0), (1, 1, 1)])
+
+
+def test_best_response_random_tie_breaking_same_draw():
+    # Random tie-breaking draws the same as for N=2 and by random_choice
+    player_2p = Player(np.zeros((4, 2)))
+    player_3p = Player(np.zeros((4, 2, 2)))
+    for seed in range(5):
+        br = np.random.RandomState(seed).randint(4)
+        eq_(player_2p.best_response(0, tie_breaking='random',
+                                    random_state=seed), br)
+        eq_(player_3p.best_response((0, 1), tie_breaking='random',
+                                    random_state=seed), br)
+
+
+def test_payoff_vector_contraction_plan():
+    # Large enough to be contracted by the plan
+    nums_actions = (4, 10, 8, 7)
+    payoff_array = np.random.RandomState(0).random_sample(nums_actions)
+    player = Player(payoff_array)
+    x1, x2, x3 = [np.ones(n)/n for n in nums_actions[1:]]
+    payoff_vector_expected = payoff_array.dot(x3).dot(x2).dot(x1)
+
+    payoff_vector0 = player.payoff_vector((x1, x2, x3))
+    payoff_vector1 = player.payoff_vector((x1, x2, x3))
+    assert_allclose(payoff_vector0, payoff_vector_expected)
+    assert_allclose(payoff_vector1, payoff_vector_expected)
+    # Returned arrays must not share memory
+    ok_(payoff_vector0 is not payoff_vector1)
+    payoff_vector0 += 1
+    assert_allclose(player.payoff_vector((x1, x2, x3)),
+                    payoff_vector_expected)
+
+    assert_allclose(player.payoff_vector((x1, 4, x3)),
+                    payoff_array[:, :, 4, :].dot(x3).dot(x1))
+
+
+def test_payoff_vector_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    nums_actions = (3, 20, 30, 40)
+    random_state = np.random.RandomState(0)
+    player = Player(random_state.random_sample(nums_actions))
+    opponents_actions_list = [
+        tuple(random_state.dirichlet(np.ones(n)) for n in nums_actions[1:])
+        for _ in range(50)
+    ]
+    expected = [player.payoff_vector(actions)
+                for actions in opponents_actions_list]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(player.payoff_vector,
+                                    opponents_actions_list))
+    for payoff_vector, payoff_vector_expected in zip(results, expected):
+        assert_array_equal(payoff_vector, payoff_vector_expected)
+
 
 def test_normalformgame_input_action_sizes():
     g = NormalFormGame((2, 3, 4))
@@ -217,6 +394,22 @@ def test_normalformgame_constant_payoffs():
     ok_(g.is_nash((0, 1)))
     ok_(g.is_nash((1, 0)))
     ok_(g.is_nash((1, 1)))
+    eq_(g.pure_nash_equilibria(), [(0, 0), (0, 1), (1, 0), (1, 1)])
+
+
+def test_pure_nash_equilibria_brute_force():
+    nums_actions = (3, 2, 4)
+    random_state = np.random.RandomState(0)
+    g = NormalFormGame(
+        random_state.randint(3, size=nums_actions+(len(nums_actions),))
+    )
+    NEs_expected = [
+        (a0, a1, a2)
+        for a0 in range(3) for a1 in range(2) for a2 in range(4)
+        if g.is_nash((a0, a1, a2))
+    ]
+    eq_(g.pure_nash_equilibria(), NEs_expected)
+    eq_(g.pure_nash_equilibria(chunk_size=2), NEs_expected)
 
 
 def test_normalformgame_payoff_profile_array():
@@ -234,6 +427,313 @@ def test_normalformgame_payoff_profile_array():
             assert_array_equal(player_new.payoff_array, payoff_array)
 
 
+def test_normalformgame_payoff_profile_array_cache():
+    g = NormalFormGame((2, 3, 2))
+    payoff_profile_array = g.payoff_profile_array
+    ok_(not payoff_profile_array.flags.writeable)
+
+    g[1, 2, 0] = 1, 2, 3
+    assert_array_equal(g.payoff_profile_array[1, 2, 0], [1, 2, 3])
+    # Views of the cache reflect the update
+    assert_array_equal(payoff_profile_array[1, 2, 0], [1, 2, 3])
+
+    # Replacing a player's payoff array invalidates the cache
+    g.players[1].payoff_array = np.ones((3, 2, 2))
+    assert_array_equal(g.payoff_profile_array[..., 1], np.ones((2, 3, 2)))
+
+    # In-place modification followed by clear_payoff_profile_array
+    g.players[0].payoff_array[0, 0, 0] = 5
+    g.clear_payoff_profile_array()
+    eq_(g.payoff_profile_array[0, 0, 0, 0], 5)
+
+
+def test_normalformgame_payoff_profile_array_cache_shared():
+    # The players share one payoff array
+    g = NormalFormGame([[4., 0], [3, 2]])
+    g.payoff_profile_array
+    g[0, 1] = 10, 20
+    assert_array_equal(g[1, 0], [20, 10])
+    assert_array_equal(g.payoff_profile_array[1, 0], [20, 10])
+    assert_array_equal(g.payoff_profile_array[0, 1], [10, 20])
+
+    g.set_payoffs([[1, 1]], [[5, 5]])
+    assert_array_equal(g.payoff_profile_array,
+                       NormalFormGame(g.players[0].payoff_array.copy())
+                       .payoff_profile_array)
+
+
+def test_normalformgame_get_set_payoffs():
+    nums_actions = (2, 3, 4)
+    random_state = np.random.RandomState(0)
+    payoff_profile_array = random_state.randint(10, size=nums_actions+(3,))
+    g = NormalFormGame(payoff_profile_array)
+    action_profiles = np.array([(0, 0, 0), (1, 2, 3), (0, 1, 2)])
+
+    assert_array_equal(
+        g.get_payoffs(action_profiles),
+        [g[tuple(action_profile)] for action_profile in action_profiles]
+    )
+
+    g_new = NormalFormGame(nums_actions)
+    g_new.payoff_profile_array  # Cache to be updated by set_payoffs
+    g_new.set_payoffs(action_profiles, g.get_payoffs(action_profiles))
+    for action_profile in action_profiles:
+        eq_(g_new[tuple(action_profile)], g[tuple(action_profile)])
+    assert_array_equal(g_new.payoff_profile_array[tuple(action_profiles.T)],
+                       g.get_payoffs(action_profiles))
+
+
+def test_normalformgame_from_payoff_table():
+    nums_actions = (2, 3, 4)
+    random_state = np.random.RandomState(0)
+    payoff_profile_array = random_state.randint(10, size=nums_actions+(3,))
+    action_profiles = np.indices(nums_actions).reshape(3, -1).T
+    payoff_profiles = payoff_profile_array.reshape(-1, 3)
+    g = NormalFormGame.from_payoff_table(nums_actions, action_profiles,
+                                         payoff_profiles)
+    assert_array_equal(g.payoff_profile_array, payoff_profile_array)
+    for player in g.players:
+        eq_(player.payoff_array.dtype, payoff_profiles.dtype)
+
+    payoff_profiles = payoff_profiles.astype(np.int8)
+    g = NormalFormGame.from_payoff_table(nums_actions, action_profiles,
+                                         payoff_profiles, dtype=np.float32)
+    assert_array_equal(g.payoff_profile_array, payoff_profile_array)
+    for player in g.players:
+        eq_(player.payoff_array.dtype, np.float32)
+
+
+@raises(ValueError)
+def test_normalformgame_set_payoffs_invalid_shape():
+    g = NormalFormGame((2, 2))
+    g.set_payoffs([(0, 0), (1, 1)], [(1, 1)])
+
+
+def test_player_dtype_float32():
+    payoff_array = np.random.RandomState(0).standard_normal((4, 3, 5))
+    player = Player(payoff_array, dtype=np.float32)
+    eq_(player.payoff_array.dtype, np.float32)
+    ok_(player.tol > 1e-8)
+
+    opponents_actions_list = [
+        (1, 2), ([1/3, 1/3, 1/3], 4), ([1/2, 0, 1/2], [1/5]*5)
+    ]
+    for opponents_actions in opponents_actions_list:
+        payoff_vector = player.payoff_vector(opponents_actions)
+        eq_(payoff_vector.dtype, np.float32)
+        assert_allclose(payoff_vector,
+                        Player(payoff_array).payoff_vector(opponents_actions),
+                        rtol=1e-5, atol=1e-6)
+
+    payoff_vectors = player.payoff_vectors(([1, 2], np.eye(5)[[0, 3]]))
+    eq_(payoff_vectors.dtype, np.float32)
+
+
+def test_player_dtype_tie_detection():
+    # Exact ties that are broken by rounding errors in single precision
+    payoff_matrix = np.array([[0.1, 0.2, 0.3],
+                              [0.3, 0.2, 0.1],
+                              [0.2, 0.2, 0.2]])
+    for dtype in [np.float16, np.float32]:
+        player = Player(payoff_matrix, dtype=dtype)
+        assert_array_equal(player.best_response([1/3, 1/3, 1/3],
+                                                tie_breaking=False),
+                           [0, 1, 2])
+
+
+def test_player_dtype_int16():
+    player = Player([[3, 1], [0, 2]], dtype=np.int16)
+    eq_(player.payoff_vector(1).dtype, np.int16)
+    eq_(player.payoff_vector([1/2, 1/2]).dtype, np.float32)
+    eq_(player.tol, Player(np.zeros((2, 2), dtype=np.float32)).tol)
+
+
+def test_normalformgame_dtype():
+    g = NormalFormGame((2, 3, 4), dtype=np.float32)
+    for player in g.players:
+        eq_(player.payoff_array.dtype, np.float32)
+    g[0, 0, 0] = 1, 2, 3
+    eq_(g.payoff_profile_array.dtype, np.float32)
+
+    g = NormalFormGame([[4, 0], [3, 2]], dtype=np.int8)
+    for player in g.players:
+        eq_(player.payoff_array.dtype, np.int8)
+
+    g = NormalFormGame(g.players, dtype=np.float32)
+    for player in g.players:
+        eq_(player.payoff_array.dtype, np.float32)
+
+
+def test_normalformgame_eliminate_dominated_iterated():
+    bimatrix = [[(1, 0), (1, 2), (0, 1)],
+                [(0, 3), (0, 1), (2, 0)]]
+    g = NormalFormGame(bimatrix)
+    for mixed in [False, True]:
+        g_reduced, actions = g.eliminate_dominated(mixed=mixed)
+        eq_(g_reduced.nums_actions, (1, 1))
+        assert_array_equal(actions[0], [0])
+        assert_array_equal(actions[1], [1])
+        eq_(g_reduced[0, 0], [1, 2])
+
+
+def test_normalformgame_eliminate_dominated_int8():
+    g = NormalFormGame([Player(np.array([[100, 100], [-100, -100]],
+                                        dtype=np.int8)),
+                        Player(np.zeros((2, 2), dtype=np.int8))])
+    g_reduced, actions = g.eliminate_dominated()
+    assert_array_equal(actions[0], [0])
+    eq_(g_reduced.nums_actions, (1, 2))
+
+
+def test_normalformgame_regrets_int8():
+    g = NormalFormGame([Player(np.array([[100, 100], [-100, -100]],
+                                        dtype=np.int8)),
+                        Player(np.zeros((2, 2), dtype=np.int8))])
+    assert_array_equal(g.regrets(([1], [0])), [[200, 0]])
+    assert_array_equal(g.is_nash_batch(([1], [0])), [g.is_nash((1, 0))])
+
+
+def test_normalformgame_eliminate_dominated_mixed():
+    # Action 2 of player 0 is dominated by the mixture of actions 0 and 1
+    payoff_arrays = [np.array([[3, 0], [0, 3], [1, 1]]), np.zeros((2, 3))]
+    g = NormalFormGame([Player(payoff_array)
+                        for payoff_array in payoff_arrays])
+
+    g_reduced, actions = g.eliminate_dominated()
+    eq_(g_reduced.nums_actions, (3, 2))
+
+    g_reduced, actions = g.eliminate_dominated(mixed=True)
+    eq_(g_reduced.nums_actions, (2, 2))
+    assert_array_equal(actions[0], [0, 1])
+    assert_array_equal(g_reduced.players[0].payoff_array, [[3, 0], [0, 3]])
+    assert_array_equal(g_reduced.players[1].payoff_array, np.zeros((2, 2)))
+
+
+def test_normalformgame_eliminate_dominated_preserves_nash():
+    # Games where some actions are eliminated by pure and mixed
+    # dominance, respectively
+    games = [
+        NormalFormGame(np.random.RandomState(246).standard_normal(
+            (5, 4, 3, 3)).round(1)),
+        NormalFormGame(np.random.RandomState(7).randint(6, size=(4, 3, 3, 3)))
+    ]
+    nums_actions_reduced = [((5, 3, 3), (5, 3, 3)), ((4, 3, 3), (3, 3, 3))]
+    for g, nums_actions in zip(games, nums_actions_reduced):
+        for mixed in [False, True]:
+            g_reduced, actions = g.eliminate_dominated(mixed=mixed)
+            eq_(g_reduced.nums_actions, nums_actions[mixed])
+            NEs = [tuple(int(actions[i][a]) for i, a in enumerate(NE))
+                   for NE in g_reduced.pure_nash_equilibria()]
+            eq_(NEs, g.pure_nash_equilibria())
+
+
+def test_player_best_response_table():
+    payoff_array = np.random.RandomState(0).randint(3, size=(4, 3, 5))
+    player = Player(payoff_array)
+    player_table = Player(payoff_array)
+    player_table.precompute_best_response_table()
+
+    for opponents_actions in [(0, 0), (1, 2), (2, 4), (-1, -1)]:
+        eq_(player_table.best_response(opponents_actions),
+            player.best_response(opponents_actions))
+        assert_array_equal(
+            player_table.best_response(opponents_actions,
+                                       tie_breaking=False),
+            player.best_response(opponents_actions, tie_breaking=False)
+        )
+        ok_(player_table.best_response(opponents_actions,
+                                       tie_breaking='random') in
+            player.best_response(opponents_actions, tie_breaking=False))
+        for own_action in [0, 3, [1/4]*4]:
+            eq_(player_table.is_best_response(own_action, opponents_actions),
+                player.is_best_response(own_action, opponents_actions))
+
+    # Mixed actions are not looked up
+    eq_(player_table.best_response(([1/3]*3, 2)),
+        player.best_response(([1/3]*3, 2)))
+
+    # Out-of-range actions are not wrapped around
+    for player_ in [player, player_table]:
+        assert_raises(IndexError, player_.best_response, (1, 5))
+
+    # 2-player
+    player_2p = Player(payoff_array[:, :, 0])
+    player_2p.precompute_best_response_table()
+    assert_raises(IndexError, player_2p.best_response, 5)
+
+    # Replacing the payoff array discards the table
+    player_table.payoff_array = -payoff_array
+    eq_(player_table.best_response((1, 2)),
+        Player(-payoff_array).best_response((1, 2)))
+
+
+def test_normalformgame_best_response_tables():
+    g = NormalFormGame([[(1, 1), (0, 0)], [(0, 0), (1, 1)]])
+    g.precompute_best_response_tables()
+    ok_(g.is_nash((0, 0)))
+    ok_(not g.is_nash((0, 1)))
+
+    # Setting payoffs discards the tables
+    g[0, 0] = -1, -1
+    ok_(not g.is_nash((0, 0)))
+
+
+def test_normalformgame_correlated_equilibrium_chicken():
+    g = NormalFormGame([[(6, 6), (2, 7)], [(7, 2), (0, 0)]])
+    probs = g.correlated_equilibrium()
+    assert_allclose(probs, [[1/2, 1/4], [1/4, 0]], atol=1e-8)
+
+    probs = g.correlated_equilibrium(objective='egalitarian')
+    payoffs = \
+        (probs[..., np.newaxis] * g.payoff_profile_array).sum(axis=(0, 1))
+    assert_allclose(payoffs, [21/4, 21/4], atol=1e-8)
+
+    # Maximize the probability of (1, 0), attained at the pure Nash
+    # equilibrium
+    objective = np.zeros((2, 2))
+    objective[1, 0] = 1
+    assert_allclose(g.correlated_equilibrium(objective=objective),
+                    [[0, 0], [1, 0]], atol=1e-8)
+
+
+def test_normalformgame_correlated_equilibrium_incentives():
+    nums_actions = (3, 2, 4)
+    g = NormalFormGame(
+        np.random.RandomState(0).standard_normal(nums_actions+(3,))
+    )
+    for objective in ['utilitarian', 'egalitarian', None]:
+        probs = g.correlated_equilibrium(objective=objective)
+        assert_allclose(probs.sum(), 1)
+        ok_((probs >= 0).all())
+        payoff_profile_array = g.payoff_profile_array
+        for i in range(3):
+            U = np.moveaxis(payoff_profile_array[..., i], i, 0)
+            P = np.moveaxis(probs, i, 0)
+            for a in range(nums_actions[i]):
+                for b in range(nums_actions[i]):
+                    ok_((P[a] * (U[b] - U[a])).sum() <= 1e-8)
+
+
+def test_normalformgame_correlated_equilibrium_int8():
+    payoff_matrix = np.array([[60, -120], [100, -60]])
+    probs = {}
+    for dtype in [np.int8, np.int64]:
+        g = NormalFormGame([Player(payoff_matrix.astype(dtype)),
+                            Player(payoff_matrix.T.astype(dtype))])
+        probs[dtype] = g.correlated_equilibrium()
+    assert_allclose(probs[np.int8], probs[np.int64], atol=1e-8)
+
+    # Negated payoffs out of the range of int8
+    payoff_matrix = np.array([[-128, 10], [20, -128]])
+    for objective in ['utilitarian', 'egalitarian']:
+        probs = {}
+        for dtype in [np.int8, np.int64]:
+            g = NormalFormGame([Player(payoff_matrix.astype(dtype)),
+                                Player(payoff_matrix.T.astype(dtype))])
+            probs[dtype] = g.correlated_equilibrium(objective=objective)
+        assert_allclose(probs[np.int8], probs[np.int64], atol=1e-8)
+
+
 # Trivial cases with one player #
 
 class TestPlayer_0opponents:
@@ -283,6 +783,14 @@ class TestNormalFormGame_1p:
         """Trivial game: is_nash with mixed action"""
         ok_(self.g.is_nash(([0, 1/2, 1/2],)))
 
+    def test_regrets(self):
+        """Trivial game: regrets"""
+        assert_array_equal(self.g.regrets(([0, 1, 2],)), [[1], [0], [0]])
+
+    def test_pure_nash_equilibria(self):
+        """Trivial game: pure_nash_equilibria"""
+        eq_(self.g.pure_nash_equilibria(), [(1,), (2,)])
+
 
 def test_normalformgame_input_action_sizes_1p():
     g = NormalFormGame(2)
@@ -363,6 +871,60 @@ def test_best_response_2p():
             eq_(br_computed, br_expected)
 
 
+class TestBestResponseNP:
+    """Test the N-player kernels against Player methods"""
+
+    def setUp(self):
+        self.payoff_array = np.arange(2*3*4, dtype=float).reshape(2, 3, 4)
+        self.payoff_array[1] = self.payoff_array[0][::-1, ::-1] + 1/2
+        self.player = Player(self.payoff_array)
+
+    def test_payoff_vector_np(self):
+        nums_actions = np.array([3, 4])
+        for opponents_actions, pure_actions, mixed_actions in [
+            ((2, [1/4, 1/4, 0, 1/2]), [2, -1], [1/4, 1/4, 0, 1/2]),
+            (([0, 1/2, 1/2], 3), [-1, 3], [0, 1/2, 1/2]),
+            ((1, 2), [1, 2], [])
+        ]:
+            assert_allclose(
+                payoff_vector_np(self.payoff_array.reshape(2, -1),
+                                 np.array(pure_actions),
+                                 np.array(mixed_actions, dtype=float),
+                                 nums_actions),
+                self.player.payoff_vector(opponents_actions)
+            )
+
+    def test_best_response_dispatch(self):
+        for opponents_actions in [(0, 0), (2, 3), ([0, 1/2, 1/2], 1),
+                                  ([1/3, 1/3, 1/3], [1/4, 1/4, 1/4, 1/4])]:
+            payoff_vector = self.player.payoff_vector(opponents_actions)
+            eq_(self.player.best_response(opponents_actions),
+                np.argmax(payoff_vector))
+            ok_(self.player.best_response(opponents_actions,
+                                          tie_breaking='random') in
+                self.player.best_response(opponents_actions,
+                                          tie_breaking=False))
+
+        # Large enough to be dispatched to the kernel
+        random_state = np.random.RandomState(0)
+        player = Player(random_state.random_sample((4, 30, 30)))
+        for opponents_actions in [(0, 29), (random_state.dirichlet([1]*30), 3),
+                                  (random_state.dirichlet([1]*30),
+                                   random_state.dirichlet([1]*30))]:
+            eq_(player.best_response(opponents_actions),
+                np.argmax(player.payoff_vector(opponents_actions)))
+
+    def test_best_response_np_with_payoff_perturbation(self):
+        eq_(best_response_np(self.payoff_array.reshape(2, -1),
+                             np.array([0, 0]), np.empty(0), np.array([3, 4]),
+                             np.array([12., 0.])),
+            0)
+
+    @raises(IndexError)
+    def test_best_response_invalid_pure_action(self):
+        self.player.best_response((3, 0))
+
+
 if __name__ == '__main__':
     import sys
     import nose
@@ -0,0 +1,89 @@
+"""
+Filename: test_potential_game.py
+
+Tests for potential_game.py
+
+"""
+from __future__ import division
+
+import numpy as np
+from numpy.testing import assert_allclose
+from nose.tools import eq_, ok_, raises
+
+from normal_form_game import Player, NormalFormGame
+from potential_game import (
+    potential_function, potential_weights, is_potential_game
+)
+
+
+def game_from_potential(potential, weights, random_state):
+    """
+    Construct a weighted potential game with `potential` and `weights`,
+    adding to each player's payoffs a random function of the opponents'
+    actions.
+
+    """
+    N = potential.ndim
+    players = []
+    for i in range(N):
+        payoff_array = potential / weights[i] + random_state.standard_normal(
+            potential.shape[:i] + (1,) + potential.shape[i+1:]
+        )
+        players.append(Player(payoff_array.transpose(
+            list(range(i, N)) + list(range(i))
+        )))
+    return NormalFormGame(players)
+
+
+class TestPotentialGame_3p:
+    '''Test with 3-player games constructed from a potential'''
+
+    def setUp(self):
+        '''Setup a random potential and weights'''
+        random_state = np.random.RandomState(0)
+        self.potential = random_state.standard_normal((3, 2, 4))
+        self.potential -= self.potential[0, 0, 0]
+        self.weights = np.array([1, 0.5, 2.])
+        self.g_exact = \
+            game_from_potential(self.potential, np.ones(3), random_state)
+        self.g_weighted = \
+            game_from_potential(self.potential, self.weights, random_state)
+
+    def test_exact(self):
+        assert_allclose(potential_function(self.g_exact), self.potential)
+        ok_(is_potential_game(self.g_exact))
+
+    def test_weighted(self):
+        ok_(not is_potential_game(self.g_weighted))
+        ok_(is_potential_game(self.g_weighted, weighted=True))
+        assert_allclose(potential_weights(self.g_weighted), self.weights)
+        assert_allclose(potential_function(self.g_weighted, self.weights),
+                        self.potential)
+
+
+def test_matching_pennies():
+    g = NormalFormGame([[(1, -1), (-1, 1)], [(-1, 1), (1, -1)]])
+    eq_(potential_function(g), None)
+    eq_(potential_weights(g), None)
+
+
+def test_prisoners_dilemma():
+    g = NormalFormGame([[(1, 1), (-2, 3)], [(3, -2), (0, 0)]])
+    assert_allclose(potential_function(g), [[0, 2], [2, 4]])
+    assert_allclose(potential_weights(g), [1, 1])
+
+
+@raises(ValueError)
+def test_potential_function_invalid_weights():
+    g = NormalFormGame((2, 2))
+    potential_function(g, weights=[1, -1])
+
+
+if __name__ == '__main__':
+    import sys
+    import nose
+
+    argv = sys.argv[:]
+    argv.append('--verbose')
+    argv.append('--nocapture')
+    nose.main(argv=argv, defaultTest=__file__)
@@ -0,0 +1,101 @@
+"""
+Filename: test_support_enumeration.py
+
+Tests for support_enumeration.py
+
+"""
+from __future__ import division
+
+import itertools
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+from nose.tools import eq_, raises
+
+from normal_form_game import Player, NormalFormGame
+from support_enumeration import (
+    support_enumeration, support_enumeration_gen, _supports
+)
+
+
+class TestSupportEnumeration:
+    '''Test support_enumeration'''
+
+    def setUp(self):
+        '''Setup a list of games and their Nash equilibria'''
+        self.game_dicts = []
+
+        # From von Stengel 2007 in Algorithmic Game Theory
+        A = [[3, 3],
+             [2, 5],
+             [0, 6]]
+        B = [[3, 2, 3],
+             [2, 6, 1]]
+        d = {'g': NormalFormGame((Player(A), Player(B))),
+             'NEs': [([1, 0, 0], [1, 0]),
+                     ([4/5, 1/5, 0], [2/3, 1/3]),
+                     ([0, 1/3, 2/3], [1/3, 2/3])]}
+        self.game_dicts.append(d)
+
+        # Symmetric 2x2 coordination game
+        d = {'g': NormalFormGame([[4, 0], [3, 2]]),
+             'NEs': [([1, 0], [1, 0]),
+                     ([0, 1], [0, 1]),
+                     ([2/3, 1/3], [2/3, 1/3])]}
+        self.game_dicts.append(d)
+
+    def test_support_enumeration(self):
+        for d in self.game_dicts:
+            NEs_computed = support_enumeration(d['g'], chunk_size=1)
+            eq_(len(NEs_computed), len(d['NEs']))
+            for NE_computed, NE in zip(NEs_computed, d['NEs']):
+                for action_computed, action in zip(NE_computed, NE):
+                    assert_allclose(action_computed, action)
+
+    def test_support_enumeration_process_pool(self):
+        for d in self.game_dicts:
+            NEs_computed = support_enumeration(d['g'], num_workers=2)
+            NEs_computed.sort(key=lambda NE: tuple(NE[0]), reverse=True)
+            NEs = sorted(d['NEs'], key=lambda NE: tuple(NE[0]),
+                         reverse=True)
+            eq_(len(NEs_computed), len(NEs))
+            for NE_computed, NE in zip(NEs_computed, NEs):
+                for action_computed, action in zip(NE_computed, NE):
+                    assert_allclose(action_computed, action)
+
+    def test_is_nash(self):
+        for d in self.game_dicts:
+            for NE in support_enumeration(d['g']):
+                eq_(d['g'].is_nash(NE), True)
+
+
+def test_supports():
+    n, k = 7, 3
+    supports = np.array(list(itertools.combinations(range(n), k)))
+    for start, stop in [(0, None), (5, 9), (30, 35), (34, None)]:
+        assert_array_equal(_supports(n, k, start, stop),
+                           supports[start:stop])
+
+
+def test_support_enumeration_gen_close():
+    # Closing the generator early does not process all the blocks
+    g = NormalFormGame(np.zeros((10, 10, 2)))
+    NEs = support_enumeration_gen(g, num_workers=2, chunk_size=1)
+    next(NEs)
+    NEs.close()
+
+
+# Invalid inputs #
+
+@raises(ValueError)
+def test_support_enumeration_invalid_g():
+    support_enumeration(NormalFormGame((2, 2, 2)))
+
+
+if __name__ == '__main__':
+    import sys
+    import nose
+
+    argv = sys.argv[:]
+    argv.append('--verbose')
+    argv.append('--nocapture')
+    nose.main(argv=argv, defaultTest=__file__)
@@ -0,0 +1,122 @@
+"""
+Filename: test_symmetric_game.py
+
+Tests for symmetric_game.py
+
+"""
+from __future__ import division
+
+import numpy as np
+from numpy.testing import assert_array_equal, assert_allclose
+from nose.tools import eq_, ok_, raises
+
+from normal_form_game import Player, NormalFormGame
+from symmetric_game import SymmetricNormalFormGame
+
+
+class TestSymmetricNormalFormGame_3p:
+    '''Test the methods of SymmetricNormalFormGame with three players'''
+
+    def setUp(self):
+        '''Setup a SymmetricNormalFormGame instance'''
+        # Count vectors: [0, 2], [1, 1], [2, 0]
+        # Action 0 pays 1 only if both opponents play 0;
+        # action 1 pays 2 only if both opponents play 1
+        self.g = SymmetricNormalFormGame(3, [[0, 0, 1], [2, 0, 0]])
+
+    def test_count_vectors(self):
+        assert_array_equal(self.g.count_vectors, [[0, 2], [1, 1], [2, 0]])
+        assert_array_equal(self.g.index(self.g.count_vectors), [0, 1, 2])
+
+    def test_payoff_vector(self):
+        assert_allclose(self.g.payoff_vector([1/2, 1/2]), [1/4, 1/2])
+
+    def test_payoff_vector_counts(self):
+        assert_array_equal(self.g.payoff_vector_counts([2, 0]), [1, 0])
+
+    def test_best_response(self):
+        eq_(self.g.best_response([1, 0]), 0)
+        eq_(self.g.best_response([1/2, 1/2]), 1)
+        # Tie at p**2 = 2 * (1-p)**2
+        p = 2 - np.sqrt(2)
+        assert_array_equal(
+            self.g.best_response([p, 1-p], tie_breaking=False), [0, 1]
+        )
+
+    def test_best_response_random_state(self):
+        # No random draw without a tie, as by Player
+        np.random.seed(0)
+        x = np.random.random()
+        np.random.seed(0)
+        eq_(self.g.best_response([1, 0], tie_breaking='random'), 0)
+        eq_(np.random.random(), x)
+
+    def test_is_symmetric_nash(self):
+        ok_(self.g.is_symmetric_nash([1, 0]))
+        ok_(self.g.is_symmetric_nash([0, 1]))
+        ok_(not self.g.is_symmetric_nash([1/2, 1/2]))
+
+    def test_to_normal_form_game(self):
+        g_dense = self.g.to_normal_form_game()
+        eq_(g_dense.N, 3)
+        assert_array_equal(g_dense[0, 0, 0], [1, 1, 1])
+        assert_array_equal(g_dense[1, 0, 1], [0, 0, 0])
+        assert_array_equal(g_dense[1, 1, 1], [2, 2, 2])
+
+    def test_from_normal_form_game(self):
+        g = SymmetricNormalFormGame.from_normal_form_game(
+            self.g.to_normal_form_game()
+        )
+        assert_array_equal(g.payoff_table, self.g.payoff_table)
+
+
+def test_payoff_vector_against_dense():
+    N, n = 4, 3
+    random_state = np.random.RandomState(0)
+    g = SymmetricNormalFormGame(N, random_state.standard_normal((n, 10)))
+    g_dense = g.to_normal_form_game()
+    x = random_state.dirichlet(np.ones(n))
+    assert_allclose(g.payoff_vector(x),
+                    g_dense.players[0].payoff_vector((x,)*(N-1)))
+
+
+def test_many_players():
+    N = 200
+    g = SymmetricNormalFormGame(N, np.zeros((2, N)))
+    # Coordination: payoff equals the number of opponents playing the
+    # same action
+    g.payoff_table[0] = g.count_vectors[:, 0]
+    g.payoff_table[1] = g.count_vectors[:, 1]
+    assert_allclose(g.payoff_vector([0.3, 0.7]), [0.3*(N-1), 0.7*(N-1)])
+
+
+def test_tol():
+    for dtype in [np.float64, np.float32, np.int16]:
+        payoff_table = np.zeros((2, 3), dtype=dtype)
+        eq_(SymmetricNormalFormGame(3, payoff_table).tol,
+            Player(payoff_table).tol)
+
+
+# Invalid inputs #
+
+@raises(ValueError)
+def test_symmetric_game_invalid_payoff_table_shape():
+    SymmetricNormalFormGame(3, np.zeros((2, 4)))
+
+
+@raises(ValueError)
+def test_from_normal_form_game_asymmetric():
+    matching_pennies_bimatrix = [[(1, -1), (-1, 1)], [(-1, 1), (1, -1)]]
+    SymmetricNormalFormGame.from_normal_form_game(
+        NormalFormGame(matching_pennies_bimatrix)
+    )
+
+
+if __name__ == '__main__':
+    import sys
+    import nose
+
+    argv = sys.argv[:]
+    argv.append('--verbose')
+    argv.append('--nocapture')
+    nose.main(argv=argv, defaultTest=__file__)
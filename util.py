@@ -25,3 +25,129 @@ def check_random_state(seed):
         return seed
     raise ValueError('%r cannot be used to seed a numpy.random.RandomState'
                      ' instance' % seed)
+
+
+def binomial_table(p_max, r_max):
+    """
+    Return the table of the binomial coefficients C(p, r) for p <= p_max
+    and r <= r_max, computed by Pascal's triangle.
+
+    Parameters
+    ----------
+    p_max : scalar(int)
+        Maximum value of p.
+
+    r_max : scalar(int)
+        Maximum value of r.
+
+    Returns
+    -------
+    binoms : ndarray(int, ndim=2)
+        Array of shape (p_max+1, r_max+1) whose (p, r) entry is C(p, r),
+        which is zero for r > p.
+
+    """
+    binoms = np.zeros((p_max+1, r_max+1), dtype=np.int64)
+    binoms[:, 0] = 1
+    for p in range(1, p_max+1):
+        binoms[p, 1:] = binoms[p-1, 1:] + binoms[p-1, :-1]
+    return binoms
+
+
+def binomial_coefficient(n, k):
+    """
+    Return the binomial coefficient C(n, k), which is zero if k < 0 or
+    k > n.
+
+    Parameters
+    ----------
+    n : scalar(int)
+        Nonnegative integer.
+
+    k : scalar(int)
+        Integer.
+
+    Returns
+    -------
+    scalar(int)
+        C(n, k).
+
+    """
+    if k < 0 or k > n:
+        return 0
+    c = 1
+    for i in range(min(k, n - k)):
+        c = c * (n - i) // (i + 1)
+    return c
+
+
+def composition_rank(compositions, total):
+    r"""
+    Return the indices of weak compositions of `total` (vectors of
+    nonnegative integers summing to `total`) in the combinatorial number
+    system applied to the positions of the bars in the "stars and bars"
+    representation: with :math:`s_a = c_0 + \cdots + c_a`, the index of
+    a composition c of length n is
+
+    .. math::
+
+        \sum_{a=0}^{n-2} \binom{s_a + a}{a + 1}.
+
+    Parameters
+    ----------
+    compositions : array_like(int)
+        Composition, or array of compositions along the last axis.
+
+    total : scalar(int)
+        Sum of each composition.
+
+    Returns
+    -------
+    scalar(int) or ndarray(int)
+        Index, or array of indices, of `compositions`.
+
+    """
+    compositions = np.asarray(compositions)
+    n = compositions.shape[-1]
+    binoms = binomial_table(total + n - 1, n - 1)
+    partial_sums = compositions[..., :-1].cumsum(axis=-1)
+    return binoms[partial_sums + np.arange(n-1),
+                  np.arange(1, n)].sum(axis=-1)
+
+
+def composition_unrank(total, n, indices=None):
+    """
+    Return the weak compositions of `total` of length n with indices
+    `indices` in the numbering of `composition_rank`, i.e., the inverse
+    of `composition_rank`.
+
+    Parameters
+    ----------
+    total : scalar(int)
+        Sum of each composition.
+
+    n : scalar(int)
+        Length of each composition.
+
+    indices : array_like(int, ndim=1), optional(default=None)
+        Array of indices. If None, all the C(total+n-1, n-1)
+        compositions are returned in the order of their indices.
+
+    Returns
+    -------
+    ndarray(int, ndim=2)
+        Array of shape (len(indices), n) of compositions.
+
+    """
+    binoms = binomial_table(total + n - 1, n - 1)
+    if indices is None:
+        indices = np.arange(binoms[total+n-1, n-1])
+    remainders = np.array(indices, dtype=np.int64, ndmin=1)
+    partial_sums = np.empty((len(remainders), n+1), dtype=int)
+    partial_sums[:, 0], partial_sums[:, -1] = 0, total
+    # Largest p with C(p, a+1) <= remainder, from the highest digit
+    for a in range(n-2, -1, -1):
+        p = np.searchsorted(binoms[:, a+1], remainders, side='right') - 1
+        partial_sums[:, a+1] = p - a
+        remainders -= binoms[p, a+1]
+    return np.diff(partial_sums, axis=1)